@@ -0,0 +1,110 @@
+"""schema inicial
+
+Tabelas existentes antes das migrations (criadas por create_all).
+Usa IF NOT EXISTS para poder ser aplicada em bancos já criados.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_users_id", "users", ["id"], if_not_exists=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True, if_not_exists=True)
+
+    op.create_table(
+        "clientes",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("nome", sa.String(200), nullable=False),
+        sa.Column("email", sa.String(200), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_clientes_id", "clientes", ["id"], if_not_exists=True)
+    op.create_index("ix_clientes_email", "clientes", ["email"], unique=True, if_not_exists=True)
+
+    op.create_table(
+        "produtos",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("nome", sa.String(200), nullable=False),
+        sa.Column("codigo", sa.String(100), nullable=False),
+        sa.Column("descricao", sa.Text(), nullable=True),
+        sa.Column("categoria", sa.String(100), nullable=True),
+        sa.Column("template_tabela", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_produtos_id", "produtos", ["id"], if_not_exists=True)
+    op.create_index("ix_produtos_codigo", "produtos", ["codigo"], unique=True, if_not_exists=True)
+
+    op.create_table(
+        "relatorios",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("codigo_pedido", sa.String(100), nullable=False),
+        sa.Column("titulo", sa.String(300), nullable=True),
+        sa.Column("descricao", sa.Text(), nullable=True),
+        sa.Column("observacoes", sa.Text(), nullable=True),
+        sa.Column("cliente_id", sa.Integer(), sa.ForeignKey("clientes.id"), nullable=False),
+        sa.Column("produto_id", sa.Integer(), sa.ForeignKey("produtos.id"), nullable=False),
+        sa.Column("dados_tabela", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        if_not_exists=True,
+    )
+    op.create_index("ix_relatorios_id", "relatorios", ["id"], if_not_exists=True)
+    op.create_index("ix_relatorios_codigo_pedido", "relatorios", ["codigo_pedido"], unique=True, if_not_exists=True)
+
+    op.create_table(
+        "fotos",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("relatorio_id", sa.Integer(), sa.ForeignKey("relatorios.id"), nullable=False),
+        sa.Column("nome_original", sa.String(300), nullable=False),
+        sa.Column("nome_arquivo", sa.String(300), nullable=False, unique=True),
+        sa.Column("caminho", sa.String(500), nullable=False),
+        sa.Column("tamanho", sa.Integer(), nullable=False),
+        sa.Column("mime_type", sa.String(100), nullable=False),
+        sa.Column("descricao", sa.String(500), nullable=True),
+        sa.Column("ordem", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_index("ix_fotos_id", "fotos", ["id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("fotos")
+    op.drop_table("relatorios")
+    op.drop_table("produtos")
+    op.drop_table("clientes")
+    op.drop_table("users")
@@ -0,0 +1,63 @@
+"""tokens revogados e índice de busca de relatórios
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tokens_revogados",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("revogado_em", sa.Float(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_tokens_revogados_revogado_em", "tokens_revogados", ["revogado_em"], if_not_exists=True)
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("""
+            CREATE TABLE IF NOT EXISTS relatorios_busca (
+                relatorio_id INTEGER PRIMARY KEY REFERENCES relatorios(id) ON DELETE CASCADE,
+                documento TSVECTOR NOT NULL
+            )
+        """)
+        op.execute("CREATE INDEX IF NOT EXISTS ix_relatorios_busca_documento ON relatorios_busca USING GIN (documento)")
+        op.execute("""
+            DO $$
+            BEGIN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_relatorios_codigo_pedido_trgm
+                    ON relatorios USING GIN (codigo_pedido gin_trgm_ops);
+            EXCEPTION WHEN OTHERS THEN
+                RAISE NOTICE 'pg_trgm indisponível: busca por codigo_pedido sem índice';
+            END $$
+        """)
+    elif op.get_bind().dialect.name == "sqlite":
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS relatorios_busca USING fts5(
+                titulo, descricao, observacoes, fotos, codigo_pedido,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+        """)
+    # Depois de aplicar: python -m app.cli reindexar-busca
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_relatorios_codigo_pedido_trgm")
+    op.execute("DROP TABLE IF EXISTS relatorios_busca")
+    op.drop_table("tokens_revogados")
@@ -0,0 +1,40 @@
+"""índices compostos para filtros e ordenação de relatórios
+
+Cada filtro de listar_relatorios tem um índice que começa pela coluna
+filtrada e termina em created_at, para servir o filtro e a ordenação
+(mais recentes primeiro) no mesmo índice. Fotos são sempre lidas por
+relatório e em ordem.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_relatorios_cliente_id_created_at", "relatorios", ["cliente_id", "created_at"], if_not_exists=True)
+    op.create_index("ix_relatorios_produto_id_created_at", "relatorios", ["produto_id", "created_at"], if_not_exists=True)
+    op.create_index("ix_relatorios_status_created_at", "relatorios", ["status", "created_at"], if_not_exists=True)
+    op.create_index("ix_relatorios_created_at", "relatorios", ["created_at"], if_not_exists=True)
+    op.create_index("ix_fotos_relatorio_id_ordem", "fotos", ["relatorio_id", "ordem"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_fotos_relatorio_id_ordem", table_name="fotos")
+    op.drop_index("ix_relatorios_created_at", table_name="relatorios")
+    op.drop_index("ix_relatorios_status_created_at", table_name="relatorios")
+    op.drop_index("ix_relatorios_produto_id_created_at", table_name="relatorios")
+    op.drop_index("ix_relatorios_cliente_id_created_at", table_name="relatorios")
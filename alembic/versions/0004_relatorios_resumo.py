@@ -0,0 +1,35 @@
+"""tabela de resumo do dashboard
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "relatorios_resumo",
+        sa.Column("dimensao", sa.String(20), primary_key=True),
+        sa.Column("chave", sa.String(100), primary_key=True),
+        sa.Column("total", sa.Integer(), nullable=False),
+        if_not_exists=True,
+    )
+    # Depois de aplicar: python -m app.cli reconstruir-resumo
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("relatorios_resumo")
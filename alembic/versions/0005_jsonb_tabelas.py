@@ -0,0 +1,50 @@
+"""JSONB e índices GIN para as tabelas dinâmicas
+
+No PostgreSQL, relatorios.dados_tabela e produtos.template_tabela passam
+de JSON para JSONB, o que permite indexá-las (GIN) e consultar valores
+das células no próprio banco. No SQLite nada muda.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE relatorios ALTER COLUMN dados_tabela TYPE JSONB USING dados_tabela::jsonb")
+    op.execute("ALTER TABLE produtos ALTER COLUMN template_tabela TYPE JSONB USING template_tabela::jsonb")
+    op.create_index(
+        "ix_relatorios_dados_tabela", "relatorios", ["dados_tabela"],
+        postgresql_using="gin", postgresql_ops={"dados_tabela": "jsonb_path_ops"},
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_produtos_template_tabela", "produtos", ["template_tabela"],
+        postgresql_using="gin", if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_produtos_template_tabela", table_name="produtos")
+    op.drop_index("ix_relatorios_dados_tabela", table_name="relatorios")
+    op.execute("ALTER TABLE produtos ALTER COLUMN template_tabela TYPE JSON USING template_tabela::json")
+    op.execute("ALTER TABLE relatorios ALTER COLUMN dados_tabela TYPE JSON USING dados_tabela::json")
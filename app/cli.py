@@ -0,0 +1,67 @@
+"""
+Comandos de manutenção da aplicação.
+
+Uso: python -m app.cli <comando>
+"""
+
+import argparse
+from app.database import SessionLocal
+
+
+def reindexar_busca():
+    """Reconstrói o índice de busca textual de todos os relatórios"""
+    from app.services.busca_service import BuscaService
+
+    db = SessionLocal()
+    try:
+        total = BuscaService.reindexar_tudo(db)
+        print(f"✅ {total} relatórios indexados")
+    finally:
+        db.close()
+
+
+def reconstruir_resumo():
+    """Recalcula do zero as contagens do dashboard"""
+    from app.services.resumo_service import ResumoService
+
+    db = SessionLocal()
+    try:
+        total = ResumoService.reconstruir(db)
+        print(f"✅ Resumo reconstruído a partir de {total} relatórios")
+    finally:
+        db.close()
+
+
+def reconciliar_uploads():
+    """Remove arquivos de upload que nenhuma foto referencia"""
+    from app.config import settings
+    from app.core.exclusoes import coletor_arquivos
+    from app.services.exclusao_service import ExclusaoService
+
+    db = SessionLocal()
+    try:
+        orfaos = ExclusaoService.reconciliar(db, settings.ORFAOS_IDADE_MINIMA_SECONDS)
+    finally:
+        db.close()
+    for caminho in orfaos:
+        print(f"   🗑️  {caminho}")
+    removidos = coletor_arquivos.coletar()
+    print(f"✅ {len(orfaos)} arquivos órfãos encontrados; {removidos} exclusões pendentes resolvidas")
+
+
+COMANDOS = {
+    "reindexar-busca": reindexar_busca,
+    "reconstruir-resumo": reconstruir_resumo,
+    "reconciliar-uploads": reconciliar_uploads,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comandos de manutenção do Magnetic Report")
+    parser.add_argument("comando", choices=sorted(COMANDOS))
+    args = parser.parse_args()
+    COMANDOS[args.comando]()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import List
-import os
+from typing import ClassVar, Dict, List
 
 class Settings(BaseSettings):
     # Usa Pydantic para validar e carregar variáveis de ambiente automaticamente.
@@ -12,18 +12,78 @@ class Settings(BaseSettings):
     
     # Banco de dados
     DATABASE_URL: str
-    
+    DB_POOL_SIZE: int = 10  # Conexões mantidas no pool
+    DB_MAX_OVERFLOW: int = 20  # Conexões extras permitidas em picos de acesso
+    DB_POOL_TIMEOUT: int = 30  # segundos esperando uma conexão livre antes de erro
+    DB_POOL_RECYCLE: int = 1800  # segundos; conexões mais antigas são reabertas
+    # Réplica de leitura (opcional; vazio = tudo no primário). Usa os mesmos
+    # parâmetros de pool. Depois de uma escrita, as leituras do mesmo
+    # cliente vão ao primário por REPLICA_STICKY_SECONDS (atraso da réplica)
+    DATABASE_REPLICA_URL: str = ""
+    REPLICA_STICKY_SECONDS: int = 5
+
+    # Threads das rotas síncronas (def). 0 = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    # menos CONEXOES_RESERVADAS, uma conexão por thread; mais threads que
+    # conexões só mudariam a fila de lugar (da thread para o pool)
+    THREADPOOL_SIZE: int = 0
+    # Conexões do pool abertas fora do get_db: carga/verificação do catálogo
+    # de produtos e sincronização da lista de revogação (uma de cada vez,
+    # pelo lock de cada um) e o coletor de arquivos. Uma rota que já segura
+    # a conexão do get_db pode precisar de uma delas; sem essa folga, com
+    # todas as threads em rotas, esperaria uma conexão que ninguém devolve
+    CONEXOES_RESERVADAS: ClassVar[int] = 3
+
     # Segurança e JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Intervalo (segundos) de sincronização da lista de tokens revogados
+    TOKEN_REVOCATION_SYNC_SECONDS: int = 30
+    
+    # Cache do catálogo de produtos: intervalo (segundos) de verificação
+    # quando não há LISTEN/NOTIFY (SQLite ou conexão de escuta caída)
+    PRODUTO_CACHE_POLL_SECONDS: int = 30
     
     # Upload de arquivos
     UPLOAD_DIR: str = "uploads"
     MAX_FILE_SIZE: int = 5 * 1024 * 1024  # 5MB
     ALLOWED_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "webp"]
+    # Remoção adiada dos arquivos (coletor em segundo plano)
+    EXCLUSAO_INTERVALO_SECONDS: int = 60  # varredura periódica da fila
+    EXCLUSAO_LOTE: int = 500  # arquivos por transação
+    EXCLUSAO_MAX_TENTATIVAS: int = 5  # depois disso a pendência fica para análise
+    # Arquivos sem Foto mais novos que isso não são tratados como órfãos
+    # (o upload pode ainda não ter feito commit)
+    ORFAOS_IDADE_MINIMA_SECONDS: int = 3600
+    
+    # Compressão das respostas (gzip/brotli)
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; corpos menores saem sem compressão
+    GZIP_LEVEL: int = 6  # 1 (rápido) a 9 (menor)
+    BROTLI_QUALITY: int = 4  # 0 (rápido) a 11 (menor)
+    
+    # Server-Timing: tempo por fase (banco, serialização, PDF, imagem)
+    # no header das respostas e numa linha JSON de log por requisição
+    SERVER_TIMING: bool = True
+    SERVER_TIMING_LOG: bool = True
     
+    # Métricas Prometheus em GET /metrics. Com vários workers, defina também
+    # a variável de ambiente PROMETHEUS_MULTIPROC_DIR (ver app/core/metricas.py)
+    METRICS_ENABLED: bool = True
+
+    # Logs JSON (stdout) escritos por uma thread separada (app/core/logs.py)
+    LOG_LEVEL: str = "INFO"
+    LOG_FILA_MAXIMA: int = 10000  # registros em espera; acima disso são descartados
+    # Fração mantida por evento, ex: {"requisicao": 0.1}. Avisos e erros sempre saem
+    LOG_AMOSTRAGEM: Dict[str, float] = {}
+    LOG_LENTO_MS: int = 1000  # requisições mais lentas viram aviso (fora da amostragem)
+    
+    # Perfil das consultas SQL por requisição: registra no log as que passam
+    # do orçamento ou repetem o mesmo comando (N+1). Desligado por padrão
+    SQL_PROFILER: bool = False
+    SQL_PROFILER_MAX_QUERIES: int = 20
+    SQL_PROFILER_REPETICOES: int = 5  # mesmo comando N vezes = provável N+1
+
     # CORS - Origens permitidas (frontend)
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
     
@@ -36,6 +96,14 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
     MAIL_FROM_NAME: str = "Magnetic Report"
+    MAIL_STARTTLS: bool = True  # False para servidores locais sem TLS (testes)
+    # Envio em segundo plano (app/core/emails.py)
+    EMAIL_CONEXOES: int = 2  # threads de envio, cada uma com sua conexão SMTP aberta
+    EMAIL_LOTE: int = 20  # mensagens enviadas por rodada numa conexão
+    EMAIL_MAX_TENTATIVAS: int = 5
+    EMAIL_BACKOFF_SECONDS: float = 2.0  # espera antes da 2ª tentativa; dobra a cada falha
+    EMAIL_OCIOSO_SECONDS: int = 60  # conexão sem uso por mais que isso é fechada
+    EMAIL_TIMEOUT_SECONDS: int = 30  # timeout de rede do SMTP
     
     # Frontend URL
     FRONTEND_URL: str = "http://localhost:5173"
@@ -44,6 +112,29 @@ class Settings(BaseSettings):
     PASSWORD_RESET_TOKEN_EXPIRE_HOURS: int = 1
     EMAIL_VERIFICATION_TOKEN_EXPIRE_HOURS: int = 24
     
+    @property
+    def threadpool_size(self) -> int:
+        """Capacidade efetiva do threadpool (THREADPOOL_SIZE ou o pool menos a reserva)"""
+        return self.THREADPOOL_SIZE or self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW - self.CONEXOES_RESERVADAS
+
+    @model_validator(mode="after")
+    def validar_pool(self):
+        if self.DB_POOL_SIZE < 1 or self.DB_MAX_OVERFLOW < 0 or self.THREADPOOL_SIZE < 0:
+            raise ValueError("DB_POOL_SIZE deve ser >= 1; DB_MAX_OVERFLOW e THREADPOOL_SIZE >= 0")
+        disponiveis = self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW - self.CONEXOES_RESERVADAS
+        if disponiveis < 1:
+            raise ValueError(
+                f"DB_POOL_SIZE + DB_MAX_OVERFLOW deve ser maior que as {self.CONEXOES_RESERVADAS} "
+                "conexões reservadas para catálogo, revogação e coletor"
+            )
+        if self.threadpool_size > disponiveis:
+            raise ValueError(
+                f"THREADPOOL_SIZE ({self.threadpool_size}) maior que as conexões disponíveis "
+                f"(DB_POOL_SIZE + DB_MAX_OVERFLOW - {self.CONEXOES_RESERVADAS} reservadas = {disponiveis}): "
+                "threads ficariam esperando conexão no pool"
+            )
+        return self
+
     class Config:
         # Configuração do Pydantic para carregar variáveis do arquivo .env
         env_file = ".env"
@@ -51,7 +142,4 @@ class Settings(BaseSettings):
 
 # Instância global das configurações
 # Será importada em outros arquivos como: from app.config import settings
-settings = Settings()
-
-# Criar diretório de uploads se não existir
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
\ No newline at end of file
+settings = Settings()
\ No newline at end of file
@@ -0,0 +1,177 @@
+import logging
+import select
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event, func, text
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Produto
+from app.models.schemas.produto import ProdutoResponse
+
+logger = logging.getLogger(__name__)
+
+# Canal do LISTEN/NOTIFY no PostgreSQL
+CANAL = "produtos"
+
+
+class CatalogoProdutos:
+    """
+    Cache em memória do catálogo de produtos (um por worker).
+
+    O catálogo inteiro é carregado na primeira leitura e servido da memória
+    até ser invalidado. Escritas em produtos chamam invalidar(db), que:
+    - limpa o cache deste worker quando a transação faz commit;
+    - no PostgreSQL, envia NOTIFY; os outros workers recebem por LISTEN
+      (thread iniciada em iniciar()) e limpam o seu.
+
+    Sem LISTEN (SQLite, ou conexão de escuta caída) cada worker confere a
+    cada PRODUTO_CACHE_POLL_SECONDS uma assinatura barata da tabela
+    (quantidade, maior id e última alteração) e recarrega se ela mudar.
+    """
+
+    def __init__(self, poll_interval: int):
+        self._poll_interval = poll_interval
+        # (por id, lista ordenada); None = precisa carregar
+        self._cache: Optional[Tuple[Dict[int, ProdutoResponse], List[ProdutoResponse]]] = None
+        self._assinatura: Optional[Tuple] = None
+        self._ultimo_poll = 0.0
+        self._lock = threading.Lock()
+        self._escutando = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # =============== LEITURA ===============
+
+    def obter(self, produto_id: int) -> Optional[ProdutoResponse]:
+        """Produto pelo id, ou None se não existir"""
+        return self._catalogo()[0].get(produto_id)
+
+    def listar(self) -> List[ProdutoResponse]:
+        """Todos os produtos, ordenados por id"""
+        return self._catalogo()[1]
+
+    def _catalogo(self) -> Tuple[Dict[int, ProdutoResponse], List[ProdutoResponse]]:
+        if not self._escutando.is_set():
+            self._verificar_se_necessario()
+
+        cache = self._cache
+        if cache is not None:
+            return cache
+
+        # Com o lock, uma invalidação concorrente espera a carga terminar
+        with self._lock:
+            if self._cache is None:
+                self._carregar()
+            return self._cache
+
+    def _carregar(self) -> None:
+        """Lê o catálogo inteiro (chamado com o lock)"""
+        db = SessionLocal()
+        try:
+            lista = [ProdutoResponse.model_validate(p) for p in db.query(Produto).order_by(Produto.id)]
+            self._assinatura = self._ler_assinatura(db)
+        finally:
+            db.close()
+        self._cache = ({produto.id: produto for produto in lista}, lista)
+
+    # =============== INVALIDAÇÃO ===============
+
+    def invalidar(self, db: Session) -> None:
+        """
+        Registra que a transação atual altera produtos.
+        Chamar antes do commit; a invalidação vale a partir do commit.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            # Entregue aos workers em escuta somente no commit
+            db.execute(text("SELECT pg_notify(:canal, '')"), {"canal": CANAL})
+        event.listen(db, "after_commit", lambda _session: self.limpar(), once=True)
+
+    def limpar(self) -> None:
+        """Descarta o cache deste worker"""
+        with self._lock:
+            self._cache = None
+
+    # =============== POLLING (SQLite / sem LISTEN) ===============
+
+    @staticmethod
+    def _ler_assinatura(db: Session) -> Tuple:
+        return tuple(db.query(
+            func.count(Produto.id),
+            func.max(Produto.id),
+            func.max(func.coalesce(Produto.updated_at, Produto.created_at))
+        ).one())
+
+    def _verificar_se_necessario(self) -> None:
+        if time.monotonic() - self._ultimo_poll < self._poll_interval:
+            return
+
+        with self._lock:
+            if time.monotonic() - self._ultimo_poll < self._poll_interval:
+                return
+            try:
+                db = SessionLocal()
+                try:
+                    assinatura = self._ler_assinatura(db)
+                finally:
+                    db.close()
+                if assinatura != self._assinatura:
+                    self._cache = None
+            except Exception:
+                # Mantém o cache atual; tenta de novo no próximo intervalo
+                logger.exception("catalogo_verificacao_falhou")
+            self._ultimo_poll = time.monotonic()
+
+    # =============== LISTEN (PostgreSQL) ===============
+
+    def iniciar(self) -> None:
+        """Inicia a escuta de invalidações (só no PostgreSQL)"""
+        if engine.dialect.name != "postgresql" or self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._escutar, name="catalogo-produtos", daemon=True)
+        self._thread.start()
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _escutar(self) -> None:
+        """Mantém uma conexão dedicada em LISTEN, reconectando se cair"""
+        while not self._parar.is_set():
+            conexao = None
+            try:
+                # Conexão fora do pool: fica presa na escuta
+                args, kwargs = engine.dialect.create_connect_args(engine.url)
+                conexao = engine.dialect.loaded_dbapi.connect(*args, **kwargs)
+                conexao.autocommit = True
+                conexao.cursor().execute(f"LISTEN {CANAL}")
+
+                # Notificações perdidas enquanto não escutava
+                self.limpar()
+                self._escutando.set()
+
+                while not self._parar.is_set():
+                    if select.select([conexao], [], [], 1.0)[0]:
+                        conexao.poll()
+                        if conexao.notifies:
+                            conexao.notifies.clear()
+                            self.limpar()
+            except Exception:
+                logger.exception("catalogo_escuta_falhou")
+                self._parar.wait(self._poll_interval)
+            finally:
+                # Até reconectar, vale o polling
+                self._escutando.clear()
+                if conexao is not None:
+                    try:
+                        conexao.close()
+                    except Exception:
+                        pass
+
+
+# Instância global (uma por worker)
+catalogo_produtos = CatalogoProdutos(settings.PRODUTO_CACHE_POLL_SECONDS)
@@ -0,0 +1,200 @@
+"""
+Perfil das consultas SQL por requisição (opcional: SQL_PROFILER=true).
+
+Conta os comandos e o tempo de banco de cada requisição, agrupa comandos
+idênticos (mesmo SQL, parâmetros diferentes) e guarda de onde, no código
+da aplicação, cada um foi disparado. Um comando repetido muitas vezes na
+mesma requisição é o sintoma típico de N+1 (ex: relatorio.fotos carregado
+item a item numa listagem).
+
+- Em produção/desenvolvimento: PerfilSQLMiddleware (app.middleware.consultas)
+  registra no log as requisições acima do orçamento.
+- Em testes: orcamento_consultas() falha se a rota passar do limite.
+
+Os eventos do SQLAlchemy só são registrados quando o perfil é ativado;
+desligado, não há custo algum.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Raiz do pacote 'app': o primeiro frame dentro dela é a origem da consulta
+_RAIZ_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_ESTE_ARQUIVO = os.path.abspath(__file__)
+_SQLALCHEMY = os.sep + "sqlalchemy" + os.sep
+
+
+class ComandoSQL:
+    """Ocorrências de um mesmo comando SQL numa requisição"""
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.vezes = 0
+        self.segundos = 0.0
+        self.origens: Counter = Counter()
+
+    def para_dict(self, tamanho_sql: int = 300) -> dict:
+        sql = " ".join(self.sql.split())
+        return {
+            "sql": sql if len(sql) <= tamanho_sql else sql[:tamanho_sql] + "...",
+            "vezes": self.vezes,
+            "ms": round(self.segundos * 1000, 1),
+            "origens": [f"{origem} ({vezes}x)" for origem, vezes in self.origens.most_common(3)],
+        }
+
+
+class PerfilConsultas:
+    """Consultas executadas durante uma requisição (ou um bloco de teste)"""
+
+    def __init__(self):
+        self.comandos: Dict[str, ComandoSQL] = {}
+        self.total = 0
+        self.segundos = 0.0
+        self._lock = threading.Lock()
+
+    def registrar(self, sql: str, segundos: float, origem: str) -> None:
+        with self._lock:
+            comando = self.comandos.get(sql)
+            if comando is None:
+                comando = self.comandos[sql] = ComandoSQL(sql)
+            comando.vezes += 1
+            comando.segundos += segundos
+            comando.origens[origem] += 1
+            self.total += 1
+            self.segundos += segundos
+
+    def repetidos(self, minimo: int = 2) -> List[ComandoSQL]:
+        """Comandos executados `minimo` vezes ou mais, do mais repetido ao menos"""
+        return sorted(
+            (c for c in self.comandos.values() if c.vezes >= minimo),
+            key=lambda c: (c.vezes, c.segundos),
+            reverse=True,
+        )
+
+    def piores(self, limite: int = 5) -> List[ComandoSQL]:
+        """Comandos que mais custaram (repetições x tempo)"""
+        return sorted(self.comandos.values(), key=lambda c: (c.segundos, c.vezes), reverse=True)[:limite]
+
+    def resumo(self, limite: int = 5) -> dict:
+        return {
+            "consultas": self.total,
+            "distintas": len(self.comandos),
+            "db_ms": round(self.segundos * 1000, 1),
+            "repetidas": [c.para_dict() for c in self.repetidos()[:limite]],
+            "piores": [c.para_dict() for c in self.piores(limite)],
+        }
+
+
+# Perfil da requisição atual (criado pelo middleware). As rotas síncronas
+# rodam no threadpool com uma cópia do contexto, que aponta para o mesmo perfil
+_perfil: ContextVar[Optional[PerfilConsultas]] = ContextVar("perfil_consultas", default=None)
+
+# Perfis de orcamento_consultas(): recebem todas as consultas do processo,
+# qualquer que seja a thread (o TestClient roda a aplicação em outra thread)
+_globais: List[PerfilConsultas] = []
+
+_ativado = False
+_ativacao = threading.Lock()
+
+
+def ativar() -> None:
+    """Registra os eventos do SQLAlchemy (uma vez por processo)"""
+    global _ativado
+    with _ativacao:
+        if _ativado:
+            return
+        event.listen(Engine, "before_cursor_execute", _antes_do_sql)
+        event.listen(Engine, "after_cursor_execute", _depois_do_sql)
+        _ativado = True
+
+
+def iniciar() -> PerfilConsultas:
+    """Começa o perfil da requisição atual (chamado pelo middleware)"""
+    ativar()
+    perfil = PerfilConsultas()
+    _perfil.set(perfil)
+    return perfil
+
+
+def _origem() -> str:
+    """
+    Primeiro frame da aplicação na pilha: 'routes/relatorios.py:215 listar_relatorios'.
+    Fora da aplicação (scripts, testes), o primeiro frame fora do SQLAlchemy.
+    """
+    frame = sys._getframe(2)
+    externo = None
+    while frame is not None:
+        arquivo = frame.f_code.co_filename
+        if arquivo.startswith(_RAIZ_APP) and arquivo != _ESTE_ARQUIVO:
+            return f"{arquivo[len(_RAIZ_APP):]}:{frame.f_lineno} {frame.f_code.co_name}"
+        if externo is None and _SQLALCHEMY not in arquivo and arquivo != _ESTE_ARQUIVO:
+            externo = f"{os.path.basename(arquivo)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return externo or "desconhecida"
+
+
+def _antes_do_sql(conn, cursor, statement, parameters, context, executemany):
+    if _perfil.get() is not None or _globais:
+        conn.info.setdefault("consultas_inicio", []).append(time.perf_counter())
+
+
+def _depois_do_sql(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("consultas_inicio")
+    if not inicios:
+        return
+    segundos = time.perf_counter() - inicios.pop()
+    origem = _origem()
+    perfil = _perfil.get()
+    if perfil is not None:
+        perfil.registrar(statement, segundos, origem)
+    for perfil_global in _globais:
+        if perfil_global is not perfil:
+            perfil_global.registrar(statement, segundos, origem)
+
+
+def formatar(perfil: PerfilConsultas, limite: int = 5) -> str:
+    """Relatório legível dos comandos mais repetidos e mais caros"""
+    linhas = [f"{perfil.total} consultas ({len(perfil.comandos)} distintas), {perfil.segundos * 1000:.1f} ms"]
+    comandos = perfil.repetidos() or perfil.piores(limite)
+    for comando in comandos[:limite]:
+        dados = comando.para_dict(tamanho_sql=160)
+        linhas.append(f"  {dados['vezes']}x {dados['ms']} ms  {dados['sql']}")
+        for origem in dados["origens"]:
+            linhas.append(f"      em {origem}")
+    return "\n".join(linhas)
+
+
+@contextmanager
+def orcamento_consultas(maximo: int, repeticoes_maximas: Optional[int] = None) -> Iterator[PerfilConsultas]:
+    """
+    Falha (AssertionError) se o bloco executar mais de `maximo` consultas
+    ou, com repeticoes_maximas, se algum comando se repetir mais que isso.
+
+    Uso nos testes:
+        with orcamento_consultas(3):
+            client.get("/relatorios/")
+    """
+    ativar()
+    perfil = PerfilConsultas()
+    _globais.append(perfil)
+    try:
+        yield perfil
+    finally:
+        _globais.remove(perfil)
+
+    if perfil.total > maximo:
+        raise AssertionError(f"orçamento de {maximo} consultas ultrapassado: {formatar(perfil)}")
+    if repeticoes_maximas is not None:
+        repetidos = perfil.repetidos(repeticoes_maximas + 1)
+        if repetidos:
+            raise AssertionError(
+                f"comando repetido {repetidos[0].vezes}x (máximo {repeticoes_maximas}): {formatar(perfil)}"
+            )
@@ -0,0 +1,273 @@
+"""
+Envio de emails em segundo plano, com conexões SMTP reaproveitadas.
+
+As rotas só montam a mensagem e chamam enviador_emails.enfileirar(): a
+requisição não espera o SMTP (conexão, STARTTLS, login e envio levam
+centenas de ms) e o event loop não bloqueia nas rotas async.
+
+EMAIL_CONEXOES threads consomem a fila; cada uma mantém a sua conexão
+autenticada aberta e envia até EMAIL_LOTE mensagens por rodada nela. A
+conexão parada por mais de EMAIL_OCIOSO_SECONDS é fechada (os servidores
+derrubam conexões ociosas) e reaberta no próximo envio.
+
+Falhas temporárias (conexão caída, resposta 4xx) voltam para a fila com
+espera crescente: EMAIL_BACKOFF_SECONDS, o dobro, e assim por diante, até
+EMAIL_MAX_TENTATIVAS. Respostas 5xx (destinatário inexistente, mensagem
+recusada) não são repetidas.
+
+A fila fica em memória: no shutdown parar() espera o envio do que já está
+pronto; o que ainda aguardava nova tentativa vai para o log.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import smtplib
+import threading
+import time
+from dataclasses import dataclass, field
+from email.message import Message
+from typing import List, Optional
+from app.config import settings
+from app.core import metricas
+
+logger = logging.getLogger(__name__)
+
+# Espera máxima entre tentativas (segundos)
+_BACKOFF_MAXIMO = 300
+
+
+@dataclass(order=True)
+class _Pendente:
+    quando: float
+    sequencia: int
+    mensagem: Message = field(compare=False)
+    tentativas: int = field(default=0, compare=False)
+
+
+def _permanente(erro: Exception) -> bool:
+    """Resposta 5xx do servidor: repetir não adianta"""
+    if isinstance(erro, smtplib.SMTPRecipientsRefused):
+        return all(codigo >= 500 for codigo, _ in erro.recipients.values())
+    codigo = getattr(erro, "smtp_code", None)
+    return isinstance(codigo, int) and codigo >= 500 and not isinstance(erro, smtplib.SMTPAuthenticationError)
+
+
+class _Conexao:
+    """Conexão SMTP autenticada de uma thread, aberta sob demanda"""
+
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._ultimo_uso = 0.0
+
+    def enviar(self, mensagem: Message) -> None:
+        if self._smtp is None:
+            self._abrir()
+        try:
+            self._smtp.send_message(mensagem)
+        except smtplib.SMTPServerDisconnected:
+            # Derrubada pelo servidor desde o último envio: reabre uma vez
+            self.fechar()
+            self._abrir()
+            self._smtp.send_message(mensagem)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # Conexão continua utilizável; a mensagem é que foi recusada
+            self._ultimo_uso = time.monotonic()
+            raise
+        except Exception:
+            self.fechar()
+            raise
+        self._ultimo_uso = time.monotonic()
+
+    def fechar_se_ociosa(self, limite: float) -> None:
+        if self._smtp is not None and time.monotonic() - self._ultimo_uso > limite:
+            self.fechar()
+
+    def fechar(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+    def _abrir(self) -> None:
+        smtp = smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT, timeout=settings.EMAIL_TIMEOUT_SECONDS)
+        try:
+            if settings.MAIL_STARTTLS:
+                smtp.starttls()
+            if settings.MAIL_USERNAME:
+                smtp.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self._ultimo_uso = time.monotonic()
+        metricas.EMAIL_CONEXOES.inc()
+
+
+class EnviadorEmails:
+    """
+    Fila de emails e threads de envio (ver docstring do módulo).
+    Instância global: iniciar() no startup, parar() no shutdown.
+    """
+
+    def __init__(self, conexoes: int, lote: int, max_tentativas: int, backoff: float, ocioso: float):
+        self._conexoes = conexoes
+        self._lote = lote
+        self._max_tentativas = max_tentativas
+        self._backoff = backoff
+        self._ocioso = ocioso
+        self._pendentes: List[_Pendente] = []  # heap por horário de envio
+        self._em_envio = 0
+        self._sequencia = itertools.count()
+        self._condicao = threading.Condition()
+        self._parar = False
+        self._threads: List[threading.Thread] = []
+
+    def enfileirar(self, mensagem: Message) -> None:
+        """Agenda o envio; retorna na hora"""
+        self._agendar(_Pendente(time.monotonic(), next(self._sequencia), mensagem))
+
+    def pendentes(self) -> int:
+        """Mensagens na fila ou sendo enviadas"""
+        with self._condicao:
+            return len(self._pendentes) + self._em_envio
+
+    def aguardar(self, timeout: float) -> bool:
+        """Espera a fila esvaziar (testes e shutdown); False se esgotou o tempo"""
+        limite = time.monotonic() + timeout
+        with self._condicao:
+            while self._pendentes or self._em_envio:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                self._condicao.wait(restante)
+            return True
+
+    def iniciar(self) -> None:
+        if self._threads:
+            return
+        self._parar = False
+        for n in range(self._conexoes):
+            thread = threading.Thread(target=self._executar, name=f"enviador-emails-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def parar(self, timeout: float = 10) -> None:
+        """Envia o que já está pronto (até timeout) e encerra as threads"""
+        if not self._threads:
+            return
+        limite = time.monotonic() + timeout
+        with self._condicao:
+            while self._em_envio or any(p.quando <= time.monotonic() for p in self._pendentes):
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                self._condicao.wait(restante)
+            self._parar = True
+            self._condicao.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=max(limite - time.monotonic(), 1))
+        self._threads = []
+        with self._condicao:
+            for pendente in self._pendentes:
+                self._descartar(pendente, "shutdown")
+            self._pendentes = []
+
+    def _agendar(self, pendente: _Pendente) -> None:
+        with self._condicao:
+            heapq.heappush(self._pendentes, pendente)
+            self._condicao.notify()
+
+    def _proximo_lote(self) -> List[_Pendente]:
+        """Até EMAIL_LOTE mensagens prontas; espera se não houver nenhuma"""
+        with self._condicao:
+            while not self._parar:
+                agora = time.monotonic()
+                lote = []
+                while self._pendentes and self._pendentes[0].quando <= agora and len(lote) < self._lote:
+                    lote.append(heapq.heappop(self._pendentes))
+                if lote:
+                    self._em_envio += len(lote)
+                    return lote
+                espera = self._ocioso
+                if self._pendentes:
+                    espera = min(espera, self._pendentes[0].quando - agora)
+                if not self._condicao.wait(espera):
+                    return []  # tempo esgotado: dá a chance de fechar a conexão ociosa
+            return []
+
+    def _executar(self) -> None:
+        conexao = _Conexao()
+        try:
+            while not self._parar:
+                lote = self._proximo_lote()
+                if not lote:
+                    conexao.fechar_se_ociosa(self._ocioso)
+                    continue
+                for pendente in lote:
+                    self._enviar(conexao, pendente)
+                with self._condicao:
+                    self._em_envio -= len(lote)
+                    self._condicao.notify_all()
+        finally:
+            conexao.fechar()
+
+    def _enviar(self, conexao: _Conexao, pendente: _Pendente) -> None:
+        inicio = time.perf_counter()
+        pendente.tentativas += 1
+        try:
+            with metricas.EMAIL_SEGUNDOS.time():
+                conexao.enviar(pendente.mensagem)
+        except Exception as e:
+            self._falhou(pendente, e, inicio)
+            return
+        logger.info("email_enviado", extra={
+            "destino": pendente.mensagem["To"],
+            "assunto": pendente.mensagem["Subject"],
+            "tentativas": pendente.tentativas,
+            "duracao_ms": round((time.perf_counter() - inicio) * 1000, 1),
+        })
+
+    def _falhou(self, pendente: _Pendente, erro: Exception, inicio: float) -> None:
+        dados = {
+            "destino": pendente.mensagem["To"],
+            "assunto": pendente.mensagem["Subject"],
+            "tentativas": pendente.tentativas,
+            "motivo": str(erro),
+            "duracao_ms": round((time.perf_counter() - inicio) * 1000, 1),
+        }
+        if _permanente(erro) or pendente.tentativas >= self._max_tentativas:
+            metricas.EMAIL_FALHAS.inc()
+            logger.error("email_falhou", extra=dados)
+            return
+        # Espera dobra a cada tentativa, com variação para as threads não
+        # baterem juntas no servidor quando ele volta
+        espera = min(self._backoff * 2 ** (pendente.tentativas - 1), _BACKOFF_MAXIMO)
+        espera *= random.uniform(0.8, 1.2)
+        metricas.EMAIL_REPETICOES.inc()
+        logger.warning("email_adiado", extra={**dados, "espera_s": round(espera, 1)})
+        pendente.quando = time.monotonic() + espera
+        self._agendar(pendente)
+
+    def _descartar(self, pendente: _Pendente, motivo: str) -> None:
+        metricas.EMAIL_FALHAS.inc()
+        logger.error("email_nao_enviado", extra={
+            "destino": pendente.mensagem["To"],
+            "assunto": pendente.mensagem["Subject"],
+            "tentativas": pendente.tentativas,
+            "motivo": motivo,
+        })
+
+
+# Instância global (uma por worker)
+enviador_emails = EnviadorEmails(
+    settings.EMAIL_CONEXOES,
+    settings.EMAIL_LOTE,
+    settings.EMAIL_MAX_TENTATIVAS,
+    settings.EMAIL_BACKOFF_SECONDS,
+    settings.EMAIL_OCIOSO_SECONDS,
+)
@@ -0,0 +1,81 @@
+import logging
+import threading
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+from app.config import settings
+from app.database import SessionLocal
+from app.services.exclusao_service import ExclusaoService
+
+logger = logging.getLogger(__name__)
+
+
+class ColetorArquivos:
+    """
+    Remove em segundo plano os arquivos de upload agendados para exclusão.
+
+    As rotas chamam agendar(db, filtro) antes de apagar fotos; no commit o
+    coletor é acordado e esvazia a fila em lotes de EXCLUSAO_LOTE. Também
+    varre a fila a cada EXCLUSAO_INTERVALO_SECONDS (pendências de outros
+    workers, ou que falharam antes).
+    """
+
+    def __init__(self, intervalo: int, lote: int):
+        self._intervalo = intervalo
+        self._lote = lote
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def agendar(self, db: Session, filtro: ColumnElement) -> None:
+        """
+        Agenda os arquivos das fotos do filtro na transação atual.
+        Chamar antes de apagar as fotos; a remoção acontece após o commit.
+        """
+        ExclusaoService.agendar(db, filtro)
+        event.listen(db, "after_commit", lambda _session: self._acordar.set(), once=True)
+
+    def iniciar(self) -> None:
+        if self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="coletor-arquivos", daemon=True)
+        self._thread.start()
+
+    def parar(self) -> None:
+        self._parar.set()
+        self._acordar.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def coletar(self) -> int:
+        """Esvazia a fila (lote a lote); retorna quantas pendências resolveu"""
+        total = 0
+        while not self._parar.is_set():
+            db = SessionLocal()
+            try:
+                resolvidas = ExclusaoService.processar_lote(db, self._lote)
+            finally:
+                db.close()
+            total += resolvidas
+            if resolvidas < self._lote:
+                return total
+        return total
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            self._acordar.wait(self._intervalo)
+            self._acordar.clear()
+            if self._parar.is_set():
+                return
+            try:
+                self.coletar()
+            except Exception:
+                # Fica para a próxima varredura
+                logger.exception("coletor_arquivos_falhou")
+
+
+# Instância global (uma por worker)
+coletor_arquivos = ColetorArquivos(settings.EXCLUSAO_INTERVALO_SECONDS, settings.EXCLUSAO_LOTE)
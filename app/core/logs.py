@@ -0,0 +1,155 @@
+"""
+Logs estruturados (uma linha JSON por evento) sem bloquear as requisições.
+
+Os módulos usam o logging padrão, com o nome do evento como mensagem e os
+dados em extra:
+
+    logger = logging.getLogger(__name__)
+    logger.info("email_enviado", extra={"destino": email, "duracao_ms": 120.5})
+
+Todos os loggers "app.*" passam por um QueueHandler: a thread da
+requisição (ou o event loop) só coloca o registro numa fila em memória; a
+formatação em JSON e a escrita em stdout acontecem numa thread separada
+(QueueListener). Com a fila cheia o registro é descartado e contado, em vez
+de esperar: log sob carga nunca segura uma requisição.
+
+Cada linha leva o request_id da requisição (RequestIdMiddleware).
+Eventos frequentes podem ser amostrados (LOG_AMOSTRAGEM); avisos e erros
+nunca são descartados pela amostragem.
+"""
+
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from app.config import settings
+
+# Id da requisição atual (definido pelo RequestIdMiddleware); as rotas
+# síncronas rodam no threadpool com uma cópia do contexto
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Atributos de todo LogRecord; o resto veio de extra=
+_PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id", "amostragem"}
+
+
+class FormatoJSON(logging.Formatter):
+    """{"ts": ..., "nivel": ..., "logger": ..., "evento": ..., "request_id": ..., **extra}"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        linha = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "evento": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            linha["request_id"] = record.request_id
+        if getattr(record, "amostragem", None) is not None:
+            # Cada linha representa 1/amostragem eventos
+            linha["amostragem"] = record.amostragem
+        for chave, valor in record.__dict__.items():
+            if chave not in _PADRAO:
+                linha[chave] = valor
+        if record.exc_text:
+            linha["erro"] = record.exc_text
+        return json.dumps(linha, ensure_ascii=False, default=str)
+
+
+class _Amostragem(logging.Filter):
+    """Mantém só uma fração dos eventos configurados (abaixo de WARNING)"""
+
+    def __init__(self, taxas: Dict[str, float]):
+        super().__init__()
+        self.taxas = taxas
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        taxa = self.taxas.get(record.msg)
+        if taxa is None:
+            return True
+        record.amostragem = taxa
+        return random.random() < taxa
+
+
+class _FilaSemBloqueio(QueueHandler):
+    """QueueHandler que descarta (e conta) em vez de esperar com a fila cheia"""
+
+    def __init__(self, fila: queue.Queue):
+        super().__init__(fila)
+        self.descartados = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Na thread de quem registra: só o que depende dela (contexto,
+        # traceback). O JSON é montado na thread do listener
+        record.request_id = request_id.get()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.descartados:
+                self.queue.put_nowait(self._aviso_descartados())
+                self.descartados = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+    def _aviso_descartados(self) -> logging.LogRecord:
+        return logging.makeLogRecord({
+            "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+            "msg": "logs_descartados", "descartados": self.descartados,
+        })
+
+class Logs:
+    """
+    Liga os loggers "app.*" à fila e à thread de escrita.
+    Instância global: logs.iniciar() no startup, logs.parar() no shutdown.
+    """
+
+    def __init__(self):
+        self._handler: Optional[_FilaSemBloqueio] = None
+        self._listener: Optional[QueueListener] = None
+
+    def iniciar(self) -> None:
+        if self._listener is not None:
+            return
+        fila: queue.Queue = queue.Queue(maxsize=settings.LOG_FILA_MAXIMA)
+        saida = logging.StreamHandler(sys.stdout)
+        saida.setFormatter(FormatoJSON())
+
+        self._handler = _FilaSemBloqueio(fila)
+        self._handler.addFilter(_Amostragem(settings.LOG_AMOSTRAGEM))
+        self._listener = QueueListener(fila, saida, respect_handler_level=False)
+        self._listener.start()
+
+        raiz = logging.getLogger("app")
+        raiz.addHandler(self._handler)
+        raiz.setLevel(settings.LOG_LEVEL.upper())
+        raiz.propagate = False
+
+    def parar(self) -> None:
+        """Escreve o que ainda está na fila e encerra a thread"""
+        if self._listener is None:
+            return
+        raiz = logging.getLogger("app")
+        raiz.removeHandler(self._handler)
+        raiz.propagate = True
+        if self._handler.descartados:
+            # Sem pressa no shutdown: espera vaga na fila para o aviso
+            self._handler.queue.put(self._handler._aviso_descartados())
+        self._listener.stop()
+        self._listener = None
+        self._handler = None
+
+
+logs = Logs()
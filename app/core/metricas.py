@@ -0,0 +1,115 @@
+"""
+Métricas Prometheus da aplicação (expostas em GET /metrics).
+
+Com vários workers do uvicorn, defina PROMETHEUS_MULTIPROC_DIR (um
+diretório vazio a cada deploy) antes de iniciar: cada processo grava as
+métricas em arquivos mmap nesse diretório e /metrics soma todos eles, não
+importa qual worker atende a coleta. Sem a variável, cada processo expõe
+só as próprias métricas (um worker, desenvolvimento).
+
+Registrar uma medida custa uma escrita em memória; sem I/O no caminho
+das requisições.
+"""
+
+import os
+from typing import Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESSO = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Buckets (segundos) para operações rápidas (banco, hash) e lentas (PDF, SMTP)
+_RAPIDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_LENTOS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_BYTES = (10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000)
+
+# =============== HTTP ===============
+
+REQUISICAO_SEGUNDOS = Histogram(
+    "http_request_duration_seconds",
+    "Duração das requisições por rota (template do caminho)",
+    ["metodo", "rota", "status"],
+)
+REQUISICOES_EM_ANDAMENTO = Gauge(
+    "http_requests_in_progress",
+    "Requisições sendo atendidas agora",
+    ["metodo"],
+    multiprocess_mode="livesum",
+)
+
+# =============== POOL DE CONEXÕES ===============
+
+POOL_TAMANHO = Gauge(
+    "db_pool_size",
+    "Conexões mantidas no pool (soma dos workers)",
+    ["banco"],
+    multiprocess_mode="livesum",
+)
+POOL_EM_USO = Gauge(
+    "db_pool_checked_out",
+    "Conexões do pool em uso",
+    ["banco"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Conexões extras (acima de DB_POOL_SIZE) abertas",
+    ["banco"],
+    multiprocess_mode="livesum",
+)
+POOL_ESPERA_SEGUNDOS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera por uma conexão livre no pool",
+    ["banco"],
+    buckets=_RAPIDOS,
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Checkouts que desistiram após DB_POOL_TIMEOUT",
+    ["banco"],
+)
+
+# =============== PDF, IMAGENS, EMAIL, SENHAS ===============
+
+PDF_SEGUNDOS = Histogram("pdf_render_duration_seconds", "Geração de PDF (reportlab)", buckets=_LENTOS)
+PDF_BYTES = Histogram("pdf_output_bytes", "Tamanho dos PDFs gerados", buckets=_BYTES)
+
+IMAGEM_SEGUNDOS = Histogram(
+    "image_processing_duration_seconds", "Otimização das fotos enviadas (Pillow)", buckets=_LENTOS
+)
+IMAGEM_BYTES_ENTRADA = Counter("image_input_bytes", "Bytes recebidos em uploads de fotos")
+IMAGEM_BYTES_SAIDA = Counter("image_output_bytes", "Bytes gravados após a otimização")
+
+EMAIL_SEGUNDOS = Histogram("email_send_duration_seconds", "Envio de emails por SMTP", buckets=_LENTOS)
+EMAIL_FALHAS = Counter("email_send_failures", "Emails que falharam ao enviar")
+EMAIL_REPETICOES = Counter("email_send_retries", "Envios adiados para nova tentativa")
+EMAIL_CONEXOES = Counter("email_smtp_connections", "Conexões SMTP abertas (handshake + login)")
+
+SENHA_SEGUNDOS = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt: gerar hash ou verificar senha",
+    ["operacao"],
+    buckets=_RAPIDOS,
+)
+
+
+def exportar() -> Tuple[bytes, str]:
+    """Corpo e content-type da coleta (todas as métricas, de todos os workers)"""
+    if MULTIPROCESSO:
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+        return generate_latest(registro), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def encerrar_processo() -> None:
+    """Remove os gauges 'live' deste worker da soma (chamar no shutdown)"""
+    if MULTIPROCESSO:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from typing import Dict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.token_revogado import TokenRevogado
+from app.models.users import User
+
+logger = logging.getLogger(__name__)
+
+# Margem (segundos) para tolerar diferença de relógio entre os workers
+_MARGEM_SYNC = 60
+
+
+class RevocationList:
+    """
+    Cópia em memória da tabela 'tokens_revogados'.
+
+    Cada worker mantém o dicionário {user_id: revogado_em} e o sincroniza
+    com o banco a cada TOKEN_REVOCATION_SYNC_SECONDS, buscando apenas as
+    linhas novas. Entradas mais antigas que a validade do refresh token
+    são descartadas, pois qualquer token emitido antes delas já expirou.
+    """
+
+    def __init__(self, sync_interval: int):
+        self._sync_interval = sync_interval
+        self._revogados: Dict[int, float] = {}
+        self._marca = 0.0  # maior 'revogado_em' já visto
+        self._ultimo_sync = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _limite_validade() -> float:
+        """Tokens emitidos antes deste instante já expiraram"""
+        return time.time() - settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+    def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        """Verifica se o token emitido em 'issued_at' foi revogado"""
+        self._sincronizar_se_necessario()
+        revogado_em = self._revogados.get(user_id)
+        return revogado_em is not None and issued_at <= revogado_em
+
+    def revoke(self, db: Session, user_id: int) -> None:
+        """
+        Revoga todos os tokens já emitidos para o usuário.
+        Grava na sessão atual; a rota é responsável pelo commit.
+        """
+        agora = time.time()
+        db.merge(TokenRevogado(user_id=user_id, revogado_em=agora))
+
+        # Limpa entradas que não revogam mais nada
+        db.query(TokenRevogado).filter(
+            TokenRevogado.revogado_em < self._limite_validade()
+        ).delete(synchronize_session=False)
+
+        # Este worker passa a rejeitar os tokens quando a revogação for
+        # gravada; se a transação falhar, nada muda
+        event.listen(db, "after_commit", lambda _session: self._aplicar(user_id, agora), once=True)
+
+    def _aplicar(self, user_id: int, revogado_em: float) -> None:
+        with self._lock:
+            if revogado_em > self._revogados.get(user_id, 0.0):
+                self._revogados[user_id] = revogado_em
+
+    def _sincronizar_se_necessario(self) -> None:
+        if time.monotonic() - self._ultimo_sync < self._sync_interval:
+            return
+
+        with self._lock:
+            if time.monotonic() - self._ultimo_sync < self._sync_interval:
+                return
+            try:
+                self._sincronizar()
+            except Exception:
+                # Mantém a lista atual; tenta de novo no próximo intervalo
+                logger.exception("revogacao_sync_falhou")
+            self._ultimo_sync = time.monotonic()
+
+    def _sincronizar(self) -> None:
+        limite = self._limite_validade()
+        desde = max(self._marca - _MARGEM_SYNC, limite)
+
+        db = SessionLocal()
+        try:
+            linhas = db.query(TokenRevogado.user_id, TokenRevogado.revogado_em).filter(
+                TokenRevogado.revogado_em > desde
+            ).all()
+        finally:
+            db.close()
+
+        for user_id, revogado_em in linhas:
+            if revogado_em > self._revogados.get(user_id, 0.0):
+                self._revogados[user_id] = revogado_em
+            self._marca = max(self._marca, revogado_em)
+
+        self._revogados = {
+            user_id: revogado_em
+            for user_id, revogado_em in self._revogados.items()
+            if revogado_em >= limite
+        }
+
+
+# Instância global (uma por worker)
+revocation_list = RevocationList(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+
+
+@event.listens_for(Session, "before_flush")
+def _revogar_desativados(session: Session, flush_context, instances) -> None:
+    """
+    Desativar um usuário (user.is_active = False pelo ORM) revoga os tokens
+    dele na mesma transação: as claims dos tokens já emitidos ainda dizem
+    is_active=True. UPDATEs em massa não passam por aqui; chame revoke().
+    """
+    for objeto in session.dirty:
+        if isinstance(objeto, User) and not objeto.is_active and inspect(objeto).attrs.is_active.history.has_changes():
+            revocation_list.revoke(session, objeto.id)
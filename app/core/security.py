@@ -1,47 +1,75 @@
+import time
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Optional, Dict, Any
 from app.config import settings
+from app.core import metricas
 
-# Configuração para criptografar senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# python-jose e passlib são importados dentro das funções, no primeiro uso:
+# ficam fora do caminho de inicialização dos workers
+
+
+@lru_cache(maxsize=None)
+def _pwd_context():
+    """Configuração para criptografar senhas"""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha digitada corresponde ao hash salvo no banco"""
-    return pwd_context.verify(plain_password, hashed_password)
+    with metricas.SENHA_SEGUNDOS.labels("verificar").time():
+        return _pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Transforma a senha em um hash para salvar no banco"""
-    return pwd_context.hash(password)
+    with metricas.SENHA_SEGUNDOS.labels("hash").time():
+        return _pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria um token JWT de acesso (expira em 30 minutos)"""
+    from jose import jwt
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "type": "access"})
+    # iat com fração de segundo para comparar com a lista de revogação
+    to_encode.update({"exp": expire, "iat": time.time(), "type": "access"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 def create_refresh_token(data: dict) -> str:
     """Cria um token JWT de refresh (expira em 7 dias)"""
+    from jose import jwt
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": time.time(), "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+def build_token_claims(user) -> Dict[str, Any]:
+    """
+    Monta as claims do usuário embutidas nos tokens de acesso e refresh.
+    Com elas a autorização é decidida só pelo token, sem consultar o banco.
+    """
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "is_active": bool(user.is_active),
+        "is_verified": bool(user.is_verified),
+        "is_superuser": bool(user.is_superuser),
+    }
+
+
 def create_email_token(email: str, token_type: str = "verify") -> str:
     """Cria um token para verificação de email ou reset de senha"""
+    from jose import jwt
     expire_hours = (
         settings.EMAIL_VERIFICATION_TOKEN_EXPIRE_HOURS 
         if token_type == "verify" 
@@ -56,6 +84,7 @@ def create_email_token(email: str, token_type: str = "verify") -> str:
 
 def verify_token(token: str, expected_type: str = "access") -> Optional[str]:
     """Verifica se o token é válido e retorna o email do usuário"""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -65,4 +94,17 @@ def verify_token(token: str, expected_type: str = "access") -> Optional[str]:
             return None
         return email
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def decode_token(token: str, expected_type: str = "access") -> Optional[Dict[str, Any]]:
+    """Verifica se o token é válido e retorna todas as claims (payload)"""
+    from jose import JWTError, jwt
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    
+    if payload.get("sub") is None or payload.get("type") != expected_type:
+        return None
+    return payload
\ No newline at end of file
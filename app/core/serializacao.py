@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Any
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from app.core.tempos import medir
+
+
+@lru_cache(maxsize=None)
+def _adaptador(tipo: Any) -> TypeAdapter:
+    return TypeAdapter(tipo)
+
+
+def resposta_json(tipo: Any, dados: Any, status_code: int = 200) -> Response:
+    """
+    Valida os dados (objetos ORM ou listas deles) com o schema e serializa
+    direto para bytes JSON no pydantic-core.
+
+    Evita o caminho padrão do FastAPI (modelo -> dict -> jsonable_encoder
+    -> json.dumps), que domina a latência em respostas grandes. O corpo é
+    o mesmo; o response_model da rota continua documentando a resposta.
+
+    Args:
+        tipo: Schema ou tipo de lista (ex: RelatorioResponse, List[ClienteResponse])
+        dados: Objeto ou lista a serializar
+    """
+    adaptador = _adaptador(tipo)
+    with medir("serializacao"):
+        conteudo = adaptador.dump_json(adaptador.validate_python(dados, from_attributes=True))
+    return Response(content=conteudo, media_type="application/json", status_code=status_code)
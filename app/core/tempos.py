@@ -0,0 +1,76 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Fases medidas em cada requisição (nome no header Server-Timing):
+#   db           comandos SQL (todos os engines: primário e réplica)
+#   serializacao validação + JSON das respostas (resposta_json)
+#   pdf          geração do PDF (reportlab)
+#   imagem       otimização das fotos enviadas (Pillow)
+# (emails saem em segundo plano, fora da requisição: app/core/emails.py)
+FASES = ("db", "serializacao", "pdf", "imagem")
+
+# Tempos da requisição atual: fase -> [segundos, ocorrências].
+# O dict é criado pelo ServerTimingMiddleware; as rotas síncronas rodam no
+# threadpool com uma cópia do contexto, que aponta para o mesmo dict.
+_tempos: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("tempos", default=None)
+
+
+def iniciar() -> Dict[str, List[float]]:
+    """Começa a medir a requisição atual (chamado pelo middleware)"""
+    tempos: Dict[str, List[float]] = {}
+    _tempos.set(tempos)
+    return tempos
+
+
+def registrar(fase: str, segundos: float) -> None:
+    """Soma uma duração à fase; fora de uma requisição medida não faz nada"""
+    tempos = _tempos.get()
+    if tempos is None:
+        return
+    acumulado = tempos.setdefault(fase, [0.0, 0])
+    acumulado[0] += segundos
+    acumulado[1] += 1
+
+
+@contextmanager
+def medir(fase: str) -> Iterator[None]:
+    """
+    Mede o bloco como parte da fase.
+
+    Uso nos serviços:
+        with medir("pdf"):
+            doc.build(elements)
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(fase, time.perf_counter() - inicio)
+
+
+# =============== SQL (eventos do SQLAlchemy) ===============
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_do_sql(conn, cursor, statement, parameters, context, executemany):
+    if _tempos.get() is not None:
+        conn.info.setdefault("tempos_inicio", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_do_sql(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("tempos_inicio")
+    if inicios:
+        registrar("db", time.perf_counter() - inicios.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _erro_no_sql(contexto):
+    # Comando que falhou não passa pelo after_cursor_execute
+    if contexto.connection is not None:
+        inicios = contexto.connection.info.get("tempos_inicio")
+        if inicios:
+            registrar("db", time.perf_counter() - inicios.pop())
@@ -0,0 +1,22 @@
+from anyio import to_thread
+
+
+def configurar_threadpool(total: int) -> None:
+    """
+    Ajusta quantas rotas síncronas (def) rodam ao mesmo tempo.
+
+    O FastAPI executa essas rotas no threadpool do anyio (padrão: 40
+    threads). Precisa ser chamado dentro do event loop (startup async).
+    """
+    to_thread.current_default_thread_limiter().total_tokens = total
+
+
+def estatisticas_threadpool() -> dict:
+    """Ocupação do threadpool; chamar de dentro do event loop (rota async)"""
+    estatisticas = to_thread.current_default_thread_limiter().statistics()
+    return {
+        "tamanho": int(estatisticas.total_tokens),
+        "em_uso": estatisticas.borrowed_tokens,
+        # Requisições esperando uma thread livre
+        "aguardando": estatisticas.tasks_waiting,
+    }
@@ -1,23 +1,125 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.functions import now
 from app.config import settings
+from app.core import metricas
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # Mostra SQL no console apenas em modo debug
-    pool_pre_ping=True,  # Verifica conexão antes de usar
-    pool_size=10,  # Número de conexões mantidas no pool
-    max_overflow=20  # Conexões extras permitidas em picos de acesso
-)
+class PoolMedido(QueuePool):
+    """
+    QueuePool que mede quanto cada checkout esperou por uma conexão.
+
+    Com o pool esgotado, as threads das rotas ficam bloqueadas aqui até
+    DB_POOL_TIMEOUT; sem medir, essa fila não aparece em lugar nenhum.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock_medidas = threading.Lock()
+        self.checkouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.timeouts = 0
+
+    @property
+    def banco(self) -> str:
+        # pool_logging_name do engine ("primario" / "replica"), mantido em recreate()
+        return self._orig_logging_name or "primario"
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._lock_medidas:
+                self.timeouts += 1
+            metricas.POOL_TIMEOUTS.labels(self.banco).inc()
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._lock_medidas:
+                self.checkouts += 1
+                self.espera_total += espera
+                self.espera_maxima = max(self.espera_maxima, espera)
+            metricas.POOL_ESPERA_SEGUNDOS.labels(self.banco).observe(espera)
+
+def _criar_engine(url: str, banco: str) -> Engine:
+    novo = create_engine(
+        url,
+        echo=settings.DEBUG,  # Mostra SQL no console apenas em modo debug
+        poolclass=PoolMedido,
+        pool_logging_name=banco,
+        pool_pre_ping=True,  # Verifica conexão antes de usar
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE
+    )
+
+    # Ocupação do pool nas métricas (/metrics)
+    metricas.POOL_TAMANHO.labels(banco).set(settings.DB_POOL_SIZE)
+
+    @event.listens_for(novo, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        metricas.POOL_EM_USO.labels(banco).inc()
+        metricas.POOL_OVERFLOW.labels(banco).set(max(novo.pool.overflow(), 0))
+
+    @event.listens_for(novo, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        metricas.POOL_EM_USO.labels(banco).dec()
+        metricas.POOL_OVERFLOW.labels(banco).set(max(novo.pool.overflow(), 0))
+
+    return novo
+
+engine = _criar_engine(settings.DATABASE_URL, "primario")
+
+# Réplica de leitura (None = leituras também no primário)
+replica_engine = _criar_engine(settings.DATABASE_REPLICA_URL, "replica") if settings.DATABASE_REPLICA_URL else None
+
+# SQLite só valida chaves estrangeiras com o PRAGMA ligado
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _ativar_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+# No SQLite, now() seria CURRENT_TIMESTAMP (resolução de segundos); com
+# milissegundos, created_at/updated_at distinguem escritas no mesmo segundo
+# (usados nos ETags e no cache do catálogo)
+@compiles(now, "sqlite")
+def _now_sqlite(element, compiler, **kw):
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
 
 # SessionLocal: factory para criar sessões de banco de dados
 SessionLocal = sessionmaker(
     autocommit=False,  # Transações manuais (mais controle)
     autoflush=False,  # Não salva automaticamente (mais controle)
+    expire_on_commit=False,  # Objetos retornados por RETURNING continuam válidos após o commit
     bind=engine
 )
 
+# Sessões das rotas somente leitura quando há réplica
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=replica_engine
+) if replica_engine is not None else None
+
+if ReplicaSessionLocal is not None:
+    @event.listens_for(ReplicaSessionLocal, "before_flush")
+    def _bloquear_escrita_replica(session, flush_context, instances):
+        raise RuntimeError("Escrita em sessão de leitura (réplica); use get_db")
+
 # Base: classe base para todos os modelos
 # Todos os modelos herdarão desta classe
 Base = declarative_base()
@@ -41,12 +143,78 @@ def get_db():
     finally:
         db.close()  # Garante que a conexão seja fechada
 
+# Cookie e header que mandam as leituras ao primário (ler o que acabou de escrever)
+COOKIE_LEITURA_PRIMARIO = "leitura_primario"
+HEADER_LEITURA_PRIMARIO = "x-leitura-primario"
+
+def _ler_do_primario(request: Request) -> bool:
+    if request.headers.get(HEADER_LEITURA_PRIMARIO) in ("1", "true"):
+        return True
+    # Valor do cookie: instante (epoch) da última escrita do cliente
+    escrita = request.cookies.get(COOKIE_LEITURA_PRIMARIO)
+    try:
+        return escrita is not None and time.time() - float(escrita) < settings.REPLICA_STICKY_SECONDS
+    except ValueError:
+        return False
+
+def get_read_db(request: Request):
+    """
+    Dependency das rotas somente leitura.
+    
+    Usa a réplica quando configurada (DATABASE_REPLICA_URL), exceto se o
+    cliente escreveu há menos de REPLICA_STICKY_SECONDS (cookie definido
+    pelo ReplicaStickyMiddleware) ou pediu o primário com o header
+    X-Leitura-Primario: 1. A sessão da réplica recusa escritas.
+    """
+    if ReplicaSessionLocal is None or _ler_do_primario(request):
+        db = SessionLocal()
+    else:
+        db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def dialect_insert(model):
+    """
+    Retorna um INSERT do dialeto em uso.
+    
+    Os inserts de PostgreSQL e SQLite suportam ON CONFLICT
+    (on_conflict_do_nothing / on_conflict_do_update) e RETURNING,
+    permitindo criar registros com um único comando.
+    """
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return insert(model)
+
+def estatisticas_pool(alvo: Engine = engine) -> dict:
+    """Ocupação do pool de conexões e esperas por checkout desde o início"""
+    pool = alvo.pool
+    with pool._lock_medidas:
+        checkouts, espera_total, espera_maxima, timeouts = (
+            pool.checkouts, pool.espera_total, pool.espera_maxima, pool.timeouts
+        )
+    return {
+        "tamanho": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "em_uso": pool.checkedout(),
+        "livres": pool.checkedin(),
+        # overflow() começa em -tamanho; positivo = conexões extras abertas
+        "overflow_em_uso": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "espera_media_ms": round(espera_total / checkouts * 1000, 3) if checkouts else 0.0,
+        "espera_maxima_ms": round(espera_maxima * 1000, 3),
+        "timeouts": timeouts,
+    }
+
 # Função para criar todas as tabelas no banco
 def init_db():
     """
     Cria todas as tabelas definidas nos modelos.
     
-    Será chamada no main.py quando a aplicação iniciar.
-    Em produção, você usaria Alembic para migrations ao invés disso.
+    Usada por scripts de teste e benchmarks com bancos descartáveis; a
+    aplicação não a chama (o schema vem das migrations do Alembic).
     """
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -1,9 +1,25 @@
-from fastapi import FastAPI
+import logging
+import os
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.config import settings
-from app.database import init_db
-from app.routes import clientes, produtos, relatorios, auth  # ← Adicionado auth
+from app.database import estatisticas_pool, replica_engine
+from app.core import metricas
+from app.core.catalogo import catalogo_produtos
+from app.core.emails import enviador_emails
+from app.core.exclusoes import coletor_arquivos
+from app.core.logs import logs
+from app.core.threadpool import configurar_threadpool, estatisticas_threadpool
+from app.middleware.compressao import CompressionMiddleware
+from app.middleware.consultas import PerfilSQLMiddleware
+from app.middleware.metricas import MetricsMiddleware
+from app.middleware.replica import ReplicaStickyMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.routes import clientes, produtos, relatorios, auth, dashboard
+
+logger = logging.getLogger(__name__)
 
 # Criar aplicação FastAPI
 app = FastAPI(
@@ -23,27 +39,85 @@ app.add_middleware(
     allow_headers=["*"],  # Permite todos os headers
 )
 
-# Servir arquivos estáticos (imagens do upload)
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+# Compressão gzip/brotli negociada pelo Accept-Encoding
+app.add_middleware(
+    CompressionMiddleware,
+    minimo_bytes=settings.COMPRESSION_MIN_SIZE,
+    nivel_gzip=settings.GZIP_LEVEL,
+    qualidade_brotli=settings.BROTLI_QUALITY,
+)
+
+# Com réplica de leitura: quem escreve lê do primário por alguns segundos
+if replica_engine is not None:
+    app.add_middleware(ReplicaStickyMiddleware, duracao_segundos=settings.REPLICA_STICKY_SECONDS)
+
+# Métricas Prometheus por rota (GET /metrics)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Consultas SQL por requisição (N+1, excesso de consultas) no log
+if settings.SQL_PROFILER:
+    app.add_middleware(
+        PerfilSQLMiddleware,
+        maximo_consultas=settings.SQL_PROFILER_MAX_QUERIES,
+        minimo_repeticoes=settings.SQL_PROFILER_REPETICOES,
+    )
+
+# Tempo por fase de cada requisição (header Server-Timing + log). Entre
+# os últimos: fica por fora dos outros e mede também o tempo deles
+if settings.SERVER_TIMING:
+    app.add_middleware(
+        ServerTimingMiddleware,
+        origens_permitidas=settings.CORS_ORIGINS,
+        log=settings.SERVER_TIMING_LOG,
+        lento_ms=settings.LOG_LENTO_MS,
+    )
+
+# Id de cada requisição (X-Request-ID) em todas as linhas de log. O mais
+# externo: o log de tempos também leva o id
+app.add_middleware(RequestIdMiddleware)
+
+# Servir arquivos estáticos (imagens do upload). O diretório é criado no
+# startup; check_dir=False evita tocar o disco na importação
+app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR, check_dir=False), name="uploads")
 
 # Registrar routers
 app.include_router(clientes.router)
 app.include_router(produtos.router)
 app.include_router(relatorios.router)
 app.include_router(auth.router)  # ← NOVA LINHA
+app.include_router(dashboard.router)
 
 # Evento de inicialização (executado quando app inicia)
 @app.on_event("startup")
 def startup_event():
     """
-    Cria tabelas no banco de dados ao iniciar a aplicação.
+    Prepara o worker: logs, diretório de uploads e threads em segundo plano.
     
-    IMPORTANTE: Em produção, use Alembic para migrations!
+    O schema do banco não é criado aqui (o boot de cada worker não deve
+    depender do banco): aplique as migrations antes com
+    'alembic upgrade head'.
     """
-    print("🚀 Iniciando Magnetic Report API...")
-    print(f"📦 Criando tabelas no banco de dados...")
-    init_db()
-    print("✅ Banco de dados inicializado!")
+    logs.iniciar()
+    logger.info("iniciando", extra={"app": settings.APP_NAME, "versao": settings.VERSION})
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    catalogo_produtos.iniciar()
+    coletor_arquivos.iniciar()
+    enviador_emails.iniciar()
+
+@app.on_event("startup")
+async def configurar_concorrencia():
+    """Alinha o threadpool das rotas síncronas ao pool de conexões"""
+    configurar_threadpool(settings.threadpool_size)
+
+@app.on_event("shutdown")
+def shutdown_event():
+    """Encerra as threads em segundo plano e tira o worker das métricas"""
+    catalogo_produtos.parar()
+    coletor_arquivos.parar()
+    enviador_emails.parar()  # envia o que já está na fila
+    metricas.encerrar_processo()
+    logs.parar()  # por último: escreve o que restou na fila
 
 # Rota raiz (health check)
 @app.get("/", tags=["Health"])
@@ -69,5 +143,29 @@ def health_check():
         "version": settings.VERSION
     }
 
+# Ocupação do pool de conexões e do threadpool
+@app.get("/health/pool", tags=["Health"])
+async def pool_status():
+    """
+    Conexões em uso, overflow, esperas por conexão e saturação do threadpool.
+    
+    Rota async: responde mesmo com todas as threads ocupadas.
+    """
+    estatisticas = {
+        "banco": estatisticas_pool(),
+        "threadpool": estatisticas_threadpool()
+    }
+    if replica_engine is not None:
+        estatisticas["replica"] = estatisticas_pool(replica_engine)
+    return estatisticas
+
+# Métricas no formato do Prometheus (somadas entre os workers)
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def exportar_metricas():
+        """Latência por rota, pool de conexões, PDF, imagens, email e bcrypt"""
+        corpo, tipo = metricas.exportar()
+        return Response(content=corpo, media_type=tipo)
+
 # Para rodar: poetry run uvicorn app.main:app --reload
 # --reload: reinicia automaticamente ao detectar mudanças no código
\ No newline at end of file
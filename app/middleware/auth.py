@@ -2,51 +2,78 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.core.security import verify_token
+from app.core.security import decode_token
+from app.core.revocation import revocation_list
 from app.models.users import User
+from app.models.schemas.user import TokenPayload
 
 # Configuração para extrair o token do header Authorization
 security = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenPayload:
     """
-    Pega o token do usuário e verifica se é válido.
-    Retorna os dados do usuário logado.
+    Valida o access token e retorna o usuário descrito pelas claims.
+    Não consulta o banco: só a lista de revogação em memória.
     """
-    token = credentials.credentials
-    email = verify_token(token, "access")
-    
-    if email is None:
+    payload = decode_token(credentials.credentials, "access")
+
+    if payload is None or "uid" not in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido ou expirado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Busca o usuário no banco
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+
+    if revocation_list.is_revoked(payload["uid"], payload.get("iat", 0)):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuário não encontrado"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revogado. Faça login novamente.",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    if not user.is_active:
+
+    principal = TokenPayload(
+        id=payload["uid"],
+        email=payload["sub"],
+        is_active=payload.get("is_active", False),
+        is_verified=payload.get("is_verified", False),
+        is_superuser=payload.get("is_superuser", False),
+    )
+
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuário inativo"
         )
-    
+
+    return principal
+
+
+async def get_current_user(
+    principal: TokenPayload = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Pega o token do usuário e verifica se é válido.
+    Retorna os dados completos do usuário logado (busca pela chave primária).
+    Use apenas em rotas que precisam do perfil; para autorização, prefira
+    get_current_principal.
+    """
+    user = db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuário não encontrado"
+        )
+
     return user
 
 
 async def get_current_verified_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: TokenPayload = Depends(get_current_principal)
+) -> TokenPayload:
     """
     Verifica se o usuário tem email verificado.
     Use isso em rotas que exigem email verificado.
@@ -60,8 +87,8 @@ async def get_current_verified_user(
 
 
 async def get_current_superuser(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: TokenPayload = Depends(get_current_principal)
+) -> TokenPayload:
     """
     Verifica se o usuário é administrador.
     Use isso em rotas apenas para admins.
@@ -71,4 +98,4 @@ async def get_current_superuser(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Acesso negado. Privilégios de administrador necessários."
         )
-    return current_user
\ No newline at end of file
+    return current_user
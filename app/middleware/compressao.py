@@ -0,0 +1,171 @@
+import zlib
+from typing import Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, só gzip é oferecido
+    brotli = None
+
+# Conteúdos já comprimidos (fotos, PDFs, arquivos) ou que não podem ser
+# retidos em buffer (eventos)
+_TIPOS_IGNORADOS = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+    "text/event-stream",
+)
+
+
+def escolher_codificacao(accept_encoding: str) -> Optional[str]:
+    """
+    Escolhe a codificação a partir do header Accept-Encoding.
+
+    Respeita os pesos (q=0 recusa); entre as aceitas prefere brotli,
+    se instalado, depois gzip.
+    """
+    pesos: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        nome, _, parametros = item.strip().partition(";")
+        peso = 1.0
+        parametro = parametros.strip()
+        if parametro.startswith("q="):
+            try:
+                peso = float(parametro[2:])
+            except ValueError:
+                peso = 0.0
+        pesos[nome.strip().lower()] = peso
+
+    curinga = pesos.get("*", 0.0)
+    candidatas = ["br", "gzip"] if brotli is not None else ["gzip"]
+    aceitas = [(pesos.get(nome, curinga), nome) for nome in candidatas]
+    aceitas = [(peso, nome) for peso, nome in aceitas if peso > 0]
+    if not aceitas:
+        return None
+    # max estável: em empate vence a primeira (br)
+    return max(aceitas, key=lambda item: item[0])[1]
+
+
+class _Compressor:
+    """Compressão incremental de gzip ou brotli com a mesma interface"""
+
+    def __init__(self, codificacao: str, nivel_gzip: int, qualidade_brotli: int):
+        self.codificacao = codificacao
+        if codificacao == "br":
+            self._brotli = brotli.Compressor(quality=qualidade_brotli)
+        else:
+            # wbits=31: formato gzip (cabeçalho + CRC)
+            self._zlib = zlib.compressobj(nivel_gzip, zlib.DEFLATED, 31)
+
+    def comprimir(self, dados: bytes) -> bytes:
+        """Comprime um pedaço e libera o que já pode ser enviado"""
+        if self.codificacao == "br":
+            return self._brotli.process(dados) + self._brotli.flush()
+        return self._zlib.compress(dados) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finalizar(self, dados: bytes = b"") -> bytes:
+        if self.codificacao == "br":
+            return self._brotli.process(dados) + self._brotli.finish()
+        return self._zlib.compress(dados) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    Comprime respostas com gzip ou brotli conforme o Accept-Encoding.
+
+    - Corpos menores que minimo_bytes saem sem compressão
+    - Fotos, PDFs e outros conteúdos já comprimidos são ignorados
+    - Respostas em streaming (exportações, listagens com stream=true) são
+      comprimidas pedaço a pedaço, sem reter o corpo inteiro
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimo_bytes: int = 1024,
+        nivel_gzip: int = 6,
+        qualidade_brotli: int = 4
+    ):
+        self.app = app
+        self.minimo_bytes = minimo_bytes
+        self.nivel_gzip = nivel_gzip
+        self.qualidade_brotli = qualidade_brotli
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacao = escolher_codificacao(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        ignorar = False
+
+        async def enviar(message: Message) -> None:
+            nonlocal inicio, compressor, ignorar
+
+            if message["type"] == "http.response.start":
+                # Só decide no primeiro pedaço do corpo (tamanho e streaming)
+                inicio = message
+                headers = Headers(raw=message["headers"])
+                tipo = headers.get("content-type", "")
+                ignorar = (
+                    "content-encoding" in headers
+                    or message["status"] < 200
+                    or message["status"] in (204, 304)
+                    or tipo.startswith(_TIPOS_IGNORADOS)
+                )
+                if ignorar:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or ignorar:
+                await send(message)
+                return
+
+            corpo = message.get("body", b"")
+            mais = message.get("more_body", False)
+
+            if inicio is not None:
+                headers = MutableHeaders(raw=inicio["headers"])
+                headers.add_vary_header("Accept-Encoding")
+
+                if not mais and len(corpo) < self.minimo_bytes:
+                    await send(inicio)
+                    inicio = None
+                    ignorar = True
+                    await send(message)
+                    return
+
+                compressor = _Compressor(codificacao, self.nivel_gzip, self.qualidade_brotli)
+                headers["Content-Encoding"] = codificacao
+                if not mais:
+                    corpo = compressor.finalizar(corpo)
+                    headers["Content-Length"] = str(len(corpo))
+                    await send(inicio)
+                    inicio = None
+                    await send({"type": "http.response.body", "body": corpo})
+                    return
+
+                # Streaming: tamanho final desconhecido
+                del headers["Content-Length"]
+                await send(inicio)
+                inicio = None
+
+            if mais:
+                pedaco = compressor.comprimir(corpo)
+                if pedaco:
+                    await send({"type": "http.response.body", "body": pedaco, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.finalizar(corpo)})
+
+        await self.app(scope, receive, enviar)
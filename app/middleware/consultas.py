@@ -0,0 +1,40 @@
+import logging
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core import consultas
+
+logger = logging.getLogger("app.consultas")
+
+
+class PerfilSQLMiddleware:
+    """
+    Perfil das consultas SQL de cada requisição (ver app.core.consultas).
+
+    Registra um aviso no logger "app.consultas" quando a requisição passa
+    de maximo_consultas ou repete o mesmo comando minimo_repeticoes vezes
+    ou mais (provável N+1), com os piores comandos e a linha do código
+    que os disparou.
+    """
+
+    def __init__(self, app: ASGIApp, maximo_consultas: int = 20, minimo_repeticoes: int = 5):
+        self.app = app
+        self.maximo_consultas = maximo_consultas
+        self.minimo_repeticoes = minimo_repeticoes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        perfil = consultas.iniciar()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            repetidos = perfil.repetidos(self.minimo_repeticoes)
+            if perfil.total > self.maximo_consultas or repetidos:
+                logger.warning("consultas_sql", extra={
+                    "metodo": scope["method"],
+                    "caminho": scope["path"],
+                    "rota": getattr(scope.get("route"), "path", None),
+                    "motivo": "repeticao" if repetidos else "orcamento",
+                    **perfil.resumo(),
+                })
@@ -0,0 +1,45 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import metricas
+
+# Métodos fora desta lista viram "OUTRO" (evita rótulos arbitrários)
+_METODOS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+
+class MetricsMiddleware:
+    """
+    Registra a duração de cada requisição por método, rota e status, e
+    quantas estão em andamento.
+
+    A rota é o template do caminho (ex: /relatorios/{relatorio_id}), não o
+    caminho real, para a quantidade de séries não crescer com os ids.
+    Requisições sem rota (404, arquivos de /uploads) ficam em "sem_rota".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"] if scope["method"] in _METODOS else "OUTRO"
+        em_andamento = metricas.REQUISICOES_EM_ANDAMENTO.labels(metodo)
+        em_andamento.inc()
+        inicio = time.perf_counter()
+        status_code = 500
+
+        async def enviar(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            em_andamento.dec()
+            # O router do Starlette grava a rota encontrada no próprio scope
+            rota = getattr(scope.get("route"), "path", None) or "sem_rota"
+            metricas.REQUISICAO_SEGUNDOS.labels(metodo, rota, str(status_code)).observe(time.perf_counter() - inicio)
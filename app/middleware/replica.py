@@ -0,0 +1,39 @@
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.database import COOKIE_LEITURA_PRIMARIO
+
+# Métodos que não escrevem
+_METODOS_LEITURA = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaStickyMiddleware:
+    """
+    Marca o cliente que acabou de escrever para ler do primário.
+
+    Toda escrita bem-sucedida (POST/PUT/PATCH/DELETE com status < 400)
+    recebe o cookie COOKIE_LEITURA_PRIMARIO com o instante da escrita;
+    enquanto ele valer (REPLICA_STICKY_SECONDS), get_read_db usa o
+    primário, e o cliente vê a própria escrita mesmo com a réplica atrasada.
+    """
+
+    def __init__(self, app: ASGIApp, duracao_segundos: int = 5):
+        self.app = app
+        self.duracao_segundos = duracao_segundos
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in _METODOS_LEITURA:
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{COOKIE_LEITURA_PRIMARIO}={time.time():.3f}; Max-Age={self.duracao_segundos}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, enviar)
@@ -0,0 +1,45 @@
+import re
+import uuid
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import logs
+
+HEADER_REQUEST_ID = "X-Request-ID"
+
+# Ids recebidos de fora (proxy, frontend) só se forem curtos e simples
+_ID_VALIDO = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    """
+    Identifica cada requisição para correlacionar as linhas de log.
+
+    Reaproveita o X-Request-ID recebido (ex: gerado pelo proxy) ou cria um
+    novo, disponível em app.core.logs.request_id durante a requisição e
+    devolvido no header X-Request-ID da resposta.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recebido = next(
+            (valor.decode("latin-1") for nome, valor in scope["headers"] if nome == b"x-request-id"),
+            "",
+        )
+        id_requisicao = recebido if _ID_VALIDO.match(recebido) else uuid.uuid4().hex
+        token = logs.request_id.set(id_requisicao)
+
+        async def enviar(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[HEADER_REQUEST_ID] = id_requisicao
+            await send(message)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            logs.request_id.reset(token)
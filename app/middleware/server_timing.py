@@ -0,0 +1,84 @@
+import logging
+import time
+from typing import Dict, List
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import tempos
+
+logger = logging.getLogger("app.tempos")
+
+
+def _header(medidos: Dict[str, List[float]], total: float) -> str:
+    """Server-Timing: db;dur=12.3;desc="4 consultas", ..., total;dur=20.1"""
+    partes = []
+    for fase in tempos.FASES:
+        if fase in medidos:
+            segundos, vezes = medidos[fase]
+            partes.append(f'{fase};dur={segundos * 1000:.1f};desc="{fase} ({vezes}x)"')
+    partes.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(partes)
+
+
+class ServerTimingMiddleware:
+    """
+    Mede o tempo de cada fase da requisição (banco, serialização, PDF,
+    imagem; ver app.core.tempos) e o total. Emails saem em segundo plano
+    (app.core.emails) e não entram no tempo da requisição.
+
+    - O header Server-Timing aparece na aba Network do navegador. Em
+      requisições de outra origem, o navegador só mostra os tempos se a
+      origem estiver em Timing-Allow-Origin (preenchido com origens_permitidas)
+    - Ao fim da resposta (inclusive streaming), registra o evento
+      "requisicao" no logger "app.tempos" com método, caminho, status e
+      milissegundos por fase (ver app.core.logs). Erros 5xx e requisições
+      acima de lento_ms saem como aviso, fora da amostragem
+
+    No header entram as fases até o início da resposta; no log, a
+    requisição inteira.
+    """
+
+    def __init__(self, app: ASGIApp, origens_permitidas: List[str] = None, log: bool = True, lento_ms: int = 1000):
+        self.app = app
+        self.timing_allow_origin = ", ".join(origens_permitidas or [])
+        self.log = log
+        self.lento_ms = lento_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        medidos = tempos.iniciar()
+        inicio = time.perf_counter()
+        status_code = 500
+
+        async def enviar(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _header(medidos, time.perf_counter() - inicio))
+                if self.timing_allow_origin:
+                    headers["Timing-Allow-Origin"] = self.timing_allow_origin
+            await send(message)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            if self.log:
+                total_ms = round((time.perf_counter() - inicio) * 1000, 1)
+                nivel = logging.WARNING if status_code >= 500 or total_ms >= self.lento_ms else logging.INFO
+                logger.log(nivel, "requisicao", extra={
+                    "metodo": scope["method"],
+                    "caminho": scope["path"],
+                    "status": status_code,
+                    "total_ms": total_ms,
+                    **{
+                        f"{fase}_ms": round(segundos * 1000, 1)
+                        for fase, (segundos, _) in medidos.items()
+                    },
+                    **{
+                        f"{fase}_n": vezes
+                        for fase, (_, vezes) in medidos.items()
+                    },
+                })
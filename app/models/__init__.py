@@ -4,6 +4,8 @@ from .cliente import Cliente
 from .produto import Produto
 from .relatorio import Relatorio
 from .foto import Foto
+from .relatorio_resumo import RelatorioResumo
+from .exclusao_pendente import ExclusaoPendente
 
 # Lista de todos os modelos (útil para imports)
-__all__ = ["Cliente", "Produto", "Relatorio", "Foto"]
\ No newline at end of file
+__all__ = ["Cliente", "Produto", "Relatorio", "Foto", "RelatorioResumo", "ExclusaoPendente"]
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ExclusaoPendente(Base):
+    """
+    Arquivo de upload a remover do disco.
+    
+    Gravada na mesma transação que apaga a foto (ou o relatório/cliente
+    dono dela): se a transação falhar, o arquivo continua lá. O coletor
+    em segundo plano (app.core.exclusoes) remove os arquivos em lotes
+    depois do commit.
+    """
+    __tablename__ = "exclusoes_pendentes"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    caminho = Column(String(500), nullable=False)
+    tentativas = Column(Integer, nullable=False, server_default="0")  # falhas ao remover
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ExclusaoPendente(id={self.id}, caminho='{self.caminho}')>"
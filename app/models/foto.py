@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -10,6 +10,10 @@ class Foto(Base):
     Armazena metadados da foto. O arquivo físico fica na pasta 'uploads/'.
     """
     __tablename__ = "fotos"
+    __table_args__ = (
+        # Fotos são sempre lidas por relatório, em ordem (migration 0003)
+        Index("ix_fotos_relatorio_id_ordem", "relatorio_id", "ordem"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -11,6 +12,10 @@ class Produto(Base):
     armazenada em JSON no campo 'template_tabela'.
     """
     __tablename__ = "produtos"
+    __table_args__ = (
+        # Consultas por coluna do template (migration 0005)
+        Index("ix_produtos_template_tabela", "template_tabela", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     nome = Column(String(200), nullable=False)
@@ -20,7 +25,7 @@ class Produto(Base):
     
     # Template da tabela dinâmica para este tipo de produto
     # Exemplo: {"colunas": ["Medida", "Valor", "Status"], "tipos": ["text", "number", "select"]}
-    template_tabela = Column(JSON, nullable=True)
+    template_tabela = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index, DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -11,6 +12,20 @@ class Relatorio(Base):
     Produto e Fotos.
     """
     __tablename__ = "relatorios"
+    __table_args__ = (
+        # Filtros de listar_relatorios + ordenação por data (migration 0003)
+        Index("ix_relatorios_cliente_id_created_at", "cliente_id", "created_at"),
+        Index("ix_relatorios_produto_id_created_at", "produto_id", "created_at"),
+        Index("ix_relatorios_status_created_at", "status", "created_at"),
+        Index("ix_relatorios_created_at", "created_at"),
+        # Consultas por coluna da tabela dinâmica (migration 0005)
+        Index(
+            "ix_relatorios_dados_tabela",
+            "dados_tabela",
+            postgresql_using="gin",
+            postgresql_ops={"dados_tabela": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     codigo_pedido = Column(String(100), unique=True, nullable=False, index=True)
@@ -27,7 +42,8 @@ class Relatorio(Base):
     #   "estrutura": {"colunas": ["Medida", "Valor"], ...},
     #   "dados": [["100mm", "50kg"], ["200mm", "75kg"]]
     # }
-    dados_tabela = Column(JSON, nullable=True)
+    # JSONB no PostgreSQL, para permitir índice GIN e consultas no banco
+    dados_tabela = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     
     # Status do relatório
     status = Column(String(50), default="rascunho")  # rascunho, concluido, aprovado
@@ -39,7 +55,51 @@ class Relatorio(Base):
     # Relacionamentos
     cliente = relationship("Cliente", back_populates="relatorios")
     produto = relationship("Produto", back_populates="relatorios")
-    fotos = relationship("Foto", back_populates="relatorio", cascade="all, delete-orphan")
+    fotos = relationship("Foto", back_populates="relatorio", cascade="all, delete-orphan", order_by="Foto.ordem")
     
     def __repr__(self):
-        return f"<Relatorio(id={self.id}, codigo_pedido='{self.codigo_pedido}')>"
\ No newline at end of file
+        return f"<Relatorio(id={self.id}, codigo_pedido='{self.codigo_pedido}')>"
+
+# =============== ÍNDICE DE BUSCA TEXTUAL ===============
+# A tabela 'relatorios_busca' é criada junto com 'relatorios' e mantida pelo
+# BuscaService a cada escrita. No PostgreSQL guarda um tsvector com índice
+# GIN (e um índice de trigramas para buscas parciais em codigo_pedido); no
+# SQLite é uma tabela virtual FTS5, usada nos testes locais.
+
+_BUSCA_POSTGRESQL = [
+    """
+    CREATE TABLE IF NOT EXISTS relatorios_busca (
+        relatorio_id INTEGER PRIMARY KEY REFERENCES relatorios(id) ON DELETE CASCADE,
+        documento TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_relatorios_busca_documento ON relatorios_busca USING GIN (documento)",
+    # Sem a extensão pg_trgm a busca parcial funciona, apenas sem índice
+    """
+    DO $$
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS ix_relatorios_codigo_pedido_trgm
+            ON relatorios USING GIN (codigo_pedido gin_trgm_ops);
+    EXCEPTION WHEN OTHERS THEN
+        RAISE NOTICE 'pg_trgm indisponível: busca por codigo_pedido sem índice';
+    END $$
+    """,
+]
+
+_BUSCA_SQLITE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS relatorios_busca USING fts5(
+        titulo, descricao, observacoes, fotos, codigo_pedido,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+for _comando in _BUSCA_POSTGRESQL:
+    event.listen(Relatorio.__table__, "after_create", DDL(_comando).execute_if(dialect="postgresql"))
+
+for _comando in _BUSCA_SQLITE:
+    event.listen(Relatorio.__table__, "after_create", DDL(_comando).execute_if(dialect="sqlite"))
+
+event.listen(Relatorio.__table__, "before_drop", DDL("DROP TABLE IF EXISTS relatorios_busca"))
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+class RelatorioResumo(Base):
+    """
+    Contagens de relatórios para o dashboard, mantidas incrementalmente.
+    
+    Uma linha por (dimensao, chave), por exemplo:
+    ("status", "concluido"), ("cliente", "12"), ("produto", "3"), ("mes", "2024-05").
+    Atualizada pelo ResumoService a cada criação, mudança ou exclusão de
+    relatório; reconstruída do zero com: python -m app.cli reconstruir-resumo
+    """
+    __tablename__ = "relatorios_resumo"
+    
+    dimensao = Column(String(20), primary_key=True)
+    chave = Column(String(100), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<RelatorioResumo(dimensao='{self.dimensao}', chave='{self.chave}', total={self.total})>"
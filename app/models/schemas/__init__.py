@@ -20,13 +20,22 @@ from app.models.schemas.produto import (
 
 from app.models.schemas.relatorio import (
     FotoResponse,
+    FotoOrdem,
     RelatorioBase,
     RelatorioCreate,
     RelatorioUpdate,
+    RelatorioClone,
     RelatorioResponse,
     RelatorioListResponse
 )
 
+from app.models.schemas.dashboard import DashboardResponse
+
+from app.models.schemas.importacao import (
+    LinhaImportacao,
+    ImportacaoResponse
+)
+
 __all__ = [
     # Cliente
     "ClienteBase",
@@ -42,9 +51,18 @@ __all__ = [
     
     # Relatorio
     "FotoResponse",
+    "FotoOrdem",
     "RelatorioBase",
     "RelatorioCreate",
     "RelatorioUpdate",
+    "RelatorioClone",
     "RelatorioResponse",
     "RelatorioListResponse",
+    
+    # Dashboard
+    "DashboardResponse",
+    
+    # Importação
+    "LinhaImportacao",
+    "ImportacaoResponse",
 ]
\ No newline at end of file
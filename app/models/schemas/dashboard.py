@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Dict
+
+"""
+Schemas do dashboard gerencial.
+"""
+
+class DashboardResponse(BaseModel):
+    """
+    Contagem de relatórios por dimensão.
+    Chaves de cliente e produto são os ids; mês no formato AAAA-MM.
+    """
+    por_status: Dict[str, int] = {}
+    por_cliente: Dict[str, int] = {}
+    por_produto: Dict[str, int] = {}
+    por_mes: Dict[str, int] = {}
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+"""
+Schemas de resposta da importação em lote.
+"""
+
+class LinhaImportacao(BaseModel):
+    """Resultado de uma linha do arquivo importado"""
+    linha: int
+    status: str  # criado, erro
+    id: Optional[int] = None
+    erro: Optional[str] = None
+
+class ImportacaoResponse(BaseModel):
+    """Resumo da importação com o resultado de cada linha"""
+    total: int
+    criados: int
+    erros: int
+    linhas: List[LinhaImportacao] = []
@@ -23,6 +23,10 @@ class FotoResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class FotoOrdem(BaseModel):
+    """Schema para reordenar as fotos: todos os ids do relatório, na nova ordem"""
+    foto_ids: List[int] = Field(..., min_length=1)
+
 class RelatorioBase(BaseModel):
     """Schema base com campos comuns"""
     codigo_pedido: str = Field(..., min_length=1, max_length=100)
@@ -52,6 +56,11 @@ class RelatorioUpdate(BaseModel):
     dados_tabela: Optional[Dict[str, Any]] = None
     status: Optional[str] = Field(None, max_length=50)
 
+class RelatorioClone(BaseModel):
+    """Schema para clonar um relatório (dados, tabela e fotos) com novo código"""
+    codigo_pedido: str = Field(..., min_length=1, max_length=100)
+    titulo: Optional[str] = Field(None, max_length=300, description="Padrão: o título do original")
+
 class RelatorioResponse(RelatorioBase):
     """
     Resposta completa do relatório.
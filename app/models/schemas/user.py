@@ -69,4 +69,12 @@ class TokenRefresh(BaseModel):
 
 # Schema para verificação de email
 class EmailVerification(BaseModel):
-    token: str
\ No newline at end of file
+    token: str
+
+# Schema do usuário autenticado, montado só com as claims do access token
+class TokenPayload(BaseModel):
+    id: int
+    email: EmailStr
+    is_active: bool
+    is_verified: bool
+    is_superuser: bool
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+from app.database import Base
+
+
+class TokenRevogado(Base):
+    """
+    Lista compacta de revogação de tokens JWT.
+    
+    Uma linha por usuário: todo token emitido até 'revogado_em' (epoch em
+    segundos) deixa de valer. Usada em desativações, troca/reset de senha
+    e mudanças nas claims embutidas no token.
+    """
+    __tablename__ = "tokens_revogados"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    revogado_em = Column(Float, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TokenRevogado(user_id={self.user_id}, revogado_em={self.revogado_em})>"
@@ -6,8 +6,11 @@ from app.core.security import (
     get_password_hash, 
     create_access_token, 
     create_refresh_token,
+    build_token_claims,
+    decode_token,
     verify_token
 )
+from app.core.revocation import revocation_list
 from app.models.users import User
 from app.models.schemas.user import (
     UserCreate, 
@@ -75,9 +78,10 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Usuário inativo"
         )
     
-    # Cria tokens
-    access_token = create_access_token(data={"sub": user.email})
-    refresh_token = create_refresh_token(data={"sub": user.email})
+    # Cria tokens (com as claims de autorização embutidas)
+    claims = build_token_claims(user)
+    access_token = create_access_token(data=claims)
+    refresh_token = create_refresh_token(data=claims)
     
     return {
         "access_token": access_token,
@@ -87,26 +91,37 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)):
-    """Renova o access token usando refresh token"""
-    email = verify_token(token_data.refresh_token, "refresh")
-    
-    if email is None:
+def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)):
+    """
+    Renova o access token usando refresh token.
+    Fora do caminho quente: relê o usuário no banco, para que desativações
+    valham já na próxima renovação e as claims saiam atualizadas.
+    """
+    payload = decode_token(token_data.refresh_token, "refresh")
+    
+    if payload is None or "uid" not in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token inválido ou expirado"
         )
     
-    user = db.query(User).filter(User.email == email).first()
+    if revocation_list.is_revoked(payload["uid"], payload.get("iat", 0)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token revogado. Faça login novamente."
+        )
+    
+    user = db.get(User, payload["uid"])
     if not user or not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuário não encontrado ou inativo"
         )
     
-    # Cria novos tokens
-    access_token = create_access_token(data={"sub": user.email})
-    refresh_token = create_refresh_token(data={"sub": user.email})
+    # Cria novos tokens com as claims atuais do banco
+    claims = build_token_claims(user)
+    access_token = create_access_token(data=claims)
+    refresh_token = create_refresh_token(data=claims)
     
     return {
         "access_token": access_token,
@@ -137,6 +152,8 @@ async def verify_email(verification: EmailVerification, db: Session = Depends(ge
         return {"message": "Email já verificado"}
     
     user.is_verified = True
+    # Tokens antigos carregam is_verified=False: novo login reemite as claims
+    revocation_list.revoke(db, user.id)
     db.commit()
     
     return {"message": "Email verificado com sucesso"}
@@ -195,6 +212,8 @@ async def reset_password(reset_data: PasswordReset, db: Session = Depends(get_db
     
     # Atualiza a senha
     user.hashed_password = get_password_hash(reset_data.new_password)
+    # Invalida todas as sessões abertas com a senha antiga
+    revocation_list.revoke(db, user.id)
     db.commit()
     
     return {"message": "Senha redefinida com sucesso"}
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models import Cliente
+from typing import List, Optional
+from app.core.exclusoes import coletor_arquivos
+from app.core.serializacao import resposta_json
+from app.database import get_db, get_read_db, dialect_insert
+from app.models import Cliente, Relatorio, Foto
 from app.models.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteResponse
+from app.models.schemas.importacao import ImportacaoResponse
+from app.services.import_service import ImportService
+from app.services.export_service import ExportService
+from app.services.campos_service import CamposService
+from app.services.etag_service import EtagService
+from app.services.busca_service import BuscaService
+from app.services.resumo_service import ResumoService
 
 router = APIRouter(prefix="/clientes", tags=["Clientes"])
 
@@ -11,41 +22,142 @@ router = APIRouter(prefix="/clientes", tags=["Clientes"])
 def criar_cliente(cliente: ClienteCreate, db: Session = Depends(get_db)):
     """
     Cria um novo cliente.
+    
+    Um único INSERT ... ON CONFLICT DO NOTHING RETURNING: se o email já
+    existir nenhuma linha é retornada (seguro mesmo com requisições simultâneas).
     """
-    # Verificar se email já existe
-    if cliente.email:
-        existe = db.query(Cliente).filter(Cliente.email == cliente.email).first()
-        if existe:
-            raise HTTPException(
-                status_code=400,
-                detail="Email já cadastrado"
-            )
-    
-    # Criar cliente
-    db_cliente = Cliente(**cliente.model_dump())
-    db.add(db_cliente)
+    stmt = (
+        dialect_insert(Cliente)
+        .values(**cliente.model_dump())
+        .on_conflict_do_nothing(index_elements=[Cliente.email])
+        .returning(Cliente)
+    )
+    db_cliente = db.scalars(stmt).first()
+    
+    if db_cliente is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Email já cadastrado"
+        )
+    
     db.commit()
-    db.refresh(db_cliente)
     
     return db_cliente
 
+@router.post("/importar", response_model=ImportacaoResponse)
+def importar_clientes(
+    arquivo: UploadFile = File(...),
+    formato: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Importa clientes em lote a partir de um arquivo CSV ou NDJSON.
+    
+    - formato: csv ou ndjson (padrão: deduzido pela extensão do arquivo)
+    
+    Cada linha é validada com ClienteCreate; a resposta traz o resultado
+    de cada linha (id criado ou erro).
+    """
+    formato = ImportService.detectar_formato(arquivo.filename, formato)
+    return ImportService.importar(
+        db,
+        arquivo.file,
+        formato,
+        schema=ClienteCreate,
+        model=Cliente,
+        chave="email",
+        mensagem_duplicado="Email já cadastrado"
+    )
+
 @router.get("/", response_model=List[ClienteResponse])
-def listar_clientes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def listar_clientes(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    stream: bool = False,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """
     Lista todos os clientes com paginação.
     
     - skip: quantos registros pular (padrão: 0)
     - limit: quantos registros retornar (padrão: 100)
+    - stream: envia o array JSON incrementalmente (primeiro byte mais cedo)
+    - fields: campos da resposta separados por vírgula (ex: id,nome);
+      só eles são lidos do banco e serializados
     """
-    clientes = db.query(Cliente).offset(skip).limit(limit).all()
-    return clientes
+    campos = CamposService.interpretar(fields, ClienteResponse)
+    
+    # Revalidação: compara só as versões (id, updated_at) da página. Sem
+    # If-None-Match o ETag sai das linhas carregadas (em streaming o header
+    # vai antes delas, então a consulta leve roda mesmo assim)
+    etag = None
+    if stream or EtagService.condicional(request):
+        etag = EtagService.calcular(request, db.execute(
+            select(Cliente.id, EtagService.versao(Cliente)).order_by(Cliente.id).offset(skip).limit(limit)
+        ))
+        nao_modificado = EtagService.verificar(request, etag)
+        if nao_modificado:
+            return nao_modificado
+    
+    query = db.query(Cliente).order_by(Cliente.id).offset(skip).limit(limit)
+    if campos:
+        query = query.options(*CamposService.opcoes(Cliente, campos + EtagService.COLUNAS_VERSAO))
+    
+    if stream:
+        schema = CamposService.schema_parcial(ClienteResponse, campos) if campos else ClienteResponse
+        return EtagService.aplicar(ExportService.listar_json(db, query.statement, schema), etag)
+    
+    clientes = query.all()
+    etag = etag or EtagService.calcular(request, ((c.id, EtagService.versao_de(c)) for c in clientes))
+    if campos:
+        return EtagService.aplicar(CamposService.responder(ClienteResponse, campos, clientes), etag)
+    return EtagService.aplicar(resposta_json(List[ClienteResponse], clientes), etag)
+
+@router.get("/exportar")
+def exportar_clientes(formato: str = "ndjson", db: Session = Depends(get_read_db)):
+    """
+    Exporta todos os clientes em NDJSON ou CSV.
+    
+    A resposta é enviada em streaming, lendo a tabela em blocos.
+    """
+    stmt = select(Cliente.__table__).order_by(Cliente.id)
+    return ExportService.exportar(db, stmt, formato, "clientes")
 
 @router.get("/{cliente_id}", response_model=ClienteResponse)
-def buscar_cliente(cliente_id: int, db: Session = Depends(get_db)):
+def buscar_cliente(
+    cliente_id: int,
+    request: Request,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """
     Busca cliente por ID.
+    
+    - fields: campos da resposta separados por vírgula (ex: id,nome)
     """
-    cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
+    campos = CamposService.interpretar(fields, ClienteResponse)
+    
+    # Revalidação: só consulta a versão se o cliente mandou If-None-Match
+    etag = None
+    if EtagService.condicional(request):
+        versoes = db.execute(
+            select(Cliente.id, EtagService.versao(Cliente)).where(Cliente.id == cliente_id)
+        ).all()
+        if not versoes:
+            raise HTTPException(status_code=404, detail="Cliente não encontrado")
+        
+        etag = EtagService.calcular(request, versoes)
+        nao_modificado = EtagService.verificar(request, etag, recurso_unico=True)
+        if nao_modificado:
+            return nao_modificado
+    
+    query = db.query(Cliente).filter(Cliente.id == cliente_id)
+    if campos:
+        query = query.options(*CamposService.opcoes(Cliente, campos + EtagService.COLUNAS_VERSAO))
+    cliente = query.first()
     
     if not cliente:
         raise HTTPException(
@@ -53,7 +165,10 @@ def buscar_cliente(cliente_id: int, db: Session = Depends(get_db)):
             detail="Cliente não encontrado"
         )
     
-    return cliente
+    etag = etag or EtagService.calcular(request, [(cliente.id, EtagService.versao_de(cliente))])
+    if campos:
+        return EtagService.aplicar(CamposService.responder(ClienteResponse, campos, cliente), etag)
+    return EtagService.aplicar(resposta_json(ClienteResponse, cliente), etag)
 
 @router.put("/{cliente_id}", response_model=ClienteResponse)
 def atualizar_cliente(
@@ -63,29 +178,36 @@ def atualizar_cliente(
 ):
     """
     Atualiza dados do cliente.
-    """
-    db_cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
-    
-    if not db_cliente:
-        raise HTTPException(status_code=404, detail="Cliente não encontrado")
     
+    Um único UPDATE ... RETURNING; email duplicado é detectado pela
+    constraint UNIQUE do banco.
+    """
     # Atualizar apenas campos fornecidos
     update_data = cliente_update.model_dump(exclude_unset=True)
     
-    # Verificar email duplicado se estiver sendo atualizado
-    if "email" in update_data and update_data["email"]:
-        existe = db.query(Cliente).filter(
-            Cliente.email == update_data["email"],
-            Cliente.id != cliente_id
-        ).first()
-        if existe:
-            raise HTTPException(status_code=400, detail="Email já cadastrado")
+    if not update_data:
+        db_cliente = db.get(Cliente, cliente_id)
+        if not db_cliente:
+            raise HTTPException(status_code=404, detail="Cliente não encontrado")
+        return db_cliente
+    
+    stmt = (
+        update(Cliente)
+        .where(Cliente.id == cliente_id)
+        .values(**update_data)
+        .returning(Cliente)
+    )
+    try:
+        db_cliente = db.scalars(stmt).first()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email já cadastrado")
     
-    for key, value in update_data.items():
-        setattr(db_cliente, key, value)
+    if not db_cliente:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
     
     db.commit()
-    db.refresh(db_cliente)
     
     return db_cliente
 
@@ -99,7 +221,17 @@ def deletar_cliente(cliente_id: int, db: Session = Depends(get_db)):
     if not db_cliente:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
     
-    db.delete(db_cliente)
+    # Relatórios e fotos do cliente apagados em comandos únicos; os
+    # arquivos das fotos são removidos pelo coletor depois do commit
+    relatorios_do_cliente = select(Relatorio.id).where(Relatorio.cliente_id == cliente_id)
+    coletor_arquivos.agendar(db, Foto.relatorio_id.in_(relatorios_do_cliente))
+    db.execute(
+        delete(Foto).where(Foto.relatorio_id.in_(relatorios_do_cliente)),
+        execution_options={"synchronize_session": False}
+    )
+    BuscaService.remover(db, relatorios_do_cliente)
+    ResumoService.excluir(db, Relatorio.cliente_id == cliente_id)
+    db.execute(delete(Cliente).where(Cliente.id == cliente_id), execution_options={"synchronize_session": False})
     db.commit()
     
     return None
\ No newline at end of file
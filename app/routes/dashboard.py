@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.database import get_read_db
+from app.models.schemas.dashboard import DashboardResponse
+from app.services.resumo_service import ResumoService
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+@router.get("/", response_model=DashboardResponse)
+def obter_dashboard(db: Session = Depends(get_read_db)):
+    """
+    Contagens de relatórios por status, cliente, produto e mês.
+    
+    Lê a tabela de resumo mantida a cada escrita; o custo não depende
+    da quantidade de relatórios.
+    """
+    resumo = ResumoService.ler(db)
+    return DashboardResponse(
+        por_status=resumo["status"],
+        por_cliente=resumo["cliente"],
+        por_produto=resumo["produto"],
+        por_mes=resumo["mes"]
+    )
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.core.catalogo import catalogo_produtos
+from app.core.serializacao import resposta_json
+from app.database import get_db, get_read_db, dialect_insert
 from app.models import Produto
 from app.models.schemas.produto import ProdutoCreate, ProdutoUpdate, ProdutoResponse
+from app.models.schemas.importacao import ImportacaoResponse
+from app.services.import_service import ImportService
+from app.services.export_service import ExportService
+from app.services.campos_service import CamposService
+from app.services.etag_service import EtagService
 
 router = APIRouter(prefix="/produtos", tags=["Produtos"])
 
@@ -11,38 +20,122 @@ router = APIRouter(prefix="/produtos", tags=["Produtos"])
 def criar_produto(produto: ProdutoCreate, db: Session = Depends(get_db)):
     """
     Cria um novo produto.
+    
+    Um único INSERT ... ON CONFLICT DO NOTHING RETURNING: se o código já
+    existir nenhuma linha é retornada.
     """
-    # Verificar se código já existe
-    existe = db.query(Produto).filter(Produto.codigo == produto.codigo).first()
-    if existe:
+    stmt = (
+        dialect_insert(Produto)
+        .values(**produto.model_dump())
+        .on_conflict_do_nothing(index_elements=[Produto.codigo])
+        .returning(Produto)
+    )
+    db_produto = db.scalars(stmt).first()
+    
+    if db_produto is None:
+        db.rollback()
         raise HTTPException(status_code=400, detail="Código de produto já existe")
     
-    db_produto = Produto(**produto.model_dump())
-    db.add(db_produto)
+    catalogo_produtos.invalidar(db)
     db.commit()
-    db.refresh(db_produto)
     
     return db_produto
 
+@router.post("/importar", response_model=ImportacaoResponse)
+def importar_produtos(
+    arquivo: UploadFile = File(...),
+    formato: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Importa produtos em lote a partir de um arquivo CSV ou NDJSON.
+    
+    No CSV, a coluna template_tabela deve conter o JSON como texto.
+    """
+    formato = ImportService.detectar_formato(arquivo.filename, formato)
+    resultado = ImportService.importar(
+        db,
+        arquivo.file,
+        formato,
+        schema=ProdutoCreate,
+        model=Produto,
+        chave="codigo",
+        mensagem_duplicado="Código de produto já existe",
+        campos_json=["template_tabela"]
+    )
+    
+    # Os lotes já foram gravados: avisa os workers em uma transação própria
+    catalogo_produtos.invalidar(db)
+    db.commit()
+    return resultado
+
 @router.get("/", response_model=List[ProdutoResponse])
-def listar_produtos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def listar_produtos(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    stream: bool = False,
+    fields: Optional[str] = None
+):
     """
     Lista todos os produtos.
+    
+    Servido do cache do catálogo em memória (app/core/catalogo.py),
+    sem consultar o banco.
+    - stream: envia o array JSON incrementalmente (primeiro byte mais cedo)
+    - fields: campos da resposta separados por vírgula (ex: id,codigo,nome)
+    """
+    campos = CamposService.interpretar(fields, ProdutoResponse)
+    produtos = catalogo_produtos.listar()[max(skip, 0):max(skip, 0) + max(limit, 0)]
+    
+    etag = EtagService.calcular(request, ((p.id, EtagService.versao_de(p)) for p in produtos))
+    nao_modificado = EtagService.verificar(request, etag)
+    if nao_modificado:
+        return nao_modificado
+    
+    if stream:
+        schema = CamposService.schema_parcial(ProdutoResponse, campos) if campos else ProdutoResponse
+        return EtagService.aplicar(ExportService.listar_json_memoria(produtos, schema), etag)
+    
+    if campos:
+        return EtagService.aplicar(CamposService.responder(ProdutoResponse, campos, produtos), etag)
+    return EtagService.aplicar(resposta_json(List[ProdutoResponse], produtos), etag)
+
+@router.get("/exportar")
+def exportar_produtos(formato: str = "ndjson", db: Session = Depends(get_read_db)):
+    """
+    Exporta todos os produtos em NDJSON ou CSV.
+    
+    A resposta é enviada em streaming, lendo a tabela em blocos.
     """
-    produtos = db.query(Produto).offset(skip).limit(limit).all()
-    return produtos
+    stmt = select(Produto.__table__).order_by(Produto.id)
+    return ExportService.exportar(db, stmt, formato, "produtos")
 
 @router.get("/{produto_id}", response_model=ProdutoResponse)
-def buscar_produto(produto_id: int, db: Session = Depends(get_db)):
+def buscar_produto(
+    produto_id: int,
+    request: Request,
+    fields: Optional[str] = None
+):
     """
-    Busca produto por ID.
+    Busca produto por ID (do cache do catálogo em memória).
+    
+    - fields: campos da resposta separados por vírgula (ex: id,codigo,nome)
     """
-    produto = db.query(Produto).filter(Produto.id == produto_id).first()
+    campos = CamposService.interpretar(fields, ProdutoResponse)
+    produto = catalogo_produtos.obter(produto_id)
     
     if not produto:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
     
-    return produto
+    etag = EtagService.calcular(request, [(produto.id, EtagService.versao_de(produto))])
+    nao_modificado = EtagService.verificar(request, etag, recurso_unico=True)
+    if nao_modificado:
+        return nao_modificado
+    
+    if campos:
+        return EtagService.aplicar(CamposService.responder(ProdutoResponse, campos, produto), etag)
+    return EtagService.aplicar(resposta_json(ProdutoResponse, produto), etag)
 
 @router.put("/{produto_id}", response_model=ProdutoResponse)
 def atualizar_produto(
@@ -52,28 +145,36 @@ def atualizar_produto(
 ):
     """
     Atualiza dados do produto.
-    """
-    db_produto = db.query(Produto).filter(Produto.id == produto_id).first()
-    
-    if not db_produto:
-        raise HTTPException(status_code=404, detail="Produto não encontrado")
     
+    Um único UPDATE ... RETURNING; código duplicado é detectado pela
+    constraint UNIQUE do banco.
+    """
     update_data = produto_update.model_dump(exclude_unset=True)
     
-    # Verificar código duplicado
-    if "codigo" in update_data:
-        existe = db.query(Produto).filter(
-            Produto.codigo == update_data["codigo"],
-            Produto.id != produto_id
-        ).first()
-        if existe:
-            raise HTTPException(status_code=400, detail="Código já existe")
+    if not update_data:
+        produto = catalogo_produtos.obter(produto_id)
+        if not produto:
+            raise HTTPException(status_code=404, detail="Produto não encontrado")
+        return produto
+    
+    stmt = (
+        update(Produto)
+        .where(Produto.id == produto_id)
+        .values(**update_data)
+        .returning(Produto)
+    )
+    try:
+        db_produto = db.scalars(stmt).first()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Código já existe")
     
-    for key, value in update_data.items():
-        setattr(db_produto, key, value)
+    if not db_produto:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Produto não encontrado")
     
+    catalogo_produtos.invalidar(db)
     db.commit()
-    db.refresh(db_produto)
     
     return db_produto
 
@@ -87,6 +188,7 @@ def deletar_produto(produto_id: int, db: Session = Depends(get_db)):
     if not db_produto:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
     
+    catalogo_produtos.invalidar(db)
     db.delete(db_produto)
     db.commit()
     
@@ -1,81 +1,427 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, Query
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from sqlalchemy import String, case, delete, func, insert, literal, select, update, Select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from app.core.catalogo import catalogo_produtos
+from app.core.exclusoes import coletor_arquivos
+from app.core.serializacao import resposta_json
+from app.database import get_db, get_read_db, dialect_insert
 from app.models import Relatorio, Foto, Cliente, Produto
 from app.models.schemas.relatorio import (
     RelatorioCreate, 
     RelatorioUpdate, 
+    RelatorioClone,
     RelatorioResponse,
     RelatorioListResponse,
-    FotoResponse
+    FotoResponse,
+    FotoOrdem
 )
+from app.models.schemas.importacao import ImportacaoResponse
+from app.services.import_service import ImportService, LinhaValida
+from app.services.export_service import ExportService
+from app.services.busca_service import BuscaService
+from app.services.resumo_service import ResumoService, COLUNAS_RESUMO
+from app.services.campos_service import CamposService
+from app.services.etag_service import EtagService
+from app.services.tabela_service import TabelaService, OPERADORES, OPERADORES_NUMERICOS
 from app.services.upload_service import UploadService
 from app.services.pdf_service import PDFService
+import logging
+import math
 import os
 
 router = APIRouter(prefix="/relatorios", tags=["Relatórios"])
+logger = logging.getLogger(__name__)
 
-@router.post("/", response_model=RelatorioResponse, status_code=status.HTTP_201_CREATED)
-def criar_relatorio(relatorio: RelatorioCreate, db: Session = Depends(get_db)):
+# Listagens resumidas não precisam de dados_tabela nem dos textos longos
+_CAMPOS_LISTA = tuple(RelatorioListResponse.model_fields)
+
+def _verificar_referencias(db: Session, cliente_id: Optional[int], produto_id: Optional[int]):
     """
-    Cria um novo relatório técnico.
+    Descobre qual chave estrangeira falhou após um IntegrityError.
+    Só roda no caminho de erro; o caminho feliz não consulta as referências.
     """
-    # Verificar se cliente existe
-    cliente = db.query(Cliente).filter(Cliente.id == relatorio.cliente_id).first()
-    if not cliente:
+    if cliente_id is not None and db.get(Cliente, cliente_id) is None:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
     
-    # Verificar se produto existe
-    produto = db.query(Produto).filter(Produto.id == relatorio.produto_id).first()
-    if not produto:
+    if produto_id is not None and db.get(Produto, produto_id) is None:
         raise HTTPException(status_code=404, detail="Produto não encontrado")
+
+@router.post("/", response_model=RelatorioResponse, status_code=status.HTTP_201_CREATED)
+def criar_relatorio(relatorio: RelatorioCreate, db: Session = Depends(get_db)):
+    """
+    Cria um novo relatório técnico.
     
-    # Verificar código de pedido único
-    existe = db.query(Relatorio).filter(
-        Relatorio.codigo_pedido == relatorio.codigo_pedido
-    ).first()
-    if existe:
+    Um único INSERT ... ON CONFLICT DO NOTHING RETURNING. Cliente e produto
+    são validados pelas chaves estrangeiras; código de pedido duplicado
+    não retorna linha.
+    """
+    stmt = (
+        dialect_insert(Relatorio)
+        .values(**relatorio.model_dump())
+        .on_conflict_do_nothing(index_elements=[Relatorio.codigo_pedido])
+        .returning(Relatorio)
+    )
+    try:
+        db_relatorio = db.scalars(stmt).first()
+    except IntegrityError:
+        db.rollback()
+        _verificar_referencias(db, relatorio.cliente_id, relatorio.produto_id)
+        # Outra constraint (NOT NULL, CHECK): erro do cliente, não 500
+        raise HTTPException(status_code=400, detail="Dados do relatório inválidos")
+    
+    if db_relatorio is None:
+        db.rollback()
         raise HTTPException(status_code=400, detail="Código de pedido já existe")
     
-    # Criar relatório
-    db_relatorio = Relatorio(**relatorio.model_dump())
-    db.add(db_relatorio)
+    BuscaService.indexar(db, [db_relatorio.id])
+    ResumoService.ajustar(db, depois=ResumoService.valores(db_relatorio))
     db.commit()
-    db.refresh(db_relatorio)
     
-    return db_relatorio
+    return _com_produto(db_relatorio)
+
+def _versoes() -> Select:
+    """
+    Versões que compõem a resposta de um relatório: ele próprio e o
+    cliente; a do produto vem do catálogo (ver _com_versao_produto).
+    Mudanças nas fotos atualizam o updated_at do relatório.
+    """
+    return (
+        select(
+            Relatorio.id,
+            EtagService.versao(Relatorio),
+            EtagService.versao(Cliente),
+            Relatorio.produto_id
+        )
+        .join(Relatorio.cliente)
+    )
+
+def _versao_produto(produto_id: int):
+    produto = catalogo_produtos.obter(produto_id)
+    return produto and EtagService.versao_de(produto)
+
+def _com_versao_produto(linhas):
+    """Acrescenta a versão do produto, lida do cache do catálogo"""
+    for linha in linhas:
+        yield (*linha, _versao_produto(linha.produto_id))
+
+def _versoes_carregadas(relatorios):
+    """
+    As mesmas linhas de _com_versao_produto(_versoes()), a partir dos
+    relatórios já carregados com _opcoes_versao.
+    """
+    for relatorio in relatorios:
+        yield (
+            relatorio.id,
+            EtagService.versao_de(relatorio),
+            EtagService.versao_de(relatorio.cliente),
+            relatorio.produto_id,
+            _versao_produto(relatorio.produto_id)
+        )
+
+def _opcoes_versao(campos: Optional[Tuple[str, ...]]) -> list:
+    """
+    Opções extras para _versoes_carregadas: produto_id, as colunas de
+    versão do relatório e as do cliente (no mesmo SELECT), se fields não
+    as trouxer.
+    """
+    opcoes = [load_only(
+        Relatorio.produto_id, *(getattr(Relatorio, coluna) for coluna in EtagService.COLUNAS_VERSAO)
+    )]
+    if not campos or "cliente" not in campos:
+        opcoes.append(joinedload(Relatorio.cliente).load_only(
+            *(getattr(Cliente, coluna) for coluna in EtagService.COLUNAS_VERSAO)
+        ))
+    return opcoes
+
+def _com_produto(relatorio: Relatorio) -> dict:
+    """
+    Dados do relatório completo com o produto do cache do catálogo.
+    Só consulta o banco se o produto ainda não estiver no cache.
+    """
+    dados = {atributo.key: getattr(relatorio, atributo.key) for atributo in Relatorio.__mapper__.column_attrs}
+    dados["cliente"] = relatorio.cliente
+    dados["fotos"] = relatorio.fotos
+    dados["produto"] = catalogo_produtos.obter(relatorio.produto_id) or relatorio.produto
+    return dados
+
+def _marcar_atualizado(db: Session, relatorio_id: int):
+    """Atualiza updated_at do relatório (invalida o ETag) quando as fotos mudam"""
+    db.execute(update(Relatorio).where(Relatorio.id == relatorio_id).values(updated_at=func.now()))
+
+def _apos_importar(db: Session, relatorio_ids: List[int]):
+    """Mantém busca e dashboard atualizados a cada lote importado"""
+    BuscaService.indexar(db, relatorio_ids)
+    ResumoService.contar_novos(db, relatorio_ids)
+
+def _validar_referencias_lote(db: Session, validas: List[LinhaValida]) -> Dict[int, str]:
+    """Verifica clientes e produtos de um lote inteiro com duas consultas"""
+    cliente_ids = {dados["cliente_id"] for _, dados in validas}
+    produto_ids = {dados["produto_id"] for _, dados in validas}
+    
+    clientes = set(db.scalars(select(Cliente.id).where(Cliente.id.in_(cliente_ids))))
+    produtos = set(db.scalars(select(Produto.id).where(Produto.id.in_(produto_ids))))
+    
+    erros = {}
+    for numero, dados in validas:
+        if dados["cliente_id"] not in clientes:
+            erros[numero] = "Cliente não encontrado"
+        elif dados["produto_id"] not in produtos:
+            erros[numero] = "Produto não encontrado"
+    return erros
+
+@router.post("/importar", response_model=ImportacaoResponse)
+def importar_relatorios(
+    arquivo: UploadFile = File(...),
+    formato: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Importa relatórios (ex: legados) em lote a partir de CSV ou NDJSON.
+    
+    No CSV, a coluna dados_tabela deve conter o JSON como texto.
+    Fotos não são importadas; use o endpoint de fotos depois.
+    """
+    formato = ImportService.detectar_formato(arquivo.filename, formato)
+    return ImportService.importar(
+        db,
+        arquivo.file,
+        formato,
+        schema=RelatorioCreate,
+        model=Relatorio,
+        chave="codigo_pedido",
+        mensagem_duplicado="Código de pedido já existe",
+        campos_json=["dados_tabela"],
+        validar_lote=_validar_referencias_lote,
+        apos_inserir=_apos_importar
+    )
+
+def filtrar_relatorios(
+    stmt: Select,
+    status_filtro: Optional[str] = None,
+    cliente_id: Optional[int] = None,
+    produto_id: Optional[int] = None,
+    criado_de: Optional[datetime] = None,
+    criado_ate: Optional[datetime] = None,
+    ordem: str = "recentes"
+) -> Select:
+    """
+    Aplica os filtros e a ordenação da listagem de relatórios.
+    
+    Cada filtro tem um índice composto terminando em created_at
+    (cliente_id, produto_id, status ou só created_at), que atende o
+    filtro e a ordenação juntos. Verificado por test_indices.py.
+    """
+    if status_filtro:
+        stmt = stmt.where(Relatorio.status == status_filtro)
+    
+    if cliente_id is not None:
+        stmt = stmt.where(Relatorio.cliente_id == cliente_id)
+    
+    if produto_id is not None:
+        stmt = stmt.where(Relatorio.produto_id == produto_id)
+    
+    if criado_de:
+        stmt = stmt.where(Relatorio.created_at >= criado_de)
+    
+    if criado_ate:
+        stmt = stmt.where(Relatorio.created_at <= criado_ate)
+    
+    if ordem == "antigos":
+        return stmt.order_by(Relatorio.created_at.asc(), Relatorio.id.asc())
+    return stmt.order_by(Relatorio.created_at.desc(), Relatorio.id.desc())
 
 @router.get("/", response_model=List[RelatorioListResponse])
 def listar_relatorios(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     status_filtro: str = None,
-    db: Session = Depends(get_db)
+    cliente_id: Optional[int] = None,
+    produto_id: Optional[int] = None,
+    criado_de: Optional[datetime] = None,
+    criado_ate: Optional[datetime] = None,
+    ordem: str = Query("recentes", pattern="^(recentes|antigos)$"),
+    stream: bool = False,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """
-    Lista todos os relatórios com filtro opcional por status.
+    Lista relatórios com filtros combináveis, mais recentes primeiro.
+    
+    - status_filtro, cliente_id, produto_id: filtros por igualdade
+    - criado_de / criado_ate: intervalo de data de criação (inclusivo)
+    - ordem: recentes (padrão) ou antigos
+    - stream: envia o array JSON incrementalmente (primeiro byte mais cedo)
+    - fields: campos separados por vírgula, entre os do relatório completo
+      (ex: id,titulo,status ou id,cliente,fotos); só eles são lidos do banco
     """
-    query = db.query(Relatorio)
+    campos = CamposService.interpretar(fields, RelatorioResponse)
+    
+    # Revalidação: compara só as versões das linhas da página. Sem
+    # If-None-Match o ETag sai das linhas carregadas (em streaming o header
+    # vai antes delas, então a consulta leve roda mesmo assim)
+    etag = None
+    if stream or EtagService.condicional(request):
+        etag = EtagService.calcular(request, _com_versao_produto(db.execute(
+            filtrar_relatorios(
+                _versoes(),
+                status_filtro, cliente_id, produto_id, criado_de, criado_ate, ordem
+            ).offset(skip).limit(limit)
+        )))
+        nao_modificado = EtagService.verificar(request, etag)
+        if nao_modificado:
+            return nao_modificado
+    
+    stmt = filtrar_relatorios(
+        select(Relatorio),
+        status_filtro, cliente_id, produto_id, criado_de, criado_ate, ordem
+    ).offset(skip).limit(limit)
+    stmt = stmt.options(*CamposService.opcoes(Relatorio, campos or _CAMPOS_LISTA))
+    
+    if stream:
+        schema = CamposService.schema_parcial(RelatorioResponse, campos) if campos else RelatorioListResponse
+        return EtagService.aplicar(ExportService.listar_json(db, stmt, schema), etag)
+    
+    if etag is None:
+        stmt = stmt.options(*_opcoes_versao(campos))
+    relatorios = db.scalars(stmt).all()
+    etag = etag or EtagService.calcular(request, _versoes_carregadas(relatorios))
+    if campos:
+        return EtagService.aplicar(CamposService.responder(RelatorioResponse, campos, relatorios), etag)
+    return EtagService.aplicar(resposta_json(List[RelatorioListResponse], relatorios), etag)
+
+@router.get("/exportar")
+def exportar_relatorios(
+    formato: str = "ndjson",
+    status_filtro: str = None,
+    cliente_id: Optional[int] = None,
+    produto_id: Optional[int] = None,
+    criado_de: Optional[datetime] = None,
+    criado_ate: Optional[datetime] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Exporta os relatórios (sem fotos) em NDJSON ou CSV.
     
-    if status_filtro:
-        query = query.filter(Relatorio.status == status_filtro)
+    Aceita os mesmos filtros da listagem. A resposta é enviada em
+    streaming, lendo a tabela em blocos.
+    """
+    stmt = filtrar_relatorios(
+        select(Relatorio.__table__),
+        status_filtro, cliente_id, produto_id, criado_de, criado_ate
+    )
+    return ExportService.exportar(db, stmt, formato, "relatorios")
+
+@router.get("/busca", response_model=List[RelatorioListResponse])
+def buscar_relatorios(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Busca relatórios por palavras (título, descrição, observações e
+    descrição das fotos) ou por parte do código do pedido.
     
-    relatorios = query.offset(skip).limit(limit).all()
-    return relatorios
+    Resultados ordenados por relevância.
+    """
+    ids = BuscaService.buscar(db, q, skip, limit)
+    if not ids:
+        return []
+    
+    relatorios = db.scalars(
+        select(Relatorio)
+        .where(Relatorio.id.in_(ids))
+        .options(*CamposService.opcoes(Relatorio, _CAMPOS_LISTA))
+    ).all()
+    posicao = {id_: i for i, id_ in enumerate(ids)}
+    return resposta_json(List[RelatorioListResponse], sorted(relatorios, key=lambda r: posicao[r.id]))
+
+@router.get("/tabela", response_model=List[RelatorioListResponse])
+def consultar_tabela(
+    coluna: str = Query(..., min_length=1, max_length=100),
+    operador: str = Query("eq", pattern=f"^({'|'.join(OPERADORES)})$"),
+    valor: str = Query(..., max_length=200),
+    status_filtro: str = None,
+    cliente_id: Optional[int] = None,
+    produto_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Relatórios em que alguma linha da tabela dinâmica satisfaz o filtro.
+    
+    Exemplo: coluna=Valor&operador=gt&valor=75&produto_id=3
+    
+    - operador: eq, contem, gt, gte, lt, lte (os quatro últimos exigem valor
+      numérico e comparam o número no início da célula: "75kg" conta como 75;
+      células que não começam com número são ignoradas)
+    - status_filtro, cliente_id, produto_id: mesmos filtros da listagem
+    
+    O filtro é avaliado no banco (JSONB + índice GIN no PostgreSQL).
+    """
+    if operador in OPERADORES_NUMERICOS:
+        try:
+            valor = float(valor)
+        except ValueError:
+            valor = None
+        if valor is None or not math.isfinite(valor):
+            raise HTTPException(status_code=400, detail=f"Operador '{operador}' exige valor numérico")
+    
+    stmt = filtrar_relatorios(select(Relatorio), status_filtro, cliente_id, produto_id)
+    stmt = stmt.options(*CamposService.opcoes(Relatorio, _CAMPOS_LISTA))
+    stmt = stmt.where(TabelaService.filtro_celula(db, coluna, operador, valor))
+    return resposta_json(List[RelatorioListResponse], db.scalars(stmt.offset(skip).limit(limit)).all())
 
 @router.get("/{relatorio_id}", response_model=RelatorioResponse)
-def buscar_relatorio(relatorio_id: int, db: Session = Depends(get_db)):
+def buscar_relatorio(
+    relatorio_id: int,
+    request: Request,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
     """
     Busca relatório completo por ID (inclui cliente, produto e fotos).
+    
+    - fields: campos da resposta separados por vírgula (ex: titulo,status);
+      relacionamentos não pedidos não são carregados
     """
-    relatorio = db.query(Relatorio).filter(Relatorio.id == relatorio_id).first()
+    campos = CamposService.interpretar(fields, RelatorioResponse)
+    
+    # Revalidação: só consulta as versões se o cliente mandou If-None-Match
+    etag = None
+    if EtagService.condicional(request):
+        versoes = db.execute(_versoes().where(Relatorio.id == relatorio_id)).all()
+        if not versoes:
+            raise HTTPException(status_code=404, detail="Relatório não encontrado")
+        
+        etag = EtagService.calcular(request, _com_versao_produto(versoes))
+        nao_modificado = EtagService.verificar(request, etag, recurso_unico=True)
+        if nao_modificado:
+            return nao_modificado
+    
+    query = db.query(Relatorio).filter(Relatorio.id == relatorio_id)
+    if campos:
+        query = query.options(*CamposService.opcoes(Relatorio, campos))
+        if etag is None:
+            query = query.options(*_opcoes_versao(campos))
+    else:
+        # Produto vem do catálogo em memória
+        query = query.options(joinedload(Relatorio.cliente), selectinload(Relatorio.fotos))
+    relatorio = query.first()
     
     if not relatorio:
         raise HTTPException(status_code=404, detail="Relatório não encontrado")
     
-    return relatorio
+    etag = etag or EtagService.calcular(request, _versoes_carregadas([relatorio]))
+    if campos:
+        return EtagService.aplicar(CamposService.responder(RelatorioResponse, campos, relatorio), etag)
+    return EtagService.aplicar(resposta_json(RelatorioResponse, _com_produto(relatorio)), etag)
 
 @router.put("/{relatorio_id}", response_model=RelatorioResponse)
 def atualizar_relatorio(
@@ -85,58 +431,135 @@ def atualizar_relatorio(
 ):
     """
     Atualiza dados do relatório.
-    """
-    db_relatorio = db.query(Relatorio).filter(Relatorio.id == relatorio_id).first()
-    
-    if not db_relatorio:
-        raise HTTPException(status_code=404, detail="Relatório não encontrado")
     
+    Um único UPDATE ... RETURNING; referências inválidas e código de
+    pedido duplicado são detectados pelas constraints do banco.
+    """
     update_data = relatorio_update.model_dump(exclude_unset=True)
     
-    # Validar cliente_id se fornecido
-    if "cliente_id" in update_data:
-        cliente = db.query(Cliente).filter(Cliente.id == update_data["cliente_id"]).first()
-        if not cliente:
-            raise HTTPException(status_code=404, detail="Cliente não encontrado")
-    
-    # Validar produto_id se fornecido
-    if "produto_id" in update_data:
-        produto = db.query(Produto).filter(Produto.id == update_data["produto_id"]).first()
-        if not produto:
-            raise HTTPException(status_code=404, detail="Produto não encontrado")
-    
-    # Verificar código de pedido duplicado
-    if "codigo_pedido" in update_data:
-        existe = db.query(Relatorio).filter(
-            Relatorio.codigo_pedido == update_data["codigo_pedido"],
-            Relatorio.id != relatorio_id
+    if not update_data:
+        db_relatorio = db.get(Relatorio, relatorio_id)
+        if not db_relatorio:
+            raise HTTPException(status_code=404, detail="Relatório não encontrado")
+        return _com_produto(db_relatorio)
+    
+    # Valores antigos só são lidos se a mudança afeta o dashboard
+    antes = None
+    if update_data.keys() & {"status", "cliente_id", "produto_id"}:
+        antes = db.execute(
+            select(*COLUNAS_RESUMO)
+            .where(Relatorio.id == relatorio_id)
+            .with_for_update()
         ).first()
-        if existe:
-            raise HTTPException(status_code=400, detail="Código de pedido já existe")
     
-    for key, value in update_data.items():
-        setattr(db_relatorio, key, value)
+    stmt = (
+        update(Relatorio)
+        .where(Relatorio.id == relatorio_id)
+        .values(**update_data)
+        .returning(Relatorio)
+    )
+    try:
+        db_relatorio = db.scalars(stmt).first()
+    except IntegrityError:
+        db.rollback()
+        _verificar_referencias(db, update_data.get("cliente_id"), update_data.get("produto_id"))
+        raise HTTPException(status_code=400, detail="Código de pedido já existe")
+    
+    if not db_relatorio:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Relatório não encontrado")
     
+    BuscaService.indexar(db, [relatorio_id])
+    if antes is not None:
+        ResumoService.ajustar(db, antes=antes, depois=ResumoService.valores(db_relatorio))
     db.commit()
-    db.refresh(db_relatorio)
     
-    return db_relatorio
+    return _com_produto(db_relatorio)
+
+@router.post("/{relatorio_id}/clonar", response_model=RelatorioResponse, status_code=status.HTTP_201_CREATED)
+def clonar_relatorio(relatorio_id: int, clone: RelatorioClone, db: Session = Depends(get_db)):
+    """
+    Cria um relatório a partir de outro, com novo código de pedido.
+    
+    Copia cliente, produto, textos e tabela dinâmica (o status volta a
+    rascunho) e as fotos, numa única transação. Os arquivos das fotos não
+    são copiados nem reprocessados: cada foto nova é um hard link para o
+    arquivo original. Fotos cujo arquivo sumiu do disco não são copiadas.
+    """
+    stmt = (
+        dialect_insert(Relatorio)
+        .from_select(
+            ["codigo_pedido", "titulo", "descricao", "observacoes", "cliente_id", "produto_id", "dados_tabela"],
+            select(
+                literal(clone.codigo_pedido, String),
+                func.coalesce(literal(clone.titulo, String), Relatorio.titulo),
+                Relatorio.descricao,
+                Relatorio.observacoes,
+                Relatorio.cliente_id,
+                Relatorio.produto_id,
+                Relatorio.dados_tabela
+            ).where(Relatorio.id == relatorio_id)
+        )
+        .on_conflict_do_nothing(index_elements=[Relatorio.codigo_pedido])
+        .returning(Relatorio)
+    )
+    db_relatorio = db.scalars(stmt).first()
+    if db_relatorio is None:
+        db.rollback()
+        if db.scalar(select(Relatorio.id).where(Relatorio.id == relatorio_id)) is None:
+            raise HTTPException(status_code=404, detail="Relatório não encontrado")
+        raise HTTPException(status_code=400, detail="Código de pedido já existe")
+    
+    fotos = db.execute(
+        select(Foto.nome_original, Foto.caminho, Foto.tamanho, Foto.mime_type, Foto.descricao, Foto.ordem)
+        .where(Foto.relatorio_id == relatorio_id)
+    ).all()
+    
+    vinculados: List[str] = []
+    try:
+        novas = []
+        for foto in fotos:
+            try:
+                nome_arquivo, caminho = UploadService.vincular_imagem(foto.caminho)
+            except FileNotFoundError:
+                logger.warning("foto_sem_arquivo_nao_clonada", extra={"caminho": foto.caminho})
+                continue
+            vinculados.append(caminho)
+            novas.append({
+                **foto._asdict(),
+                "relatorio_id": db_relatorio.id,
+                "nome_arquivo": nome_arquivo,
+                "caminho": caminho,
+            })
+        if novas:
+            db.execute(insert(Foto), novas)
+        
+        BuscaService.indexar(db, [db_relatorio.id])
+        ResumoService.ajustar(db, depois=ResumoService.valores(db_relatorio))
+        db.commit()
+    except Exception:
+        # Sem o registro, os novos nomes seriam arquivos órfãos
+        db.rollback()
+        for caminho in vinculados:
+            UploadService.deletar_imagem(caminho)
+        raise
+    
+    return _com_produto(db_relatorio)
 
 @router.delete("/{relatorio_id}", status_code=status.HTTP_204_NO_CONTENT)
 def deletar_relatorio(relatorio_id: int, db: Session = Depends(get_db)):
     """
     Deleta um relatório e suas fotos associadas.
     """
-    db_relatorio = db.query(Relatorio).filter(Relatorio.id == relatorio_id).first()
-    
-    if not db_relatorio:
+    # Arquivos removidos pelo coletor depois do commit; fotos e relatório
+    # apagados em comandos únicos (sem carregar as fotos). O resumo desconta
+    # a linha devolvida pelo DELETE: se outra requisição apagou antes, 404
+    coletor_arquivos.agendar(db, Foto.relatorio_id == relatorio_id)
+    db.execute(delete(Foto).where(Foto.relatorio_id == relatorio_id), execution_options={"synchronize_session": False})
+    BuscaService.remover(db, select(Relatorio.id).where(Relatorio.id == relatorio_id))
+    if not ResumoService.excluir(db, Relatorio.id == relatorio_id):
+        db.rollback()
         raise HTTPException(status_code=404, detail="Relatório não encontrado")
-    
-    # Deletar arquivos de foto do disco
-    for foto in db_relatorio.fotos:
-        UploadService.deletar_imagem(foto.caminho)
-    
-    db.delete(db_relatorio)
     db.commit()
     
     return None
@@ -154,8 +577,7 @@ async def adicionar_foto(
     Adiciona uma foto ao relatório.
     """
     # Verificar se relatório existe
-    relatorio = db.query(Relatorio).filter(Relatorio.id == relatorio_id).first()
-    if not relatorio:
+    if db.scalar(select(Relatorio.id).where(Relatorio.id == relatorio_id)) is None:
         raise HTTPException(status_code=404, detail="Relatório não encontrado")
     
     # Salvar arquivo
@@ -170,17 +592,24 @@ async def adicionar_foto(
         tamanho=tamanho,
         mime_type=file.content_type,
         descricao=descricao,
-        ordem=len(relatorio.fotos)  # Adiciona no final
+        # Adiciona no final: max(ordem) + 1 calculado no próprio INSERT
+        # (índice relatorio_id + ordem), sem carregar as fotos
+        ordem=select(func.coalesce(func.max(Foto.ordem) + 1, 0))
+            .where(Foto.relatorio_id == relatorio_id)
+            .scalar_subquery()
     )
     
     db.add(db_foto)
+    db.flush()
+    _marcar_atualizado(db, relatorio_id)
+    BuscaService.indexar(db, [relatorio_id])
     db.commit()
     db.refresh(db_foto)
     
     return db_foto
 
 @router.get("/{relatorio_id}/fotos", response_model=List[FotoResponse])
-def listar_fotos(relatorio_id: int, db: Session = Depends(get_db)):
+def listar_fotos(relatorio_id: int, db: Session = Depends(get_read_db)):
     """
     Lista todas as fotos de um relatório.
     """
@@ -190,6 +619,38 @@ def listar_fotos(relatorio_id: int, db: Session = Depends(get_db)):
     
     return relatorio.fotos
 
+@router.put("/{relatorio_id}/fotos/ordem", response_model=List[FotoResponse])
+def reordenar_fotos(relatorio_id: int, ordem: FotoOrdem, db: Session = Depends(get_db)):
+    """
+    Define a ordem de todas as fotos do relatório de uma vez.
+    
+    foto_ids deve conter cada foto do relatório exatamente uma vez, na
+    nova ordem. Aplicado com um único UPDATE (CASE por id).
+    """
+    if db.scalar(select(Relatorio.id).where(Relatorio.id == relatorio_id)) is None:
+        raise HTTPException(status_code=404, detail="Relatório não encontrado")
+    
+    atuais = set(db.scalars(select(Foto.id).where(Foto.relatorio_id == relatorio_id)))
+    if len(ordem.foto_ids) != len(atuais) or set(ordem.foto_ids) != atuais:
+        raise HTTPException(
+            status_code=400,
+            detail="foto_ids deve conter todas as fotos do relatório, cada uma uma vez"
+        )
+    
+    db.execute(
+        update(Foto)
+        .where(Foto.relatorio_id == relatorio_id)
+        .values(ordem=case({foto_id: posicao for posicao, foto_id in enumerate(ordem.foto_ids)}, value=Foto.id)),
+        execution_options={"synchronize_session": False}
+    )
+    _marcar_atualizado(db, relatorio_id)
+    db.commit()
+    
+    return db.scalars(
+        select(Foto).where(Foto.relatorio_id == relatorio_id).order_by(Foto.ordem)
+        .execution_options(populate_existing=True)
+    ).all()
+
 @router.delete("/{relatorio_id}/fotos/{foto_id}", status_code=status.HTTP_204_NO_CONTENT)
 def deletar_foto(relatorio_id: int, foto_id: int, db: Session = Depends(get_db)):
     """
@@ -203,11 +664,12 @@ def deletar_foto(relatorio_id: int, foto_id: int, db: Session = Depends(get_db))
     if not foto:
         raise HTTPException(status_code=404, detail="Foto não encontrada")
     
-    # Deletar arquivo do disco
-    UploadService.deletar_imagem(foto.caminho)
-    
-    # Deletar do banco
+    # Arquivo removido pelo coletor depois do commit
+    coletor_arquivos.agendar(db, Foto.id == foto_id)
     db.delete(foto)
+    db.flush()
+    _marcar_atualizado(db, relatorio_id)
+    BuscaService.indexar(db, [relatorio_id])
     db.commit()
     
     return None
@@ -215,7 +677,7 @@ def deletar_foto(relatorio_id: int, foto_id: int, db: Session = Depends(get_db))
 # =============== GERAÇÃO DE PDF ===============
 
 @router.get("/{relatorio_id}/pdf")
-def gerar_pdf(relatorio_id: int, db: Session = Depends(get_db)):
+def gerar_pdf(relatorio_id: int, db: Session = Depends(get_read_db)):
     """
     Gera PDF do relatório e retorna para download.
     """
@@ -224,6 +686,8 @@ def gerar_pdf(relatorio_id: int, db: Session = Depends(get_db)):
     if not relatorio:
         raise HTTPException(status_code=404, detail="Relatório não encontrado")
     
+    produto = catalogo_produtos.obter(relatorio.produto_id) or relatorio.produto
+    
     # Preparar dados para o PDF
     relatorio_data = {
         'codigo_pedido': relatorio.codigo_pedido,
@@ -232,11 +696,11 @@ def gerar_pdf(relatorio_id: int, db: Session = Depends(get_db)):
         'observacoes': relatorio.observacoes,
         'cliente': {
             'nome': relatorio.cliente.nome,
-            'empresa': relatorio.cliente.empresa
+            'email': relatorio.cliente.email
         },
         'produto': {
-            'nome': relatorio.produto.nome,
-            'codigo': relatorio.produto.codigo
+            'nome': produto.nome,
+            'codigo': produto.codigo
         },
         'dados_tabela': relatorio.dados_tabela,
         'fotos': [
@@ -0,0 +1,162 @@
+import re
+from typing import List, Sequence
+from sqlalchemy import bindparam, column, delete, table, text, Select
+from sqlalchemy.orm import Session
+
+# Configuração de idioma do PostgreSQL usada no tsvector e na consulta
+IDIOMA = "portuguese"
+
+# Tabela de busca (criada por DDL em app/models/relatorio.py)
+_relatorios_busca = table("relatorios_busca", column("rowid"))
+
+_INDEXAR_POSTGRESQL = text(f"""
+    INSERT INTO relatorios_busca (relatorio_id, documento)
+    SELECT r.id,
+           setweight(to_tsvector('{IDIOMA}', coalesce(r.titulo, '')), 'A') ||
+           setweight(to_tsvector('simple', r.codigo_pedido), 'A') ||
+           setweight(to_tsvector('{IDIOMA}', coalesce(r.descricao, '')), 'B') ||
+           setweight(to_tsvector('{IDIOMA}', coalesce(r.observacoes, '')), 'C') ||
+           setweight(to_tsvector('{IDIOMA}', coalesce(
+               (SELECT string_agg(f.descricao, ' ') FROM fotos f WHERE f.relatorio_id = r.id), ''
+           )), 'C')
+    FROM relatorios r
+    WHERE r.id IN :ids
+    ON CONFLICT (relatorio_id) DO UPDATE SET documento = EXCLUDED.documento
+""").bindparams(bindparam("ids", expanding=True))
+
+_INDEXAR_SQLITE = text("""
+    INSERT INTO relatorios_busca (rowid, titulo, descricao, observacoes, fotos, codigo_pedido)
+    SELECT r.id, r.titulo, r.descricao, r.observacoes,
+           (SELECT group_concat(f.descricao, ' ') FROM fotos f WHERE f.relatorio_id = r.id),
+           r.codigo_pedido
+    FROM relatorios r
+    WHERE r.id IN :ids
+""").bindparams(bindparam("ids", expanding=True))
+
+# Resultado de texto e match parcial de codigo_pedido unidos e ranqueados
+_BUSCAR_POSTGRESQL = f"""
+    SELECT id FROM (
+        SELECT b.relatorio_id AS id, ts_rank(b.documento, q) AS rank
+        FROM relatorios_busca b, websearch_to_tsquery('{IDIOMA}', :consulta) q
+        WHERE b.documento @@ q
+        {{codigo}}
+    ) hits
+    GROUP BY id
+    ORDER BY max(rank) DESC, id DESC
+    LIMIT :limit OFFSET :skip
+"""
+_CODIGO_POSTGRESQL = "UNION ALL SELECT r.id, 1.0 FROM relatorios r WHERE r.codigo_pedido ILIKE :padrao ESCAPE '\\'"
+
+# No FTS5 o bm25 é negativo: quanto menor, mais relevante. MATERIALIZED
+# impede o SQLite de achatar a subconsulta (sem o UNION ALL do código ele
+# achataria, e bm25() não pode ser avaliado dentro do GROUP BY)
+_BUSCAR_SQLITE = """
+    WITH hits AS MATERIALIZED (
+        SELECT rowid AS id, bm25(relatorios_busca, 10.0, 4.0, 2.0, 2.0, 10.0) AS rank
+        FROM relatorios_busca
+        WHERE relatorios_busca MATCH :consulta
+        {codigo}
+    )
+    SELECT id FROM hits
+    GROUP BY id
+    ORDER BY min(rank), id DESC
+    LIMIT :limit OFFSET :skip
+"""
+_CODIGO_SQLITE = "UNION ALL SELECT r.id, -1000.0 FROM relatorios r WHERE r.codigo_pedido LIKE :padrao ESCAPE '\\'"
+
+# Buscas parciais em codigo_pedido só usam o índice de trigramas a partir de 3 caracteres
+_MIN_CODIGO_PARCIAL = 3
+
+
+class BuscaService:
+    """
+    Serviço de busca textual em relatórios.
+
+    Indexa título, descrição, observações, descrições das fotos e código
+    do pedido. Usa full-text do PostgreSQL (tsvector + GIN, ranqueado por
+    ts_rank) ou FTS5 no SQLite.
+    """
+
+    @staticmethod
+    def _dialeto(db: Session) -> str:
+        return db.get_bind().dialect.name
+
+    @staticmethod
+    def indexar(db: Session, relatorio_ids: Sequence[int]) -> None:
+        """
+        (Re)indexa os relatórios informados na transação atual.
+        Chamar sempre que o relatório ou suas fotos mudarem.
+        """
+        if not relatorio_ids:
+            return
+
+        ids = list(relatorio_ids)
+        if BuscaService._dialeto(db) == "postgresql":
+            db.execute(_INDEXAR_POSTGRESQL, {"ids": ids})
+        elif BuscaService._dialeto(db) == "sqlite":
+            # FTS5 não tem UPSERT: remove e insere de novo
+            db.execute(delete(_relatorios_busca).where(_relatorios_busca.c.rowid.in_(ids)))
+            db.execute(_INDEXAR_SQLITE, {"ids": ids})
+
+    @staticmethod
+    def remover(db: Session, relatorio_ids: Select) -> None:
+        """
+        Remove do índice os relatórios selecionados (consulta de ids).
+        No PostgreSQL a FK com ON DELETE CASCADE já faz isso.
+        """
+        if BuscaService._dialeto(db) == "sqlite":
+            db.execute(delete(_relatorios_busca).where(_relatorios_busca.c.rowid.in_(relatorio_ids)))
+
+    @staticmethod
+    def _consulta_fts5(termo: str) -> str:
+        """Converte o texto do usuário em consulta FTS5 (todas as palavras, por prefixo)"""
+        palavras = re.findall(r"\w+", termo)
+        return " ".join('"' + palavra.replace('"', '""') + '"*' for palavra in palavras)
+
+    @staticmethod
+    def buscar(db: Session, termo: str, skip: int = 0, limit: int = 100) -> List[int]:
+        """
+        Retorna os ids dos relatórios encontrados, do mais relevante ao menos.
+        """
+        padrao = "%" + termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        usar_codigo = len(termo) >= _MIN_CODIGO_PARCIAL
+        parametros = {"padrao": padrao, "skip": skip, "limit": limit}
+
+        if BuscaService._dialeto(db) == "postgresql":
+            sql = _BUSCAR_POSTGRESQL.format(codigo=_CODIGO_POSTGRESQL if usar_codigo else "")
+            parametros["consulta"] = termo
+        else:
+            consulta = BuscaService._consulta_fts5(termo)
+            if not consulta and not usar_codigo:
+                return []
+            sql = _BUSCAR_SQLITE.format(codigo=_CODIGO_SQLITE if usar_codigo else "")
+            # Consulta vazia no FTS5 é erro de sintaxe: usa uma que nunca casa
+            parametros["consulta"] = consulta or '""'
+
+        if not usar_codigo:
+            parametros.pop("padrao")
+
+        return list(db.scalars(text(sql), parametros))
+
+    @staticmethod
+    def reindexar_tudo(db: Session, tamanho_lote: int = 1000) -> int:
+        """
+        Reconstrói o índice de todos os relatórios, em lotes.
+
+        Returns:
+            Quantidade de relatórios indexados
+        """
+        total = 0
+        ultimo_id = 0
+        while True:
+            ids = list(db.scalars(
+                text("SELECT id FROM relatorios WHERE id > :ultimo ORDER BY id LIMIT :lote"),
+                {"ultimo": ultimo_id, "lote": tamanho_lote}
+            ))
+            if not ids:
+                break
+            BuscaService.indexar(db, ids)
+            db.commit()
+            total += len(ids)
+            ultimo_id = ids[-1]
+        return total
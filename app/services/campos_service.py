@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from app.core.serializacao import resposta_json
+
+
+class CamposService:
+    """
+    Serviço de "sparse fieldsets" (parâmetro fields= das leituras).
+
+    A partir da lista de campos pedida pelo cliente, monta as opções de
+    carregamento do SQLAlchemy (só as colunas e relacionamentos pedidos)
+    e um schema Pydantic reduzido para serializar apenas esses campos.
+    """
+
+    @staticmethod
+    def interpretar(fields: Optional[str], schema: type[BaseModel]) -> Optional[Tuple[str, ...]]:
+        """
+        Converte "id,nome,email" em uma tupla de campos do schema.
+
+        Returns:
+            None quando fields não foi informado (resposta completa)
+
+        Raises:
+            HTTPException: Se algum campo não existir no schema
+        """
+        if fields is None:
+            return None
+
+        campos = tuple(dict.fromkeys(campo.strip() for campo in fields.split(",") if campo.strip()))
+        invalidos = [campo for campo in campos if campo not in schema.model_fields]
+        if not campos or invalidos:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos inválidos: {', '.join(invalidos) or '(vazio)'}. "
+                       f"Disponíveis: {', '.join(schema.model_fields)}"
+            )
+        return campos
+
+    @staticmethod
+    def opcoes(model, campos: Iterable[str]) -> List:
+        """
+        Opções de carregamento para buscar só os campos pedidos.
+
+        Colunas entram no load_only (a chave primária sempre é carregada);
+        relacionamentos muitos-para-um vêm no mesmo SELECT (JOIN) e coleções
+        em um SELECT ... IN por página. Relacionamentos não pedidos não são
+        carregados.
+        """
+        mapper = inspect(model)
+        colunas = [getattr(model, campo) for campo in campos if campo in mapper.column_attrs]
+        if not colunas:
+            # Só relacionamentos pedidos: basta a chave primária
+            colunas = [getattr(model, mapper.get_property_by_column(coluna).key) for coluna in mapper.primary_key]
+        opcoes = [load_only(*colunas)]
+
+        for campo in campos:
+            if campo in mapper.relationships:
+                relacionamento = getattr(model, campo)
+                if mapper.relationships[campo].uselist:
+                    opcoes.append(selectinload(relacionamento))
+                else:
+                    opcoes.append(joinedload(relacionamento))
+        return opcoes
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def schema_parcial(schema: type[BaseModel], campos: Tuple[str, ...]) -> type[BaseModel]:
+        """Schema com apenas os campos pedidos (mesmos tipos e validações do original)"""
+        return create_model(
+            f"{schema.__name__}Parcial",
+            __config__=ConfigDict(from_attributes=True),
+            **{campo: (schema.model_fields[campo].annotation, schema.model_fields[campo]) for campo in campos}
+        )
+
+    @staticmethod
+    def responder(schema: type[BaseModel], campos: Tuple[str, ...], dados):
+        """Serializa um objeto ou uma lista apenas com os campos pedidos"""
+        parcial = CamposService.schema_parcial(schema, campos)
+        return resposta_json(List[parcial] if isinstance(dados, list) else parcial, dados)
@@ -1,34 +1,25 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config import settings
 from app.core.security import create_email_token
+from app.core.emails import enviador_emails
 
 
 def send_email(to_email: str, subject: str, body: str):
     """
-    Envia email usando SMTP do Gmail.
-    Retorna True se enviou com sucesso, False se deu erro.
+    Coloca o email na fila de envio em segundo plano (app/core/emails.py).
+    Retorna na hora; falhas de SMTP são repetidas e registradas no log.
     """
-    try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = f"{settings.MAIL_FROM_NAME} <{settings.MAIL_FROM}>"
-        msg['To'] = to_email
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{settings.MAIL_FROM_NAME} <{settings.MAIL_FROM}>"
+    msg['To'] = to_email
 
-        html_part = MIMEText(body, 'html')
-        msg.attach(html_part)
+    html_part = MIMEText(body, 'html')
+    msg.attach(html_part)
 
-        with smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT) as server:
-            server.starttls()
-            server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
-            server.send_message(msg)
-        
-        print(f"✅ Email enviado para {to_email}")
-        return True
-    except Exception as e:
-        print(f"❌ Erro ao enviar email: {e}")
-        return False
+    enviador_emails.enfileirar(msg)
+    return True
 
 
 def send_verification_email(email: str, full_name: str):
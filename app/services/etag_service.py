@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.sql import ColumnElement
+
+
+class EtagService:
+    """
+    Serviço de revalidação HTTP (ETag / If-None-Match).
+
+    O ETag (fraco) é um hash das versões das linhas que compõem a resposta
+    (id + updated_at, ou created_at se nunca atualizada) e dos parâmetros
+    da requisição. Quando a requisição traz If-None-Match, as versões vêm
+    de uma consulta leve, só com essas colunas: se o cliente já tem a
+    versão atual, a rota responde 304 sem carregar nem serializar o corpo.
+    Sem If-None-Match a consulta leve não roda; o ETag é calculado das
+    linhas já carregadas para a resposta (exceto em streaming, em que o
+    header sai antes das linhas).
+
+    No PostgreSQL updated_at tem precisão de microssegundos; no SQLite
+    (desenvolvimento) de milissegundos (now() compilado com %f).
+    """
+
+    # Colunas que versao() lê; devem estar carregadas para versao_de()
+    COLUNAS_VERSAO = ("created_at", "updated_at")
+
+    @staticmethod
+    def versao(model) -> ColumnElement:
+        """Coluna que muda a cada escrita na linha"""
+        return func.coalesce(model.updated_at, model.created_at)
+
+    @staticmethod
+    def versao_de(objeto) -> Optional[datetime]:
+        """O mesmo valor de versao(), para um objeto já carregado"""
+        return objeto.updated_at or objeto.created_at
+
+    @staticmethod
+    def condicional(request: Request) -> bool:
+        """Se a requisição é uma revalidação (traz If-None-Match)"""
+        return bool(request.headers.get("if-none-match"))
+
+    @staticmethod
+    def calcular(request: Request, linhas: Iterable[Sequence]) -> str:
+        """ETag fraco para as linhas de versão e a query string da requisição"""
+        hash_ = hashlib.sha1(request.url.path.encode())
+        hash_.update(b"?" + request.url.query.encode())
+        for linha in linhas:
+            hash_.update(repr(tuple(linha)).encode())
+        return f'W/"{hash_.hexdigest()}"'
+
+    @staticmethod
+    def verificar(request: Request, etag: str, recurso_unico: bool = False) -> Optional[Response]:
+        """
+        Retorna a resposta 304 se o If-None-Match da requisição casa com o
+        ETag (comparação fraca); senão None.
+
+        "*" só vale em rotas de um único recurso (recurso_unico=True), que
+        devem responder 404 antes de chamar verificar se ele não existe.
+        Uma listagem sempre "existe", então lá "*" não casa com nada.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            return None
+
+        recebidos = {valor.strip().removeprefix("W/") for valor in if_none_match.split(",")}
+        if (recurso_unico and "*" in recebidos) or etag.removeprefix("W/") in recebidos:
+            return Response(status_code=304, headers=EtagService.headers(etag))
+        return None
+
+    @staticmethod
+    def headers(etag: str) -> dict:
+        # no-cache: o navegador pode guardar, mas revalida a cada uso
+        return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    @staticmethod
+    def aplicar(resposta: Response, etag: str) -> Response:
+        """Adiciona o ETag à resposta completa"""
+        resposta.headers.update(EtagService.headers(etag))
+        return resposta
@@ -0,0 +1,137 @@
+import logging
+import os
+import time
+from typing import List
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+from app.config import settings
+from app.models import ExclusaoPendente, Foto
+from app.services.upload_service import UploadService
+
+logger = logging.getLogger(__name__)
+
+
+class ExclusaoService:
+    """
+    Remoção adiada dos arquivos de upload.
+
+    As rotas não apagam arquivos: agendar() grava os caminhos em
+    exclusoes_pendentes na mesma transação que apaga as fotos, com um
+    único INSERT ... SELECT (custo independente da quantidade de fotos).
+    processar_lote() remove os arquivos depois do commit, em lotes; é
+    chamado pelo coletor em segundo plano (app.core.exclusoes).
+
+    reconciliar() encontra fotos em UPLOAD_DIR sem Foto que as
+    referencie (uploads cujo commit falhou, exclusões anteriores a este
+    serviço) e as agenda.
+    """
+
+    @staticmethod
+    def agendar(db: Session, filtro: ColumnElement) -> None:
+        """
+        Agenda a remoção dos arquivos das fotos que satisfazem o filtro.
+        Chamar antes de apagar as fotos, na mesma transação.
+
+        Ex: agendar(db, Foto.relatorio_id == 10)
+        """
+        db.execute(insert(ExclusaoPendente).from_select(
+            ["caminho"], select(Foto.caminho).where(filtro)
+        ))
+
+    @staticmethod
+    def processar_lote(db: Session, limite: int = 500) -> int:
+        """
+        Remove do disco até `limite` arquivos pendentes.
+
+        Arquivo já ausente conta como removido. Falhas (permissão, disco)
+        ficam na fila com tentativas + 1 e voltam no próximo lote, até
+        EXCLUSAO_MAX_TENTATIVAS.
+
+        Returns:
+            Quantidade de pendências resolvidas
+        """
+        stmt = (
+            select(ExclusaoPendente.id, ExclusaoPendente.caminho)
+            .where(ExclusaoPendente.tentativas < settings.EXCLUSAO_MAX_TENTATIVAS)
+            .order_by(ExclusaoPendente.id)
+            .limit(limite)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            # Vários workers coletando ao mesmo tempo pegam lotes diferentes
+            stmt = stmt.with_for_update(skip_locked=True)
+
+        resolvidas: List[int] = []
+        falhas: List[int] = []
+        for id_, caminho in db.execute(stmt).all():
+            if not ExclusaoService._dentro_do_upload(caminho):
+                logger.warning("exclusao_fora_do_upload", extra={"caminho": caminho, "upload_dir": settings.UPLOAD_DIR})
+                resolvidas.append(id_)
+                continue
+            try:
+                os.remove(caminho)
+                resolvidas.append(id_)
+            except FileNotFoundError:
+                resolvidas.append(id_)
+            except OSError as e:
+                logger.error("arquivo_nao_removido", extra={"caminho": caminho, "motivo": str(e)})
+                falhas.append(id_)
+
+        if resolvidas:
+            db.execute(delete(ExclusaoPendente).where(ExclusaoPendente.id.in_(resolvidas)))
+        if falhas:
+            db.execute(
+                update(ExclusaoPendente)
+                .where(ExclusaoPendente.id.in_(falhas))
+                .values(tentativas=ExclusaoPendente.tentativas + 1)
+            )
+        db.commit()
+        return len(resolvidas)
+
+    @staticmethod
+    def reconciliar(db: Session, idade_minima: int) -> List[str]:
+        """
+        Agenda a remoção dos arquivos de UPLOAD_DIR que nenhuma Foto
+        referencia e que não estão na fila.
+
+        Só considera nomes gerados pelo upload (UploadService.e_nome_gerado):
+        outros arquivos da pasta, como os PDFs de gerar_pdf, não são fotos
+        e nunca têm Foto correspondente.
+
+        Arquivos mais novos que `idade_minima` (segundos) são ignorados:
+        podem ser uploads cujo registro ainda não fez commit.
+
+        Returns:
+            Caminhos agendados
+        """
+        if not os.path.isdir(settings.UPLOAD_DIR):
+            return []
+
+        limite = time.time() - idade_minima
+        candidatos = {}
+        with os.scandir(settings.UPLOAD_DIR) as entradas:
+            for entrada in entradas:
+                if (entrada.is_file() and UploadService.e_nome_gerado(entrada.name)
+                        and entrada.stat().st_mtime < limite):
+                    candidatos[entrada.name] = os.path.join(settings.UPLOAD_DIR, entrada.name)
+        if not candidatos:
+            return []
+
+        nomes = list(candidatos)
+        conhecidos = set()
+        # Em blocos, para não passar do limite de parâmetros do banco
+        for inicio in range(0, len(nomes), 1000):
+            bloco = nomes[inicio:inicio + 1000]
+            conhecidos.update(db.scalars(select(Foto.nome_arquivo).where(Foto.nome_arquivo.in_(bloco))))
+        conhecidos.update(os.path.basename(caminho) for caminho in db.scalars(select(ExclusaoPendente.caminho)))
+
+        orfaos = [caminho for nome, caminho in sorted(candidatos.items()) if nome not in conhecidos]
+        if orfaos:
+            db.execute(insert(ExclusaoPendente), [{"caminho": caminho} for caminho in orfaos])
+            db.commit()
+        return orfaos
+
+    @staticmethod
+    def _dentro_do_upload(caminho: str) -> bool:
+        pasta = os.path.realpath(settings.UPLOAD_DIR)
+        return os.path.commonpath([pasta, os.path.realpath(caminho)]) == pasta
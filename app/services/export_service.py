@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Sequence
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+from app.core.tempos import medir
+
+
+class ExportService:
+    """
+    Serviço para exportação e listagens em streaming.
+
+    As consultas usam yield_per, que no PostgreSQL abre um cursor no
+    servidor: as linhas chegam em blocos de TAMANHO_BLOCO e cada bloco é
+    serializado e enviado antes de buscar o próximo. A memória fica
+    constante, qualquer que seja o tamanho da tabela.
+    """
+
+    TAMANHO_BLOCO = 1000
+    FORMATOS = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv; charset=utf-8",
+    }
+
+    @staticmethod
+    def _blocos(db: Session, stmt: Select, orm: bool = False) -> Iterator[list]:
+        """Executa a consulta com cursor no servidor e devolve blocos de linhas"""
+        result = db.execute(stmt.execution_options(yield_per=ExportService.TAMANHO_BLOCO))
+        linhas = result.scalars() if orm else result.mappings()
+        try:
+            for bloco in linhas.partitions():
+                yield bloco
+        finally:
+            result.close()
+
+    @staticmethod
+    def _valor_csv(valor: Any) -> Any:
+        if isinstance(valor, (dict, list)):
+            return json.dumps(valor, ensure_ascii=False)
+        if isinstance(valor, (datetime, date)):
+            return valor.isoformat()
+        return valor
+
+    @staticmethod
+    def gerar_ndjson(db: Session, stmt: Select) -> Iterator[bytes]:
+        """Uma linha JSON por registro"""
+        for bloco in ExportService._blocos(db, stmt):
+            yield b"".join(to_json(dict(linha)) + b"\n" for linha in bloco)
+
+    @staticmethod
+    def gerar_csv(db: Session, stmt: Select) -> Iterator[bytes]:
+        """CSV com cabeçalho; colunas JSON são gravadas como texto"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([coluna.name for coluna in stmt.selected_columns])
+
+        for bloco in ExportService._blocos(db, stmt):
+            for linha in bloco:
+                writer.writerow([ExportService._valor_csv(valor) for valor in linha.values()])
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Tabela vazia: envia só o cabeçalho
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def exportar(db: Session, stmt: Select, formato: str, nome: str) -> StreamingResponse:
+        """
+        Monta a resposta de exportação no formato pedido.
+
+        Raises:
+            HTTPException: Se o formato não for suportado
+        """
+        if formato not in ExportService.FORMATOS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Formato não suportado. Use: {', '.join(ExportService.FORMATOS)}"
+            )
+
+        gerador = ExportService.gerar_csv if formato == "csv" else ExportService.gerar_ndjson
+        return StreamingResponse(
+            gerador(db, stmt),
+            media_type=ExportService.FORMATOS[formato],
+            headers={"Content-Disposition": f'attachment; filename="{nome}.{formato}"'}
+        )
+
+    @staticmethod
+    def listar_json(db: Session, stmt: Select, schema: type[BaseModel]) -> StreamingResponse:
+        """
+        Envia um array JSON de objetos ORM incrementalmente.
+
+        Cada item passa pelo mesmo schema de resposta da listagem normal,
+        então o corpo é idêntico; só o primeiro byte chega mais cedo.
+        """
+        return ExportService._array_json(ExportService._blocos(db, stmt, orm=True), schema)
+
+    @staticmethod
+    def listar_json_memoria(objetos: Sequence[Any], schema: type[BaseModel]) -> StreamingResponse:
+        """Como listar_json, para objetos já em memória (ex: cache do catálogo)"""
+        tamanho = ExportService.TAMANHO_BLOCO
+        blocos = (objetos[inicio:inicio + tamanho] for inicio in range(0, len(objetos), tamanho))
+        return ExportService._array_json(blocos, schema)
+
+    @staticmethod
+    def _array_json(blocos: Iterable[Sequence[Any]], schema: type[BaseModel]) -> StreamingResponse:
+        def gerar() -> Iterator[bytes]:
+            yield b"["
+            primeiro = True
+            for bloco in blocos:
+                with medir("serializacao"):
+                    itens = b",".join(schema.model_validate(obj).model_dump_json().encode() for obj in bloco)
+                yield itens if primeiro else b"," + itens
+                primeiro = False
+            yield b"]"
+
+        return StreamingResponse(gerar(), media_type="application/json")
@@ -0,0 +1,217 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+from app.database import dialect_insert
+from app.models.schemas.importacao import LinhaImportacao, ImportacaoResponse
+
+# Linha já validada: (número da linha no arquivo, dados prontos para o INSERT)
+LinhaValida = Tuple[int, Dict[str, Any]]
+
+
+class ImportService:
+    """
+    Serviço para importação em lote (CSV ou NDJSON).
+
+    As linhas são lidas do arquivo em streaming, validadas com os schemas
+    Pydantic em lotes e gravadas com um INSERT de várias linhas
+    (ON CONFLICT DO NOTHING RETURNING) por lote.
+    """
+
+    TAMANHO_LOTE = 1000
+    FORMATOS = ("csv", "ndjson")
+
+    @staticmethod
+    def detectar_formato(filename: Optional[str], formato: Optional[str]) -> str:
+        """
+        Usa o formato informado ou deduz pela extensão do arquivo.
+
+        Raises:
+            HTTPException: Se o formato não for suportado
+        """
+        if not formato and filename:
+            extensao = filename.split('.')[-1].lower()
+            formato = "ndjson" if extensao in ("ndjson", "jsonl") else extensao
+
+        if formato not in ImportService.FORMATOS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Formato não suportado. Use: {', '.join(ImportService.FORMATOS)}"
+            )
+        return formato
+
+    @staticmethod
+    def ler_linhas(
+        arquivo: BinaryIO,
+        formato: str,
+        campos_json: Sequence[str] = ()
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Lê o arquivo linha a linha sem carregá-lo inteiro na memória.
+
+        Returns:
+            Iterador de (numero_linha, dados, erro)
+        """
+        texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+
+        if formato == "csv":
+            leitor = csv.DictReader(texto)
+            # Linha 1 é o cabeçalho
+            for numero, row in enumerate(leitor, start=2):
+                dados = {chave: valor for chave, valor in row.items() if chave and valor != ""}
+                try:
+                    # Colunas JSON chegam como texto no CSV
+                    for campo in campos_json:
+                        if campo in dados:
+                            dados[campo] = json.loads(dados[campo])
+                except json.JSONDecodeError as e:
+                    yield numero, None, f"JSON inválido em '{campo}': {e.msg}"
+                    continue
+                yield numero, dados, None
+        else:
+            for numero, linha in enumerate(texto, start=1):
+                if not linha.strip():
+                    continue
+                try:
+                    dados = json.loads(linha)
+                except json.JSONDecodeError as e:
+                    yield numero, None, f"JSON inválido: {e.msg}"
+                    continue
+                if not isinstance(dados, dict):
+                    yield numero, None, "Cada linha deve ser um objeto JSON"
+                    continue
+                yield numero, dados, None
+
+    @staticmethod
+    def _formatar_erro(erro: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(parte) for parte in e['loc'])}: {e['msg']}"
+            for e in erro.errors()
+        )
+
+    @staticmethod
+    def importar(
+        db: Session,
+        arquivo: BinaryIO,
+        formato: str,
+        schema: type[BaseModel],
+        model,
+        chave: str,
+        mensagem_duplicado: str,
+        campos_json: Sequence[str] = (),
+        validar_lote: Optional[Callable[[Session, List[LinhaValida]], Dict[int, str]]] = None,
+        apos_inserir: Optional[Callable[[Session, List[int]], None]] = None
+    ) -> ImportacaoResponse:
+        """
+        Importa o arquivo em lotes e retorna o resultado de cada linha.
+
+        Args:
+            schema: Schema Pydantic de criação (ex: ClienteCreate)
+            model: Modelo SQLAlchemy de destino
+            chave: Coluna única usada no ON CONFLICT (ex: "email")
+            mensagem_duplicado: Erro reportado quando a chave já existe
+            campos_json: Colunas JSON que chegam como texto no CSV
+            validar_lote: Validação extra por lote; retorna {linha: erro}
+            apos_inserir: Chamado com os ids criados no lote, antes do commit
+        """
+        resultados: List[LinhaImportacao] = []
+        linhas = ImportService.ler_linhas(arquivo, formato, campos_json)
+
+        while True:
+            lote = list(islice(linhas, ImportService.TAMANHO_LOTE))
+            if not lote:
+                break
+
+            validas: List[LinhaValida] = []
+            vistas = set()
+            for numero, dados, erro in lote:
+                if erro is None:
+                    try:
+                        dados = schema.model_validate(dados).model_dump()
+                    except ValidationError as e:
+                        erro = ImportService._formatar_erro(e)
+
+                if erro is None and dados.get(chave) is not None:
+                    # Duplicados dentro do próprio arquivo
+                    if dados[chave] in vistas:
+                        erro = mensagem_duplicado
+                    vistas.add(dados[chave])
+
+                if erro is not None:
+                    resultados.append(LinhaImportacao(linha=numero, status="erro", erro=erro))
+                else:
+                    validas.append((numero, dados))
+
+            if validar_lote and validas:
+                erros = validar_lote(db, validas)
+                for numero, erro in erros.items():
+                    resultados.append(LinhaImportacao(linha=numero, status="erro", erro=erro))
+                validas = [(numero, dados) for numero, dados in validas if numero not in erros]
+
+            if validas:
+                inseridos = ImportService._inserir_lote(db, model, chave, mensagem_duplicado, validas)
+                resultados.extend(inseridos)
+                if apos_inserir:
+                    apos_inserir(db, [r.id for r in inseridos if r.status == "criado"])
+            # Commit por lote: progresso preservado e transações curtas
+            db.commit()
+
+        resultados.sort(key=lambda r: r.linha)
+        criados = sum(1 for r in resultados if r.status == "criado")
+        return ImportacaoResponse(
+            total=len(resultados),
+            criados=criados,
+            erros=len(resultados) - criados,
+            linhas=resultados
+        )
+
+    @staticmethod
+    def _inserir_lote(
+        db: Session,
+        model,
+        chave: str,
+        mensagem_duplicado: str,
+        validas: List[LinhaValida]
+    ) -> List[LinhaImportacao]:
+        """
+        Grava o lote com INSERTs de várias linhas.
+
+        Linhas com a chave preenchida usam ON CONFLICT DO NOTHING e são
+        associadas ao id retornado pela própria chave; as demais (chave nula)
+        nunca conflitam e voltam na ordem dos parâmetros.
+        """
+        tabela = model.__table__
+        coluna_chave = tabela.c[chave]
+        resultados = []
+
+        com_chave = [(numero, dados) for numero, dados in validas if dados.get(chave) is not None]
+        sem_chave = [(numero, dados) for numero, dados in validas if dados.get(chave) is None]
+
+        if com_chave:
+            stmt = (
+                dialect_insert(tabela)
+                .on_conflict_do_nothing(index_elements=[coluna_chave])
+                .returning(tabela.c.id, coluna_chave)
+            )
+            inseridos = {
+                valor: id_
+                for id_, valor in db.execute(stmt, [dados for _, dados in com_chave])
+            }
+            for numero, dados in com_chave:
+                id_ = inseridos.get(dados[chave])
+                if id_ is None:
+                    resultados.append(LinhaImportacao(linha=numero, status="erro", erro=mensagem_duplicado))
+                else:
+                    resultados.append(LinhaImportacao(linha=numero, status="criado", id=id_))
+
+        if sem_chave:
+            stmt = dialect_insert(tabela).returning(tabela.c.id, sort_by_parameter_order=True)
+            ids = db.execute(stmt, [dados for _, dados in sem_chave]).scalars().all()
+            for (numero, _), id_ in zip(sem_chave, ids):
+                resultados.append(LinhaImportacao(linha=numero, status="criado", id=id_))
+
+        return resultados
@@ -1,12 +1,14 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
 import os
+from app.core import metricas
+from app.core.tempos import medir
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from reportlab.platypus import Table
 
 class PDFService:
     """
@@ -25,6 +27,14 @@ class PDFService:
         Returns:
             Caminho do arquivo PDF gerado
         """
+        # reportlab é pesado: importado só quando um PDF é gerado, não no boot
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import cm
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT
+        
         # Criar documento
         doc = SimpleDocTemplate(
             output_path,
@@ -131,14 +141,19 @@ class PDFService:
             elements.append(Paragraph(relatorio_data['observacoes'], styles['BodyText']))
         
         # Gerar PDF
-        doc.build(elements)
+        with medir("pdf"), metricas.PDF_SEGUNDOS.time():
+            doc.build(elements)
+        metricas.PDF_BYTES.observe(os.path.getsize(output_path))
         return output_path
     
     @staticmethod
-    def _criar_tabela_dinamica(dados_tabela: Dict[str, Any]) -> Table:
+    def _criar_tabela_dinamica(dados_tabela: Dict[str, Any]) -> "Table":
         """
         Cria tabela dinâmica para o PDF baseado na estrutura fornecida.
         """
+        from reportlab.lib import colors
+        from reportlab.platypus import Table, TableStyle
+        
         try:
             estrutura = dados_tabela.get('estrutura', {})
             dados = dados_tabela.get('dados', [])
@@ -177,5 +192,5 @@ class PDFService:
             return table
             
         except Exception as e:
-            print(f"Erro ao criar tabela dinâmica: {str(e)}")
+            logger.warning("pdf_tabela_invalida", extra={"motivo": str(e)})
             return None
\ No newline at end of file
@@ -0,0 +1,142 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.database import dialect_insert
+from app.models import Relatorio, RelatorioResumo
+
+# (dimensao, chave) -> variação no total
+Deltas = Dict[Tuple[str, str], int]
+
+# Colunas de Relatorio que alimentam o resumo
+COLUNAS_RESUMO = (Relatorio.status, Relatorio.cliente_id, Relatorio.produto_id, Relatorio.created_at)
+
+
+class ResumoService:
+    """
+    Serviço que mantém a tabela 'relatorios_resumo' do dashboard.
+
+    Cada escrita em relatórios aplica apenas a diferença (+1/-1) nas
+    dimensões afetadas, com um UPSERT que soma no próprio banco. Assim a
+    leitura do dashboard não depende do volume de relatórios.
+    """
+
+    @staticmethod
+    def chaves(
+        status: Optional[str],
+        cliente_id: int,
+        produto_id: int,
+        created_at: Optional[datetime]
+    ) -> Iterable[Tuple[str, str]]:
+        """Dimensões do resumo afetadas por um relatório"""
+        yield "status", status or "rascunho"
+        yield "cliente", str(cliente_id)
+        yield "produto", str(produto_id)
+        if created_at is not None:
+            yield "mes", created_at.strftime("%Y-%m")
+
+    @staticmethod
+    def _contar(linhas: Iterable[Sequence], sinal: int = 1) -> Counter:
+        deltas = Counter()
+        for status, cliente_id, produto_id, created_at in linhas:
+            for chave in ResumoService.chaves(status, cliente_id, produto_id, created_at):
+                deltas[chave] += sinal
+        return deltas
+
+    @staticmethod
+    def aplicar(db: Session, deltas: Deltas) -> None:
+        """Soma as variações na tabela de resumo com um único UPSERT"""
+        valores = [
+            {"dimensao": dimensao, "chave": chave, "total": total}
+            for (dimensao, chave), total in deltas.items()
+            if total
+        ]
+        # Em blocos, para respeitar o limite de parâmetros por comando
+        for inicio in range(0, len(valores), 1000):
+            stmt = dialect_insert(RelatorioResumo).values(valores[inicio:inicio + 1000])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[RelatorioResumo.dimensao, RelatorioResumo.chave],
+                set_={"total": RelatorioResumo.total + stmt.excluded.total}
+            )
+            db.execute(stmt)
+
+    @staticmethod
+    def ajustar(db: Session, antes: Optional[Sequence] = None, depois: Optional[Sequence] = None) -> None:
+        """
+        Registra a mudança de um relatório.
+
+        Args:
+            antes: (status, cliente_id, produto_id, created_at) antes da escrita, ou None ao criar
+            depois: os mesmos valores depois da escrita, ou None ao excluir
+        """
+        deltas = Counter()
+        if antes is not None:
+            deltas.update(ResumoService._contar([antes], -1))
+        if depois is not None:
+            deltas.update(ResumoService._contar([depois], 1))
+        ResumoService.aplicar(db, deltas)
+
+    @staticmethod
+    def valores(relatorio: Relatorio) -> Tuple:
+        """Extrai de um relatório os valores usados no resumo"""
+        return relatorio.status, relatorio.cliente_id, relatorio.produto_id, relatorio.created_at
+
+    @staticmethod
+    def contar_novos(db: Session, relatorio_ids: Sequence[int]) -> None:
+        """Soma ao resumo relatórios recém-inseridos em lote"""
+        if not relatorio_ids:
+            return
+        linhas = db.execute(select(*COLUNAS_RESUMO).where(Relatorio.id.in_(relatorio_ids)))
+        ResumoService.aplicar(db, ResumoService._contar(linhas))
+
+    @staticmethod
+    def excluir(db: Session, filtro) -> int:
+        """
+        Exclui os relatórios do filtro e os subtrai do resumo.
+
+        Os valores descontados vêm do próprio DELETE ... RETURNING: só conta
+        o que este comando apagou, então exclusões concorrentes da mesma
+        linha não a descontam duas vezes.
+
+        Returns:
+            Quantidade de relatórios excluídos
+        """
+        linhas = db.execute(
+            delete(Relatorio).where(filtro).returning(*COLUNAS_RESUMO),
+            execution_options={"synchronize_session": False}
+        ).all()
+        ResumoService.aplicar(db, ResumoService._contar(linhas, -1))
+        return len(linhas)
+
+    @staticmethod
+    def reconstruir(db: Session) -> int:
+        """
+        Recalcula o resumo do zero, lendo os relatórios em blocos.
+
+        Returns:
+            Quantidade de relatórios contados
+        """
+        linhas = db.execute(select(*COLUNAS_RESUMO).execution_options(yield_per=10000))
+        deltas = Counter()
+        total = 0
+        for bloco in linhas.partitions():
+            deltas.update(ResumoService._contar(bloco))
+            total += len(bloco)
+
+        db.execute(delete(RelatorioResumo))
+        ResumoService.aplicar(db, deltas)
+        db.commit()
+        return total
+
+    @staticmethod
+    def ler(db: Session) -> Dict[str, Dict[str, int]]:
+        """Lê o resumo agrupado por dimensão"""
+        resumo: Dict[str, Dict[str, int]] = {"status": {}, "cliente": {}, "produto": {}, "mes": {}}
+        linhas = db.execute(
+            select(RelatorioResumo.dimensao, RelatorioResumo.chave, RelatorioResumo.total)
+            .where(RelatorioResumo.total > 0)
+        )
+        for dimensao, chave, total in linhas:
+            resumo.setdefault(dimensao, {})[chave] = total
+        return resumo
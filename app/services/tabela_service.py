@@ -0,0 +1,106 @@
+from typing import Union
+from sqlalchemy import bindparam, text, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, and_
+from app.models import Relatorio
+
+# Operadores aceitos na consulta por célula
+OPERADORES_NUMERICOS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+OPERADORES = ("eq", "contem", *OPERADORES_NUMERICOS)
+
+# Linhas de 'dados' cruzadas com a posição da coluna em 'estrutura.colunas'.
+# Os CASE evitam erro em relatórios cujo JSON não segue o formato esperado.
+_CELULAS_POSTGRESQL = """
+    EXISTS (
+        SELECT 1
+        FROM jsonb_array_elements_text(
+                 CASE WHEN jsonb_typeof(relatorios.dados_tabela #> '{{estrutura,colunas}}') = 'array'
+                      THEN relatorios.dados_tabela #> '{{estrutura,colunas}}' ELSE '[]' END
+             ) WITH ORDINALITY AS coluna(nome, posicao),
+             jsonb_array_elements(
+                 CASE WHEN jsonb_typeof(relatorios.dados_tabela -> 'dados') = 'array'
+                      THEN relatorios.dados_tabela -> 'dados' ELSE '[]' END
+             ) AS linha(valores)
+        WHERE coluna.nome = :tabela_coluna
+          AND {condicao}
+    )
+"""
+_CELULA_POSTGRESQL = "(linha.valores ->> (coluna.posicao::int - 1))"
+# Número no início da célula: "75kg" -> 75, "12,5 mm" -> 12.5; NULL se não
+# começa com número
+_NUMERO_POSTGRESQL = (
+    f"CAST(replace(substring({_CELULA_POSTGRESQL} from '^\\s*(-?[0-9]+(?:[.,][0-9]+)?)'), ',', '.') AS numeric)"
+)
+
+_CELULAS_SQLITE = """
+    EXISTS (
+        SELECT 1
+        FROM json_each(relatorios.dados_tabela, '$.estrutura.colunas') AS coluna,
+             json_each(relatorios.dados_tabela, '$.dados') AS linha
+        WHERE coluna.value = :tabela_coluna
+          AND {condicao}
+    )
+"""
+_CELULA_SQLITE = (
+    "(CASE WHEN linha.type = 'array' "
+    "THEN json_extract(linha.value, '$[' || coluna.key || ']') END)"
+)
+# CAST de texto para REAL no SQLite lê o maior prefixo numérico ("75kg" ->
+# 75); o GLOB garante que a célula começa com número (senão daria 0)
+_NUMERO_SQLITE = (
+    f"CASE WHEN typeof({_CELULA_SQLITE}) IN ('integer', 'real') THEN {_CELULA_SQLITE} "
+    f"WHEN ltrim({_CELULA_SQLITE}) GLOB '[0-9]*' OR ltrim({_CELULA_SQLITE}) GLOB '-[0-9]*' "
+    f"THEN CAST(replace(ltrim({_CELULA_SQLITE}), ',', '.') AS REAL) END"
+)
+
+class TabelaService:
+    """
+    Serviço de consulta aos valores da tabela dinâmica dos relatórios.
+
+    O filtro é avaliado pelo próprio banco: no PostgreSQL sobre JSONB, com
+    o índice GIN de 'dados_tabela' restringindo antes os relatórios que
+    têm a coluna; no SQLite com json_each/json_extract.
+    """
+
+    @staticmethod
+    def filtro_celula(
+        db: Session,
+        coluna: str,
+        operador: str,
+        valor: Union[str, float]
+    ) -> ColumnElement[bool]:
+        """
+        Condição "alguma linha tem, na coluna informada, um valor que
+        satisfaz o operador".
+
+        Operadores numéricos (gt, gte, lt, lte) comparam o número no início
+        da célula, ignorando a unidade ("75kg", "12,5 mm"); células que não
+        começam com número ficam de fora;
+        'eq' compara o texto da célula e 'contem' busca um trecho dele.
+        """
+        postgresql = db.get_bind().dialect.name == "postgresql"
+        celula = _CELULA_POSTGRESQL if postgresql else _CELULA_SQLITE
+
+        if operador in OPERADORES_NUMERICOS:
+            numero = _NUMERO_POSTGRESQL if postgresql else _NUMERO_SQLITE
+            condicao = f"{numero} {OPERADORES_NUMERICOS[operador]} :tabela_valor"
+            parametro = bindparam("tabela_valor", float(valor))
+        elif operador == "contem":
+            condicao = f"CAST({celula} AS TEXT) {'ILIKE' if postgresql else 'LIKE'} :tabela_valor ESCAPE '\\'"
+            padrao = str(valor).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            parametro = bindparam("tabela_valor", f"%{padrao}%")
+        else:
+            condicao = f"CAST({celula} AS TEXT) = :tabela_valor"
+            parametro = bindparam("tabela_valor", str(valor))
+
+        sql = (_CELULAS_POSTGRESQL if postgresql else _CELULAS_SQLITE).format(condicao=condicao)
+        existe = text(sql).bindparams(bindparam("tabela_coluna", coluna), parametro)
+
+        if postgresql:
+            # Containment (@>) usa o índice GIN para descartar relatórios sem a coluna
+            tem_coluna = type_coerce(Relatorio.dados_tabela, JSONB).contains(
+                {"estrutura": {"colunas": [coluna]}}
+            )
+            return and_(tem_coluna, existe)
+        return existe
@@ -1,9 +1,14 @@
+import logging
 import os
+import shutil
 import uuid
 from typing import Tuple
 from fastapi import UploadFile, HTTPException
-from PIL import Image
 from app.config import settings
+from app.core import metricas
+from app.core.tempos import medir
+
+logger = logging.getLogger(__name__)
 
 class UploadService:
     """
@@ -29,6 +34,22 @@ class UploadService:
         nome_unico = f"{uuid.uuid4()}.{extensao}"
         return nome_unico
     
+    @staticmethod
+    def e_nome_gerado(nome_arquivo: str) -> bool:
+        """
+        Verifica se o nome segue o padrão de gerar_nome_unico (UUID com
+        extensão de imagem permitida), ou seja, se é uma foto enviada.
+        
+        Exemplo: a3f2b1c4-...-789012345678.jpg -> True; relatorio_X.pdf -> False
+        """
+        base, _, extensao = nome_arquivo.rpartition('.')
+        if extensao not in settings.ALLOWED_EXTENSIONS:
+            return False
+        try:
+            return str(uuid.UUID(base)) == base
+        except ValueError:
+            return False
+    
     @staticmethod
     async def salvar_imagem(file: UploadFile) -> Tuple[str, str, int]:
         """
@@ -67,10 +88,13 @@ class UploadService:
                 f.write(conteudo)
             
             # Otimizar imagem (reduzir tamanho mantendo qualidade)
-            UploadService.otimizar_imagem(caminho_completo)
+            with medir("imagem"), metricas.IMAGEM_SEGUNDOS.time():
+                UploadService.otimizar_imagem(caminho_completo)
             
             # Recalcular tamanho após otimização
             tamanho_final = os.path.getsize(caminho_completo)
+            metricas.IMAGEM_BYTES_ENTRADA.inc(tamanho)
+            metricas.IMAGEM_BYTES_SAIDA.inc(tamanho_final)
             
             return nome_arquivo, caminho_completo, tamanho_final
             
@@ -90,6 +114,9 @@ class UploadService:
             max_width: Largura máxima (mantém proporção)
             qualidade: Qualidade JPEG (1-100)
         """
+        # Pillow só é carregado no primeiro upload, não no boot
+        from PIL import Image
+        
         try:
             with Image.open(caminho) as img:
                 # Converter para RGB se necessário (PNG com transparência)
@@ -111,7 +138,33 @@ class UploadService:
         
         except Exception as e:
             # Se falhar a otimização, mantém arquivo original
-            print(f"Aviso: Não foi possível otimizar imagem: {str(e)}")
+            logger.warning("imagem_nao_otimizada", extra={"caminho": caminho, "motivo": str(e)})
+    
+    @staticmethod
+    def vincular_imagem(caminho_origem: str) -> Tuple[str, str]:
+        """
+        Cria um novo nome para uma imagem já salva, sem copiar os dados.
+        
+        Usa hard link: os dois nomes apontam para o mesmo conteúdo no disco
+        e o sistema de arquivos conta as referências (apagar um nome não
+        afeta o outro). Se o sistema de arquivos não suportar, copia.
+        
+        Returns:
+            Tuple com (nome_arquivo, caminho_completo) do novo nome
+        
+        Raises:
+            FileNotFoundError: Se a imagem de origem não existe
+        """
+        nome_arquivo = UploadService.gerar_nome_unico(caminho_origem)
+        caminho_completo = os.path.join(settings.UPLOAD_DIR, nome_arquivo)
+        try:
+            os.link(caminho_origem, caminho_completo)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            # Outro dispositivo ou sem suporte a hard links
+            shutil.copyfile(caminho_origem, caminho_completo)
+        return nome_arquivo, caminho_completo
     
     @staticmethod
     def deletar_imagem(caminho: str) -> bool:
@@ -127,5 +180,5 @@ class UploadService:
                 return True
             return False
         except Exception as e:
-            print(f"Erro ao deletar arquivo: {str(e)}")
+            logger.error("arquivo_nao_removido", extra={"caminho": caminho, "motivo": str(e)})
             return False
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Benchmark da serialização das respostas JSON.
+
+Compara, com os mesmos objetos ORM, o caminho padrão do FastAPI
+(schema -> dict -> json.dumps) com o caminho rápido usado pelas rotas
+(app.core.serializacao.resposta_json: bytes JSON direto do pydantic-core),
+e mede as requisições por segundo dos endpoints de listagem e detalhe.
+
+Usa um banco SQLite temporário (ou BENCHMARK_DATABASE_URL).
+Execute: python benchmark_serializacao.py
+"""
+
+import json
+import os
+import tempfile
+import time
+
+_pasta = tempfile.mkdtemp(prefix="benchmark_")
+os.environ["DATABASE_URL"] = os.environ.get("BENCHMARK_DATABASE_URL", f"sqlite:///{_pasta}/benchmark.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["DEBUG"] = "false"
+
+from typing import List
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from app.main import app
+from app.database import SessionLocal, init_db
+from app.models import Cliente, Produto, Relatorio
+from app.models.schemas import RelatorioResponse, RelatorioListResponse
+from app.core.serializacao import resposta_json
+
+RELATORIOS = 100
+LINHAS_TABELA = 500
+REPETICOES = 20
+
+
+def popular():
+    """Cria relatórios com tabelas dinâmicas grandes"""
+    db = SessionLocal()
+    cliente = Cliente(nome="Benchmark", email="benchmark@example.com")
+    produto = Produto(nome="Sensor", codigo="BENCH-1", template_tabela={"colunas": ["Medida", "Valor", "Status"]})
+    db.add_all([cliente, produto])
+    db.flush()
+    for i in range(RELATORIOS):
+        db.add(Relatorio(
+            codigo_pedido=f"BENCH-{i:05d}",
+            titulo=f"Relatório de inspeção {i}",
+            descricao="Inspeção periódica " * 20,
+            cliente_id=cliente.id,
+            produto_id=produto.id,
+            dados_tabela={
+                "estrutura": {"colunas": ["Medida", "Valor", "Status"]},
+                "dados": [[f"{n}mm", n * 1.5, "ok"] for n in range(LINHAS_TABELA)],
+            },
+        ))
+    db.commit()
+    db.close()
+
+
+def cronometrar(funcao) -> float:
+    """Melhor tempo (ms) entre as repetições"""
+    melhor = float("inf")
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def caminho_padrao(tipo, dados) -> bytes:
+    """O que o FastAPI faz com response_model: dict em modo JSON + json.dumps"""
+    adaptador = TypeAdapter(tipo)
+    conteudo = adaptador.dump_python(adaptador.validate_python(dados, from_attributes=True), mode="json")
+    return json.dumps(conteudo, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def caminho_rapido(tipo, dados) -> bytes:
+    return resposta_json(tipo, dados).body
+
+
+def comparar(nome: str, tipo, dados):
+    padrao = cronometrar(lambda: caminho_padrao(tipo, dados))
+    rapido = cronometrar(lambda: caminho_rapido(tipo, dados))
+    tamanho = len(caminho_rapido(tipo, dados)) / 1024
+    print(f"   {nome:<32} padrão {padrao:8.2f} ms | rápido {rapido:8.2f} ms | {padrao / rapido:4.1f}x | {tamanho:,.0f} KiB")
+
+
+def medir_endpoint(client: TestClient, url: str):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        resposta = client.get(url)
+        assert resposta.status_code == 200, resposta.text
+    total = time.perf_counter() - inicio
+    print(f"   GET {url:<28} {REPETICOES / total:8.1f} req/s")
+
+
+def executar():
+    print("=" * 60)
+    print("⏱️  BENCHMARK DE SERIALIZAÇÃO")
+    print("=" * 60)
+
+    init_db()
+    popular()
+
+    db = SessionLocal()
+    relatorios = db.scalars(select(Relatorio).order_by(Relatorio.id)).all()
+    detalhe = relatorios[0]
+    # Carrega os relacionamentos antes de medir (só a serialização conta)
+    for relatorio in relatorios:
+        relatorio.cliente, relatorio.produto, relatorio.fotos
+
+    print(f"\n📦 Serialização ({RELATORIOS} relatórios, {LINHAS_TABELA} linhas de tabela cada):")
+    comparar("detalhe (RelatorioResponse)", RelatorioResponse, detalhe)
+    comparar("lista completa", List[RelatorioResponse], relatorios)
+    comparar("lista resumida", List[RelatorioListResponse], relatorios)
+    db.close()
+
+    print("\n🌐 Endpoints:")
+    with TestClient(app) as client:
+        medir_endpoint(client, f"/relatorios/{detalhe.id}")
+        medir_endpoint(client, "/relatorios/?limit=100")
+        medir_endpoint(client, "/produtos/")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    executar()
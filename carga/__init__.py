@@ -0,0 +1,21 @@
+"""
+Testes de carga de ponta a ponta.
+
+1. Popular um banco local (vazio, com 'alembic upgrade head' aplicado)
+   com dados sintéticos na escala desejada:
+
+       python -m carga.popular --clientes 10000 --relatorios 1000000 --fotos 5000000
+
+2. Rodar a mistura de tráfego (login, CRUD, listagens, busca, upload,
+   PDF) contra um uvicorn local, iniciado pelo próprio script ou já no ar:
+
+       python -m carga.executar --iniciar-servidor --workers 4 --duracao 120
+       python -m carga.executar --url http://127.0.0.1:8000
+
+   Ao final, mostra p50/p95/p99 e vazão por endpoint e grava em
+   carga/resultados/<data>/ o resultado (resultados.json) e os planos
+   (EXPLAIN) das consultas principais, comparados com os da execução
+   anterior: uma mudança de plano aparece como diff no console.
+
+Use sempre o mesmo --semente e a mesma escala para comparar execuções.
+"""
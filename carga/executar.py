@@ -0,0 +1,371 @@
+"""
+Executa a mistura de tráfego contra um uvicorn local e mede a latência.
+
+Cada usuário virtual faz login, cria um relatório de trabalho (destino dos
+uploads) e, até o fim da duração, sorteia cenários pelos pesos da mistura:
+listagens com filtros, detalhes, busca, dashboard, login, CRUD de
+relatório, upload de foto e PDF. As requisições do aquecimento não entram
+nas estatísticas.
+
+Precisa do conjunto de dados de carga (python -m carga.popular) no banco
+de DATABASE_URL, o mesmo usado pelo servidor.
+Execute: python -m carga.executar --iniciar-servidor --workers 4 --duracao 120
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import httpx
+from sqlalchemy import func, select
+from app.database import engine
+from app.models import Cliente, Produto, Relatorio
+from app.models.users import User
+from carga import planos
+from carga.popular import EQUIPAMENTOS, SENHA, SERVICOS, STATUS, usuario_email
+
+RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+# Pesos dos cenários em cada mistura
+MISTURAS = {
+    "padrao": {
+        "listar_relatorios": 25, "detalhe_relatorio": 20, "fotos_relatorio": 8, "busca": 8,
+        "listar_clientes": 6, "detalhe_cliente": 5, "dashboard": 5, "login": 5,
+        "crud_relatorio": 8, "upload_foto": 6, "pdf": 4,
+    },
+    "leitura": {
+        "listar_relatorios": 35, "detalhe_relatorio": 30, "fotos_relatorio": 10, "busca": 10,
+        "listar_clientes": 5, "detalhe_cliente": 5, "dashboard": 5,
+    },
+    "escrita": {"crud_relatorio": 50, "upload_foto": 30, "login": 20},
+}
+
+
+def nova_pasta() -> str:
+    pasta = os.path.join(RESULTADOS, datetime.now().strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(pasta, exist_ok=True)
+    return pasta
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por posição (nearest-rank) de uma lista já ordenada"""
+    if not ordenados:
+        return 0.0
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+
+def conjunto_de_dados() -> Dict[str, int]:
+    """Tamanho do conjunto de carga no banco (ids vão de 1 ao máximo)"""
+    with engine.connect() as conn:
+        dados = {
+            "clientes": conn.scalar(select(func.max(Cliente.id))) or 0,
+            "produtos": conn.scalar(select(func.max(Produto.id))) or 0,
+            # Sem os criados (e apagados) pelas execuções anteriores
+            "relatorios": conn.scalar(
+                select(func.max(Relatorio.id)).where(~Relatorio.codigo_pedido.like("CARGA-RUN-%"))
+            ) or 0,
+            "usuarios": conn.scalar(
+                select(func.count()).select_from(User).where(User.email.like("carga%@example.com"))
+            ) or 0,
+        }
+    if not dados["relatorios"] or not dados["usuarios"]:
+        print("❌ Banco sem dados de carga; rode antes: python -m carga.popular")
+        sys.exit(1)
+    return dados
+
+
+def imagem_de_upload() -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (90, 120, 150)).save(buffer, "JPEG", quality=80)
+    return buffer.getvalue()
+
+
+class Medicoes:
+    """Latências e erros por endpoint"""
+
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.erros: Dict[str, int] = defaultdict(int)
+        self.ativo = False
+
+    def registrar(self, endpoint: str, segundos: float, erro: bool) -> None:
+        if not self.ativo:
+            return
+        self.latencias[endpoint].append(segundos)
+        if erro:
+            self.erros[endpoint] += 1
+
+    def resumo(self, duracao: float) -> Dict[str, dict]:
+        resultado = {}
+        for endpoint in sorted(self.latencias):
+            ordenados = sorted(self.latencias[endpoint])
+            resultado[endpoint] = {
+                "requisicoes": len(ordenados),
+                "erros": self.erros.get(endpoint, 0),
+                "rps": round(len(ordenados) / duracao, 1),
+                "p50_ms": round(percentil(ordenados, 50) * 1000, 1),
+                "p95_ms": round(percentil(ordenados, 95) * 1000, 1),
+                "p99_ms": round(percentil(ordenados, 99) * 1000, 1),
+                "max_ms": round(ordenados[-1] * 1000, 1),
+            }
+        return resultado
+
+
+class UsuarioVirtual:
+    def __init__(self, numero: int, client: httpx.AsyncClient, medicoes: Medicoes,
+                 dados: Dict[str, int], semente: int, execucao: str, upload: bytes):
+        self.numero = numero
+        self.client = client
+        self.medicoes = medicoes
+        self.dados = dados
+        self.rnd = random.Random(semente * 1000 + numero)
+        self.execucao = execucao
+        self.upload = upload
+        self.criados = 0
+        self.token: Optional[str] = None
+        self.relatorio_trabalho: Optional[int] = None
+
+    async def requisitar(self, endpoint: str, metodo: str, url: str, esperado=(200,), **kwargs) -> Optional[httpx.Response]:
+        inicio = time.perf_counter()
+        try:
+            resposta = await self.client.request(metodo, url, **kwargs)
+        except httpx.HTTPError:
+            self.medicoes.registrar(endpoint, time.perf_counter() - inicio, True)
+            return None
+        self.medicoes.registrar(endpoint, time.perf_counter() - inicio, resposta.status_code not in esperado)
+        return resposta if resposta.status_code in esperado else None
+
+    def _id(self, tabela: str) -> int:
+        return self.rnd.randint(1, self.dados[tabela])
+
+    def _novo_relatorio(self) -> dict:
+        self.criados += 1
+        return {
+            "codigo_pedido": f"CARGA-RUN-{self.execucao}-{self.numero}-{self.criados}",
+            "cliente_id": self._id("clientes"),
+            "produto_id": self._id("produtos"),
+            "titulo": f"{self.rnd.choice(SERVICOS)} {self.rnd.choice(EQUIPAMENTOS)}",
+            "dados_tabela": {"estrutura": {"colunas": ["Medida", "Valor"]}, "dados": [["10mm", 1.5]]},
+        }
+
+    # =============== PREPARAÇÃO ===============
+
+    async def preparar(self) -> None:
+        await self.login()
+        resposta = await self.requisitar("POST /relatorios/", "POST", "/relatorios/",
+                                         esperado=(201,), json=self._novo_relatorio())
+        if resposta is not None:
+            self.relatorio_trabalho = resposta.json()["id"]
+
+    async def encerrar(self) -> None:
+        if self.relatorio_trabalho is not None:
+            await self.client.delete(f"/relatorios/{self.relatorio_trabalho}")
+
+    # =============== CENÁRIOS ===============
+
+    async def login(self) -> None:
+        email = usuario_email(self._id("usuarios"))
+        resposta = await self.requisitar("POST /auth/login", "POST", "/auth/login",
+                                         json={"email": email, "password": SENHA})
+        if resposta is not None:
+            self.token = resposta.json()["access_token"]
+            await self.requisitar("GET /auth/me", "GET", "/auth/me",
+                                  headers={"Authorization": f"Bearer {self.token}"})
+
+    async def listar_relatorios(self) -> None:
+        params = {"skip": self.rnd.choice([0, 0, 0, 50, 100, 1000]), "limit": 50}
+        filtro = self.rnd.random()
+        if filtro < 0.2:
+            params["status_filtro"] = self.rnd.choice(STATUS)
+        elif filtro < 0.4:
+            params["cliente_id"] = self._id("clientes")
+        elif filtro < 0.5:
+            params["produto_id"] = self._id("produtos")
+            params["criado_de"] = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat()
+        await self.requisitar("GET /relatorios/", "GET", "/relatorios/", params=params)
+
+    async def detalhe_relatorio(self) -> None:
+        await self.requisitar("GET /relatorios/{id}", "GET", f"/relatorios/{self._id('relatorios')}")
+
+    async def fotos_relatorio(self) -> None:
+        await self.requisitar("GET /relatorios/{id}/fotos", "GET", f"/relatorios/{self._id('relatorios')}/fotos")
+
+    async def busca(self) -> None:
+        termo = f"{self.rnd.choice(EQUIPAMENTOS)} {self.rnd.choice(SERVICOS)}".lower()
+        await self.requisitar("GET /relatorios/busca", "GET", "/relatorios/busca", params={"q": termo, "limit": 20})
+
+    async def listar_clientes(self) -> None:
+        skip = self.rnd.randint(0, max(0, self.dados["clientes"] - 100))
+        await self.requisitar("GET /clientes/", "GET", "/clientes/", params={"skip": skip, "limit": 100})
+
+    async def detalhe_cliente(self) -> None:
+        await self.requisitar("GET /clientes/{id}", "GET", f"/clientes/{self._id('clientes')}")
+
+    async def dashboard(self) -> None:
+        await self.requisitar("GET /dashboard/", "GET", "/dashboard/")
+
+    async def crud_relatorio(self) -> None:
+        resposta = await self.requisitar("POST /relatorios/", "POST", "/relatorios/",
+                                         esperado=(201,), json=self._novo_relatorio())
+        if resposta is None:
+            return
+        relatorio_id = resposta.json()["id"]
+        await self.requisitar("PUT /relatorios/{id}", "PUT", f"/relatorios/{relatorio_id}",
+                              json={"status": self.rnd.choice(STATUS)})
+        await self.requisitar("DELETE /relatorios/{id}", "DELETE", f"/relatorios/{relatorio_id}", esperado=(204,))
+
+    async def upload_foto(self) -> None:
+        if self.relatorio_trabalho is None:
+            return
+        await self.requisitar(
+            "POST /relatorios/{id}/fotos", "POST", f"/relatorios/{self.relatorio_trabalho}/fotos",
+            esperado=(201,), files={"file": ("carga.jpg", self.upload, "image/jpeg")},
+        )
+
+    async def pdf(self) -> None:
+        await self.requisitar("GET /relatorios/{id}/pdf", "GET", f"/relatorios/{self._id('relatorios')}/pdf")
+
+    async def executar(self, mistura: Dict[str, int], fim: float) -> None:
+        cenarios = [getattr(self, nome) for nome in mistura]
+        pesos = list(mistura.values())
+        while time.monotonic() < fim:
+            await self.rnd.choices(cenarios, pesos)[0]()
+
+
+def iniciar_servidor(porta: int, workers: int) -> subprocess.Popen:
+    ambiente = {**os.environ, "DEBUG": "false", "SERVER_TIMING_LOG": "false"}
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(porta),
+         "--workers", str(workers), "--no-access-log", "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=ambiente,
+    )
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        try:
+            if httpx.get(f"http://127.0.0.1:{porta}/health", timeout=1).status_code == 200:
+                return processo
+        except httpx.HTTPError:
+            pass
+        if processo.poll() is not None:
+            break
+        time.sleep(0.5)
+    processo.terminate()
+    print("❌ O servidor não respondeu em /health")
+    sys.exit(1)
+
+
+async def carregar(url: str, usuarios: int, duracao: float, aquecimento: float,
+                   mistura: Dict[str, int], dados: Dict[str, int], semente: int) -> Medicoes:
+    medicoes = Medicoes()
+    execucao = datetime.now().strftime("%H%M%S")
+    upload = imagem_de_upload()
+    limites = httpx.Limits(max_connections=usuarios, max_keepalive_connections=usuarios)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limites) as client:
+        virtuais = [UsuarioVirtual(n, client, medicoes, dados, semente, execucao, upload) for n in range(usuarios)]
+        await asyncio.gather(*(virtual.preparar() for virtual in virtuais))
+
+        inicio = time.monotonic()
+        fim = inicio + aquecimento + duracao
+
+        async def medir_depois_do_aquecimento():
+            await asyncio.sleep(aquecimento)
+            medicoes.ativo = True
+
+        await asyncio.gather(medir_depois_do_aquecimento(), *(virtual.executar(mistura, fim) for virtual in virtuais))
+        medicoes.ativo = False
+        await asyncio.gather(*(virtual.encerrar() for virtual in virtuais))
+    return medicoes
+
+
+def mostrar(endpoints: Dict[str, dict]) -> None:
+    print(f"\n   {'endpoint':<32} {'req':>7} {'erros':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'máx':>8}")
+    for endpoint, e in endpoints.items():
+        print(f"   {endpoint:<32} {e['requisicoes']:>7} {e['erros']:>6} {e['rps']:>7} "
+              f"{e['p50_ms']:>8} {e['p95_ms']:>8} {e['p99_ms']:>8} {e['max_ms']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga de ponta a ponta")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--iniciar-servidor", action="store_true", help="sobe um uvicorn local para o teste")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--usuarios", type=int, default=50, help="usuários virtuais simultâneos")
+    parser.add_argument("--duracao", type=float, default=60, help="segundos medidos")
+    parser.add_argument("--aquecimento", type=float, default=5, help="segundos descartados no início")
+    parser.add_argument("--mistura", choices=sorted(MISTURAS), default="padrao")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--analisar", action="store_true", help="EXPLAIN ANALYZE nos planos (PostgreSQL)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏋️  TESTE DE CARGA")
+    print("=" * 60)
+
+    dados = conjunto_de_dados()
+    print(f"   dados: {dados}")
+    servidor = None
+    url = args.url
+    if args.iniciar_servidor:
+        servidor = iniciar_servidor(args.porta, args.workers)
+        url = f"http://127.0.0.1:{args.porta}"
+    print(f"   {url}: {args.usuarios} usuários, mistura '{args.mistura}', {args.duracao:.0f}s "
+          f"(+{args.aquecimento:.0f}s de aquecimento)")
+
+    try:
+        medicoes = asyncio.run(carregar(url, args.usuarios, args.duracao, args.aquecimento,
+                                        MISTURAS[args.mistura], dados, args.semente))
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait()
+
+    endpoints = medicoes.resumo(args.duracao)
+    todas = sorted(latencia for latencias in medicoes.latencias.values() for latencia in latencias)
+    total = {
+        "requisicoes": len(todas),
+        "erros": sum(medicoes.erros.values()),
+        "rps": round(len(todas) / args.duracao, 1),
+        "p50_ms": round(percentil(todas, 50) * 1000, 1),
+        "p95_ms": round(percentil(todas, 95) * 1000, 1),
+        "p99_ms": round(percentil(todas, 99) * 1000, 1),
+    }
+    mostrar(endpoints)
+    print(f"\n   total: {total['requisicoes']} requisições, {total['rps']} req/s, "
+          f"p50 {total['p50_ms']} ms, p95 {total['p95_ms']} ms, p99 {total['p99_ms']} ms, {total['erros']} erros")
+
+    pasta = nova_pasta()
+    with open(os.path.join(pasta, "resultados.json"), "w", encoding="utf-8") as arquivo:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "banco": engine.dialect.name,
+            "parametros": {**vars(args), "url": url},
+            "dados": dados,
+            "total": total,
+            "endpoints": endpoints,
+        }, arquivo, ensure_ascii=False, indent=2)
+
+    print("\n🗺️  Planos das consultas principais")
+    capturados = planos.capturar(pasta, args.analisar)
+    anterior = planos.execucao_anterior(RESULTADOS, pasta)
+    planos.mostrar_mudancas(planos.comparar(capturados, anterior), anterior)
+
+    print("\n" + "=" * 60)
+    print(f"📁 Resultados em {pasta}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
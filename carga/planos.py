@@ -0,0 +1,152 @@
+"""
+Planos de execução (EXPLAIN) das consultas principais.
+
+Grava um arquivo por consulta na pasta da execução e compara com a pasta
+da execução anterior. Custos, linhas estimadas e tempos são ignorados na
+comparação: só a forma do plano (tipo de scan, índices, joins, ordenação)
+conta como mudança.
+
+Execute sozinho: python -m carga.planos [--analisar]
+"""
+
+import argparse
+import difflib
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+from app.database import engine
+from app.models import Cliente, Foto, Relatorio, RelatorioResumo
+from app.models.users import User
+from app.routes.relatorios import filtrar_relatorios
+from carga.popular import usuario_email
+
+
+def consultas() -> Dict[str, object]:
+    """Consultas das rotas mais usadas, com parâmetros típicos do conjunto de carga"""
+    recente = datetime.now(timezone.utc) - timedelta(days=30)
+    return {
+        "relatorios_recentes": filtrar_relatorios(select(Relatorio)).limit(50),
+        "relatorios_pagina_profunda": filtrar_relatorios(select(Relatorio)).offset(10000).limit(50),
+        "relatorios_por_status": filtrar_relatorios(select(Relatorio), status_filtro="aprovado").limit(50),
+        "relatorios_por_cliente": filtrar_relatorios(select(Relatorio), cliente_id=1).limit(50),
+        "relatorios_por_produto_periodo": filtrar_relatorios(
+            select(Relatorio), produto_id=1, criado_de=recente
+        ).limit(50),
+        "relatorios_ultimos_30_dias": filtrar_relatorios(select(Relatorio), criado_de=recente).limit(50),
+        "fotos_do_relatorio": select(Foto).where(Foto.relatorio_id == 1).order_by(Foto.ordem),
+        "proxima_ordem_foto": select(func.max(Foto.ordem)).where(Foto.relatorio_id == 1),
+        "clientes_paginados": select(Cliente).order_by(Cliente.id).offset(5000).limit(100),
+        "resumo_dashboard": select(RelatorioResumo).where(RelatorioResumo.total > 0),
+        "login": select(User).where(User.email == usuario_email(1)),
+    }
+
+
+def explicar(connection: Connection, stmt, analisar: bool = False) -> str:
+    """Plano da consulta como texto (EXPLAIN QUERY PLAN no SQLite)"""
+    compiled = stmt.compile(dialect=connection.dialect)
+    params = compiled.construct_params()
+    processadores = compiled._bind_processors
+    params = {nome: processadores[nome](valor) if nome in processadores else valor for nome, valor in params.items()}
+    if compiled.positional:
+        params = tuple(params[nome] for nome in compiled.positiontup)
+
+    if connection.dialect.name == "sqlite":
+        linhas = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+        return "\n".join(linha[-1] for linha in linhas)
+
+    opcoes = "ANALYZE, BUFFERS" if analisar else "COSTS"
+    linhas = connection.exec_driver_sql(f"EXPLAIN ({opcoes}) {compiled}", params).fetchall()
+    return "\n".join(linha[0] for linha in linhas)
+
+
+def _forma(plano: str) -> List[str]:
+    """Plano sem números de custo/tempo nem literais, para comparar entre execuções"""
+    linhas = []
+    for linha in plano.splitlines():
+        # Linhas que só o EXPLAIN ANALYZE mostra (medidas da execução)
+        if re.match(r"\s*(Planning|Execution|Buffers|JIT|Sort Method|Full-sort Groups|Pre-sorted Groups"
+                    r"|Heap Blocks|Heap Fetches|Rows Removed|Memory Usage|Batches|Worker)", linha):
+            continue
+        linha = re.sub(r"\s*\((cost|actual)[^)]*\)", "", linha)
+        # Literais (datas relativas a agora) variam a cada execução
+        linha = re.sub(r"'[^']*'", "'?'", linha)
+        linhas.append(linha.rstrip())
+    return linhas
+
+
+def _subpasta() -> str:
+    """planos_sqlite, planos_postgresql: só compara execuções no mesmo banco"""
+    return f"planos_{engine.dialect.name}"
+
+
+def capturar(pasta: str, analisar: bool = False) -> Dict[str, str]:
+    """Grava <pasta>/planos_<banco>/<consulta>.txt e retorna os planos"""
+    destino = os.path.join(pasta, _subpasta())
+    os.makedirs(destino, exist_ok=True)
+    planos = {}
+    with engine.connect() as connection:
+        for nome, stmt in consultas().items():
+            with connection.begin():
+                planos[nome] = explicar(connection, stmt, analisar)
+            with open(os.path.join(destino, f"{nome}.txt"), "w", encoding="utf-8") as arquivo:
+                arquivo.write(planos[nome] + "\n")
+    return planos
+
+
+def comparar(planos: Dict[str, str], pasta_anterior: Optional[str]) -> List[Tuple[str, str]]:
+    """(consulta, diff) das consultas cujo plano mudou desde a execução anterior"""
+    if not pasta_anterior:
+        return []
+    mudancas = []
+    for nome, plano in planos.items():
+        caminho = os.path.join(pasta_anterior, _subpasta(), f"{nome}.txt")
+        if not os.path.exists(caminho):
+            continue
+        with open(caminho, encoding="utf-8") as arquivo:
+            anterior = arquivo.read()
+        if _forma(anterior) != _forma(plano):
+            diff = difflib.unified_diff(_forma(anterior), _forma(plano), "anterior", "atual", lineterm="")
+            mudancas.append((nome, "\n".join(diff)))
+    return mudancas
+
+
+def execucao_anterior(raiz: str, atual: str) -> Optional[str]:
+    """Pasta da execução mais recente antes de `atual` no mesmo banco (nomes ordenados por data)"""
+    if not os.path.isdir(raiz):
+        return None
+    anteriores = sorted(
+        nome for nome in os.listdir(raiz)
+        if nome < os.path.basename(atual) and os.path.isdir(os.path.join(raiz, nome, _subpasta()))
+    )
+    return os.path.join(raiz, anteriores[-1]) if anteriores else None
+
+
+def mostrar_mudancas(mudancas: List[Tuple[str, str]], pasta_anterior: Optional[str]) -> None:
+    if not pasta_anterior:
+        print("   (primeira execução: nada para comparar)")
+    elif not mudancas:
+        print(f"   ✅ nenhum plano mudou desde {os.path.basename(pasta_anterior)}")
+    for nome, diff in mudancas:
+        print(f"   ⚠️  plano de {nome} mudou:")
+        print("      " + diff.replace("\n", "\n      "))
+
+
+def main():
+    from carga.executar import RESULTADOS, nova_pasta
+
+    parser = argparse.ArgumentParser(description="Planos (EXPLAIN) das consultas principais")
+    parser.add_argument("--analisar", action="store_true", help="EXPLAIN ANALYZE (PostgreSQL; executa as consultas)")
+    args = parser.parse_args()
+
+    pasta = nova_pasta()
+    planos = capturar(pasta, args.analisar)
+    anterior = execucao_anterior(RESULTADOS, pasta)
+    print(f"🗺️  {len(planos)} planos gravados em {pasta}")
+    mostrar_mudancas(comparar(planos, anterior), anterior)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Gera o conjunto de dados sintético dos testes de carga.
+
+Insere clientes, produtos, usuários, relatórios e fotos em lotes (COPY no
+PostgreSQL, executemany no SQLite) e depois reconstrói o índice de busca
+e o resumo do dashboard. Com a mesma --semente o conjunto é sempre igual.
+
+As fotos apontam para poucas imagens de amostra pequenas gravadas em
+UPLOAD_DIR (milhões de registros, alguns arquivos).
+
+O banco precisa estar vazio e com o schema aplicado (alembic upgrade head).
+Execute: python -m carga.popular --clientes 10000 --relatorios 1000000 --fotos 5000000
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.engine import Connection
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Cliente, Foto, Produto, Relatorio
+from app.models.users import User
+
+# Login dos usuários criados: carga<n>@example.com / SENHA
+SENHA = "carga-senha-123"
+AMOSTRAS = 8
+
+STATUS = ["rascunho", "concluido", "aprovado"]
+SERVICOS = ["Inspeção", "Manutenção", "Calibração", "Ensaio", "Vistoria"]
+EQUIPAMENTOS = ["bomba", "motor", "válvula", "sensor", "compressor", "redutor", "painel", "trocador"]
+LOCAIS = ["linha 1", "linha 2", "subestação", "caldeira", "torre de resfriamento", "almoxarifado"]
+CATEGORIAS = ["Elétrica", "Mecânica", "Instrumentação", "Hidráulica"]
+COLUNAS = ["Medida", "Valor", "Unidade", "Status"]
+
+
+def usuario_email(n: int) -> str:
+    return f"carga{n}@example.com"
+
+
+def _lotes(total: int, tamanho: int, gerar: Callable[[int], Dict]) -> Iterator[List[Dict]]:
+    """Linhas 1..total em listas de `tamanho`"""
+    for inicio in range(1, total + 1, tamanho):
+        yield [gerar(i) for i in range(inicio, min(inicio + tamanho, total + 1))]
+
+
+def _valor_csv(valor):
+    if valor is None:
+        return None  # campo vazio sem aspas = NULL no COPY
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, ensure_ascii=False)
+    return valor
+
+
+def _inserir(conn: Connection, tabela: Table, linhas: List[Dict]) -> None:
+    if conn.dialect.name != "postgresql":
+        conn.execute(insert(tabela), linhas)
+        return
+
+    # COPY é bem mais rápido que INSERT em milhões de linhas
+    colunas = list(linhas[0])
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    for linha in linhas:
+        escritor.writerow([_valor_csv(linha[coluna]) for coluna in colunas])
+    buffer.seek(0)
+    cursor = conn.connection.dbapi_connection.cursor()
+    cursor.copy_expert(f"COPY {tabela.name} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _carregar(nome: str, tabela: Table, total: int, tamanho_lote: int, gerar: Callable[[int], Dict]) -> None:
+    if total <= 0:
+        return
+    inicio = time.perf_counter()
+    feitos = 0
+    proximo_aviso = 0.1
+    for linhas in _lotes(total, tamanho_lote, gerar):
+        with engine.begin() as conn:
+            _inserir(conn, tabela, linhas)
+        feitos += len(linhas)
+        if feitos / total >= proximo_aviso or feitos == total:
+            proximo_aviso += 0.1
+            decorrido = time.perf_counter() - inicio
+            print(f"   {nome}: {feitos:,}/{total:,} ({feitos / decorrido:,.0f} linhas/s)")
+
+
+def _gravar_amostras() -> List[str]:
+    """Imagens JPEG pequenas em UPLOAD_DIR, compartilhadas pelas fotos"""
+    from PIL import Image
+
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+    nomes = []
+    for n in range(AMOSTRAS):
+        nome = f"carga_amostra_{n}.jpg"
+        cor = ((n * 53) % 256, (n * 97) % 256, (n * 151) % 256)
+        Image.new("RGB", (320, 240), cor).save(os.path.join(settings.UPLOAD_DIR, nome), "JPEG", quality=70)
+        nomes.append(nome)
+    return nomes
+
+
+def _ajustar_sequencias() -> None:
+    """Os ids foram inseridos explicitamente: avança as sequências do PostgreSQL"""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for tabela in ("clientes", "produtos", "users", "relatorios", "fotos"):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), "
+                f"coalesce((SELECT max(id) FROM {tabela}), 0) + 1, false)"
+            ))
+
+
+def popular(clientes: int, produtos: int, usuarios: int, relatorios: int, fotos: int,
+            tamanho_lote: int, semente: int) -> None:
+    with engine.connect() as conn:
+        existentes = conn.scalar(select(func.count()).select_from(Relatorio.__table__))
+        existentes += conn.scalar(select(func.count()).select_from(Cliente.__table__))
+    if existentes:
+        print("❌ O banco já tem dados; use um banco vazio (alembic upgrade head)")
+        sys.exit(1)
+
+    rnd = random.Random(semente)
+    agora = datetime.now(timezone.utc)
+    inicio = time.perf_counter()
+
+    from app.core.security import get_password_hash
+    senha_hash = get_password_hash(SENHA)
+    amostras = _gravar_amostras()
+
+    print(f"📦 Populando {engine.url.render_as_string(hide_password=True)}")
+    _carregar("usuários", User.__table__, usuarios, tamanho_lote, lambda i: {
+        "id": i,
+        "email": usuario_email(i),
+        "hashed_password": senha_hash,
+        "full_name": f"Usuário de carga {i}",
+        "is_active": True,
+        "is_verified": True,
+        "is_superuser": False,
+    })
+    _carregar("clientes", Cliente.__table__, clientes, tamanho_lote, lambda i: {
+        "id": i,
+        "nome": f"Cliente {i} {rnd.choice(LOCAIS).title()}",
+        "email": f"cliente{i}@carga.example.com",
+        "created_at": agora - timedelta(days=rnd.uniform(365, 1095)),
+    })
+    _carregar("produtos", Produto.__table__, produtos, tamanho_lote, lambda i: {
+        "id": i,
+        "nome": f"{rnd.choice(EQUIPAMENTOS).title()} modelo {i}",
+        "codigo": f"CARGA-P{i:05d}",
+        "descricao": None,
+        "categoria": rnd.choice(CATEGORIAS),
+        "template_tabela": {"colunas": COLUNAS},
+        "created_at": agora - timedelta(days=rnd.uniform(365, 1095)),
+    })
+
+    def relatorio(i: int) -> Dict:
+        equipamento = rnd.choice(EQUIPAMENTOS)
+        return {
+            "id": i,
+            "codigo_pedido": f"CARGA-{i:08d}",
+            "titulo": f"{rnd.choice(SERVICOS)} {equipamento} {rnd.choice(LOCAIS)}",
+            "descricao": f"Relatório técnico de {equipamento} gerado para teste de carga.",
+            "observacoes": None,
+            "cliente_id": rnd.randint(1, clientes),
+            "produto_id": rnd.randint(1, produtos),
+            "dados_tabela": {
+                "estrutura": {"colunas": COLUNAS},
+                "dados": [
+                    [f"{n * 10}mm", round(rnd.uniform(0, 100), 2), "mm", rnd.choice(["ok", "falha"])]
+                    for n in range(1, 6)
+                ],
+            },
+            "status": rnd.choice(STATUS),
+            # Distribuição dos últimos 2 anos (filtros por período)
+            "created_at": agora - timedelta(seconds=rnd.uniform(0, 2 * 365 * 86400)),
+        }
+
+    _carregar("relatórios", Relatorio.__table__, relatorios, tamanho_lote, relatorio)
+
+    def foto(i: int) -> Dict:
+        # Distribui as fotos em rodízio: ordem 0, 1, 2... em cada relatório.
+        # As primeiras usam o nome real das amostras (não são órfãs)
+        amostra = amostras[i % AMOSTRAS]
+        nome = amostra if i <= AMOSTRAS else f"carga_{i:09d}.jpg"
+        return {
+            "id": i,
+            "relatorio_id": (i - 1) % relatorios + 1,
+            "nome_original": f"foto_{i}.jpg",
+            "nome_arquivo": nome,
+            "caminho": os.path.join(settings.UPLOAD_DIR, amostra),
+            "tamanho": 8_000,
+            "mime_type": "image/jpeg",
+            "descricao": f"Detalhe do {rnd.choice(EQUIPAMENTOS)}" if i % 4 == 0 else None,
+            "ordem": (i - 1) // relatorios,
+        }
+
+    if relatorios:
+        _carregar("fotos", Foto.__table__, fotos, tamanho_lote, foto)
+
+    _ajustar_sequencias()
+
+    from app.services.busca_service import BuscaService
+    from app.services.resumo_service import ResumoService
+
+    print("   índice de busca e resumo do dashboard...")
+    with SessionLocal() as db:
+        BuscaService.reindexar_tudo(db, tamanho_lote=tamanho_lote)
+        ResumoService.reconstruir(db)
+
+    # Estatísticas atualizadas: planos iguais aos de um banco em produção
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    print(f"✅ Dados de carga criados em {time.perf_counter() - inicio:.0f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dados sintéticos para os testes de carga")
+    parser.add_argument("--clientes", type=int, default=1000)
+    parser.add_argument("--produtos", type=int, default=50)
+    parser.add_argument("--usuarios", type=int, default=20)
+    parser.add_argument("--relatorios", type=int, default=50000)
+    parser.add_argument("--fotos", type=int, default=200000)
+    parser.add_argument("--lote", type=int, default=10000, help="linhas por transação")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+    if args.relatorios and (args.clientes < 1 or args.produtos < 1):
+        parser.error("relatórios precisam de ao menos um cliente e um produto")
+    popular(args.clientes, args.produtos, args.usuarios, args.relatorios, args.fotos, args.lote, args.semente)
+
+
+if __name__ == "__main__":
+    main()
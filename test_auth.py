@@ -0,0 +1,112 @@
+"""
+Tokens de acesso e renovação contra o estado do usuário no banco.
+
+Cria usuários, faz login e verifica que:
+- o refresh funciona com o usuário ativo;
+- desativado no banco (sem passar por nenhuma rota que revogue tokens),
+  o refresh token antigo passa a receber 401;
+- as claims renovadas vêm do banco, não do token antigo;
+- desativar pelo ORM (user.is_active = False) revoga também o access
+  token, que de outro modo valeria pelas claims até expirar;
+- revogação em transação desfeita (rollback) não rejeita tokens.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_auth.py
+"""
+
+import sys
+import time
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+from app.core.revocation import revocation_list
+from app.core.security import decode_token
+from app.database import SessionLocal
+from app.main import app
+from app.models.users import User
+
+SENHA = "senha-teste-123"
+
+
+def alterar_usuario(email: str, **valores):
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.email == email).values(**valores))
+        db.commit()
+
+
+def criar_usuario(client: TestClient, email: str) -> dict:
+    """Registra e faz login; retorna os tokens"""
+    client.post("/auth/register", json={"email": email, "password": SENHA, "full_name": "Auth"})
+    return client.post("/auth/login", json={"email": email, "password": SENHA}).json()
+
+
+def testar_auth():
+    print("=" * 60)
+    print("🔑 TESTE DE TOKENS E REVOGAÇÃO")
+    print("=" * 60)
+
+    ok = True
+    email = f"refresh-{uuid.uuid4().hex[:8]}@example.com"
+    desativado = f"desativado-{uuid.uuid4().hex[:8]}@example.com"
+    desfeito = f"desfeito-{uuid.uuid4().hex[:8]}@example.com"
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    with TestClient(app) as client:
+        try:
+            tokens = criar_usuario(client, email)
+            print()
+
+            resposta = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+            verificar(f"usuário ativo renova o token ({resposta.status_code})", resposta.status_code == 200)
+
+            # Verificado direto no banco: a renovação leva a claim nova
+            alterar_usuario(email, is_verified=True)
+            resposta = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+            claims = decode_token(resposta.json()["access_token"], "access") or {}
+            verificar("claims renovadas vêm do banco (is_verified)", claims.get("is_verified") is True)
+
+            alterar_usuario(email, is_active=False)
+            resposta = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+            verificar(f"usuário desativado recebe 401 ({resposta.status_code})", resposta.status_code == 401)
+
+            # Desativação pelo ORM: o access token também deixa de valer
+            tokens = criar_usuario(client, desativado)
+            cabecalho = {"Authorization": f"Bearer {tokens['access_token']}"}
+            verificar("access token válido antes", client.get("/auth/me", headers=cabecalho).status_code == 200)
+            with SessionLocal() as db:
+                usuario = db.query(User).filter(User.email == desativado).one()
+                usuario.is_active = False
+                db.commit()
+            resposta = client.get("/auth/me", headers=cabecalho)
+            verificar(f"access token revogado na desativação ({resposta.status_code})", resposta.status_code == 401)
+
+            # Revogação desfeita: a lista em memória não muda
+            tokens = criar_usuario(client, desfeito)
+            cabecalho = {"Authorization": f"Bearer {tokens['access_token']}"}
+            with SessionLocal() as db:
+                usuario_id = db.query(User.id).filter(User.email == desfeito).scalar()
+                revocation_list.revoke(db, usuario_id)
+                db.rollback()
+            resposta = client.get("/auth/me", headers=cabecalho)
+            verificar(f"rollback não revoga ({resposta.status_code})",
+                      resposta.status_code == 200 and not revocation_list.is_revoked(usuario_id, time.time()))
+        finally:
+            with SessionLocal() as db:
+                db.execute(delete(User).where(User.email.in_([email, desativado, desfeito])))
+                db.commit()
+
+    print("\n" + "=" * 60)
+    print("🎉 TOKENS E REVOGAÇÃO OK" if ok else "❌ FALHAS NOS TOKENS")
+    print("=" * 60)
+    assert ok, "falhas nos tokens"
+
+
+if __name__ == "__main__":
+    try:
+        testar_auth()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,90 @@
+"""
+Busca textual em relatórios (GET /relatorios/busca).
+
+Cria alguns relatórios e verifica:
+- termos curtos (menos de 3 caracteres, sem a busca parcial no código);
+- trecho do meio do código do pedido (só a busca parcial encontra);
+- palavra no título ranqueada acima da mesma palavra nas observações;
+- termo sem resultado.
+
+Roda no banco configurado (FTS5 no SQLite, tsvector no PostgreSQL).
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_busca.py
+"""
+
+import sys
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def testar_busca():
+    print("=" * 60)
+    print("🔍 TESTE DA BUSCA DE RELATÓRIOS")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    palavra = f"rotor{sufixo}"
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    def buscar(termo: str):
+        resposta = client.get("/relatorios/busca", params={"q": termo})
+        return resposta.status_code, [r["id"] for r in resposta.json()] if resposta.status_code == 200 else []
+
+    with TestClient(app) as client:
+        cliente_id = client.post(
+            "/clientes/", json={"nome": "Busca", "email": f"busca-{sufixo}@example.com"}
+        ).json()["id"]
+        produto_id = client.post("/produtos/", json={"nome": "Busca", "codigo": f"BUSCA-{sufixo}"}).json()["id"]
+
+        def criar(codigo: str, **textos) -> int:
+            return client.post("/relatorios/", json={
+                "codigo_pedido": codigo, "cliente_id": cliente_id, "produto_id": produto_id, **textos,
+            }).json()["id"]
+
+        ids = []
+        try:
+            curto = criar(f"R1-{sufixo}", titulo="Inspeção")
+            codigo = criar(f"PED{sufixo}XZ", titulo="Sem relação")
+            titulo = criar(f"T-{sufixo}", titulo=f"Falha no {palavra}")
+            observacao = criar(f"O-{sufixo}", titulo="Outro", observacoes=f"Citado: {palavra}")
+            ids = [curto, codigo, titulo, observacao]
+            print()
+
+            status, encontrados = buscar("R1")
+            verificar(f"termo curto 'R1' ({status})", status == 200 and curto in encontrados)
+
+            status, encontrados = buscar("7")
+            verificar(f"termo de 1 caractere ({status})", status == 200)
+
+            trecho = f"D{sufixo[:5]}"
+            status, encontrados = buscar(trecho)
+            verificar(f"trecho do código '{trecho}' ({status})", status == 200 and encontrados == [codigo])
+
+            status, encontrados = buscar(palavra)
+            verificar(f"título antes das observações ({status})", status == 200 and encontrados == [titulo, observacao])
+
+            status, encontrados = buscar(f"inexistente{sufixo}")
+            verificar(f"sem resultado ({status})", status == 200 and encontrados == [])
+        finally:
+            for relatorio_id in ids:
+                client.delete(f"/relatorios/{relatorio_id}")
+            client.delete(f"/produtos/{produto_id}")
+            client.delete(f"/clientes/{cliente_id}")
+
+    print("\n" + "=" * 60)
+    print("🎉 BUSCA OK" if ok else "❌ FALHAS NA BUSCA")
+    print("=" * 60)
+    assert ok, "falhas na busca"
+
+
+if __name__ == "__main__":
+    try:
+        testar_busca()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,110 @@
+"""
+Projeção de campos nas leituras (parâmetro fields=).
+
+Verifica, para clientes, produtos e relatórios:
+- a resposta traz exatamente os campos pedidos (espaços e repetições
+  ignorados), em listagem, detalhe e streaming;
+- só as colunas pedidas são lidas do banco; relacionamentos não pedidos
+  não são consultados e os pedidos vêm completos;
+- campo inexistente ou fields vazio: 400 com a lista de disponíveis.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_campos.py
+"""
+
+import sys
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.database import engine
+from app.main import app
+
+
+def testar_campos():
+    print("=" * 60)
+    print("🧩 TESTE DA PROJEÇÃO DE CAMPOS (fields=)")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    comandos = []
+
+    def registrar(conn, cursor, statement, *args):
+        comandos.append(statement)
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    def ler(url: str):
+        comandos.clear()
+        resposta = client.get(url)
+        return resposta.status_code, resposta.json(), " ".join(comandos)
+
+    with TestClient(app) as client:
+        cliente_id = client.post(
+            "/clientes/", json={"nome": "Campos", "email": f"campos-{sufixo}@example.com"}
+        ).json()["id"]
+        produto_id = client.post("/produtos/", json={"nome": "Campos", "codigo": f"CAMPOS-{sufixo}"}).json()["id"]
+        relatorio_id = client.post("/relatorios/", json={
+            "codigo_pedido": f"CAMPOS-{sufixo}", "cliente_id": cliente_id, "produto_id": produto_id,
+            "titulo": "Projeção", "observacoes": "texto longo",
+        }).json()["id"]
+
+        event.listen(engine, "before_cursor_execute", registrar)
+        try:
+            print("\n1. Clientes")
+            status, corpo, sql = ler("/clientes/?fields= id , nome,id&limit=5")
+            verificar(f"listagem só com id e nome ({status})", status == 200 and all(set(c) == {"id", "nome"} for c in corpo))
+            verificar("email não lido do banco", "clientes.email" not in sql)
+            status, corpo, _ = ler(f"/clientes/{cliente_id}?fields=email")
+            verificar(f"detalhe só com email: {corpo}", corpo == {"email": f"campos-{sufixo}@example.com"})
+            status, corpo, _ = ler("/clientes/?fields=nome&limit=5&stream=true")
+            verificar("streaming com a mesma projeção", status == 200 and all(set(c) == {"nome"} for c in corpo))
+
+            print("\n2. Produtos (catálogo em memória)")
+            status, corpo, _ = ler(f"/produtos/{produto_id}?fields=codigo")
+            verificar(f"detalhe só com codigo: {corpo}", corpo == {"codigo": f"CAMPOS-{sufixo}"})
+            status, corpo, _ = ler("/produtos/?fields=id,nome&limit=5")
+            verificar("listagem só com id e nome", status == 200 and all(set(p) == {"id", "nome"} for p in corpo))
+
+            print("\n3. Relatórios")
+            status, corpo, sql = ler(f"/relatorios/{relatorio_id}?fields=titulo,status")
+            verificar(f"detalhe só com titulo e status: {corpo}", corpo == {"titulo": "Projeção", "status": "rascunho"})
+            verificar("observações, fotos e cliente não lidos",
+                      "relatorios.observacoes" not in sql and " fotos" not in sql and "clientes.nome" not in sql)
+
+            status, corpo, sql = ler(f"/relatorios/{relatorio_id}?fields=cliente,fotos")
+            verificar("relacionamentos pedidos vêm completos",
+                      set(corpo) == {"cliente", "fotos"} and corpo["cliente"].get("email") == f"campos-{sufixo}@example.com"
+                      and corpo["fotos"] == [])
+            verificar("título não lido", "relatorios.titulo" not in sql)
+
+            status, corpo, _ = ler(f"/relatorios/?cliente_id={cliente_id}&fields=id,produto")
+            verificar("listagem com o produto completo",
+                      status == 200 and corpo == [{"id": relatorio_id, "produto": corpo[0]["produto"]}]
+                      and corpo[0]["produto"]["codigo"] == f"CAMPOS-{sufixo}")
+
+            print("\n4. Campos inválidos")
+            for url in ("/clientes/?fields=id,senha", f"/relatorios/{relatorio_id}?fields=", "/produtos/?fields=,"):
+                resposta = client.get(url)
+                verificar(f"{url}: 400 ({resposta.status_code})",
+                          resposta.status_code == 400 and "Disponíveis" in resposta.json().get("detail", ""))
+        finally:
+            event.remove(engine, "before_cursor_execute", registrar)
+            client.delete(f"/relatorios/{relatorio_id}")
+            client.delete(f"/produtos/{produto_id}")
+            client.delete(f"/clientes/{cliente_id}")
+
+    print("\n" + "=" * 60)
+    print("🎉 PROJEÇÃO DE CAMPOS OK" if ok else "❌ FALHAS NA PROJEÇÃO DE CAMPOS")
+    print("=" * 60)
+    assert ok, "falhas na projeção de campos"
+
+
+if __name__ == "__main__":
+    try:
+        testar_campos()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,119 @@
+"""
+Orçamento de consultas SQL por rota.
+
+Cria alguns relatórios com fotos e verifica, para cada rota de leitura,
+quantas consultas ela executa. Os orçamentos não dependem da quantidade
+de linhas: uma rota que passe a carregar relacionamentos item a item
+(N+1, ex: relatorio.fotos numa listagem) estoura o limite ou repete o
+mesmo comando e o script falha (exit 1), mostrando o SQL e a linha do
+código que o disparou.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_consultas.py
+"""
+
+import os
+import sys
+import uuid
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.core.consultas import orcamento_consultas
+from app.database import SessionLocal
+from app.main import app
+from app.models import Foto
+
+RELATORIOS = 5
+FOTOS_POR_RELATORIO = 3
+
+# (rota, máximo de consultas); nenhuma rota pode repetir um comando
+ORCAMENTOS = [
+    ("/relatorios/", 2),
+    ("/relatorios/{relatorio_id}", 3),
+    ("/relatorios/{relatorio_id}/fotos", 2),
+    ("/relatorios/busca?q={sufixo}", 2),
+    ("/relatorios/exportar", 1),
+    ("/clientes/", 2),
+    ("/clientes/{cliente_id}", 2),
+    ("/clientes/exportar", 1),
+    ("/produtos/", 1),
+    ("/dashboard/", 1),
+]
+
+
+def criar_dados(client: TestClient, sufixo: str) -> dict:
+    """Cliente, produto e relatórios com fotos (só os registros, sem arquivos)"""
+    cliente = client.post("/clientes/", json={"nome": "Consultas", "email": f"consultas-{sufixo}@example.com"})
+    produto = client.post("/produtos/", json={"nome": "Consultas", "codigo": f"CONSULTAS-{sufixo}"})
+    ids = {"cliente_id": cliente.json()["id"], "produto_id": produto.json()["id"], "relatorios": []}
+
+    for i in range(RELATORIOS):
+        resposta = client.post("/relatorios/", json={
+            "codigo_pedido": f"CONSULTAS-{sufixo}-{i}",
+            "cliente_id": ids["cliente_id"],
+            "produto_id": ids["produto_id"],
+            "titulo": f"Relatório {sufixo}",
+        })
+        ids["relatorios"].append(resposta.json()["id"])
+
+    with SessionLocal() as db:
+        for relatorio_id in ids["relatorios"]:
+            for ordem in range(FOTOS_POR_RELATORIO):
+                nome = f"consultas_{sufixo}_{relatorio_id}_{ordem}.jpg"
+                db.add(Foto(
+                    relatorio_id=relatorio_id,
+                    nome_original=nome,
+                    nome_arquivo=nome,
+                    caminho=os.path.join(settings.UPLOAD_DIR, nome),
+                    tamanho=1,
+                    mime_type="image/jpeg",
+                    ordem=ordem,
+                ))
+        db.commit()
+    return ids
+
+
+def limpar(client: TestClient, ids: dict):
+    for relatorio_id in ids["relatorios"]:
+        client.delete(f"/relatorios/{relatorio_id}")
+    client.delete(f"/produtos/{ids['produto_id']}")
+    client.delete(f"/clientes/{ids['cliente_id']}")
+
+
+def testar_consultas():
+    print("=" * 60)
+    print("🔎 TESTE DE ORÇAMENTO DE CONSULTAS SQL")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+
+    with TestClient(app) as client:
+        ids = criar_dados(client, sufixo)
+        try:
+            print()
+            for rota, maximo in ORCAMENTOS:
+                url = rota.format(sufixo=sufixo, relatorio_id=ids["relatorios"][0], cliente_id=ids["cliente_id"])
+                try:
+                    with orcamento_consultas(maximo, repeticoes_maximas=1) as perfil:
+                        resposta = client.get(url)
+                    sucesso = resposta.status_code == 200
+                    print(f"   {'✅' if sucesso else '❌'} {rota}: {perfil.total}/{maximo} consultas"
+                          + ("" if sucesso else f" (status {resposta.status_code})"))
+                except AssertionError as e:
+                    sucesso = False
+                    print(f"   ❌ {rota}: {e}")
+                ok = ok and sucesso
+        finally:
+            limpar(client, ids)
+
+    print("\n" + "=" * 60)
+    print("🎉 CONSULTAS DENTRO DO ORÇAMENTO" if ok else "❌ ROTAS FORA DO ORÇAMENTO")
+    print("=" * 60)
+    assert ok, "rotas fora do orçamento de consultas"
+
+
+if __name__ == "__main__":
+    try:
+        testar_consultas()
+    except AssertionError:
+        sys.exit(1)
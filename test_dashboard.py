@@ -0,0 +1,122 @@
+"""
+Resumo do dashboard (GET /dashboard/) mantido a cada escrita.
+
+Cria clientes, produtos e status próprios do teste e acompanha as
+contagens a cada operação:
+- criar, atualizar (status, cliente e produto), clonar (volta a
+  rascunho), excluir, excluir de novo (404, sem descontar duas vezes),
+  importar em lote e excluir o cliente (remove os relatórios dele);
+- ao final, reconstruir o resumo do zero não muda nada: as variações
+  aplicadas a cada escrita batem com a contagem completa.
+
+Contagens globais (rascunho, mês atual) são comparadas com o início do
+teste. Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_dashboard.py
+"""
+
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+from app.database import SessionLocal
+from app.main import app
+from app.services.resumo_service import ResumoService
+
+
+def testar_dashboard():
+    print("=" * 60)
+    print("📈 TESTE DO RESUMO DO DASHBOARD")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    aberto, fechado = f"aberto-{sufixo}", f"fechado-{sufixo}"
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    def contagens() -> dict:
+        """Contagens que o teste acompanha, a partir do dashboard"""
+        dashboard = client.get("/dashboard/").json()
+        return {
+            aberto: dashboard["por_status"].get(aberto, 0),
+            fechado: dashboard["por_status"].get(fechado, 0),
+            "rascunho": dashboard["por_status"].get("rascunho", 0) - inicial["rascunho"],
+            "A": dashboard["por_cliente"].get(str(cliente_a), 0),
+            "B": dashboard["por_cliente"].get(str(cliente_b), 0),
+            "P": dashboard["por_produto"].get(str(produto_p), 0),
+            "Q": dashboard["por_produto"].get(str(produto_q), 0),
+            "mes": dashboard["por_mes"].get(mes, 0) - inicial["mes"],
+        }
+
+    def conferir(etapa: str, **esperado):
+        atual = contagens()
+        diferentes = {chave: atual[chave] for chave, valor in esperado.items() if atual[chave] != valor}
+        verificar(f"{etapa}" + (f" (diferente: {diferentes})" if diferentes else ""), not diferentes)
+
+    with TestClient(app) as client:
+        mes = datetime.now(timezone.utc).strftime("%Y-%m")
+        dashboard = client.get("/dashboard/").json()
+        inicial = {"rascunho": dashboard["por_status"].get("rascunho", 0), "mes": dashboard["por_mes"].get(mes, 0)}
+
+        cliente_a = client.post("/clientes/", json={"nome": "A", "email": f"dash-a-{sufixo}@example.com"}).json()["id"]
+        cliente_b = client.post("/clientes/", json={"nome": "B", "email": f"dash-b-{sufixo}@example.com"}).json()["id"]
+        produto_p = client.post("/produtos/", json={"nome": "P", "codigo": f"DASH-P-{sufixo}"}).json()["id"]
+        produto_q = client.post("/produtos/", json={"nome": "Q", "codigo": f"DASH-Q-{sufixo}"}).json()["id"]
+        try:
+            print()
+            original = client.post("/relatorios/", json={
+                "codigo_pedido": f"DASH-{sufixo}-1", "cliente_id": cliente_a, "produto_id": produto_p, "status": aberto,
+            }).json()["id"]
+            conferir("criar", **{aberto: 1, "A": 1, "P": 1, "mes": 1})
+
+            client.put(f"/relatorios/{original}", json={"status": fechado, "cliente_id": cliente_b, "produto_id": produto_q})
+            conferir("atualizar status, cliente e produto",
+                     **{aberto: 0, fechado: 1, "A": 0, "B": 1, "P": 0, "Q": 1, "mes": 1})
+
+            client.put(f"/relatorios/{original}", json={"titulo": "Só o título"})
+            conferir("atualizar campo fora do resumo", **{fechado: 1, "B": 1, "Q": 1, "mes": 1})
+
+            clone = client.post(f"/relatorios/{original}/clonar", json={"codigo_pedido": f"DASH-{sufixo}-2"})
+            conferir(f"clonar ({clone.status_code})", **{fechado: 1, "rascunho": 1, "B": 2, "Q": 2, "mes": 2})
+
+            client.delete(f"/relatorios/{original}")
+            conferir("excluir", **{fechado: 0, "rascunho": 1, "B": 1, "Q": 1, "mes": 1})
+            resposta = client.delete(f"/relatorios/{original}")
+            conferir(f"excluir de novo ({resposta.status_code}) não desconta",
+                     **{fechado: 0, "rascunho": 1, "B": 1, "Q": 1, "mes": 1})
+
+            linhas = "\n".join(json.dumps({
+                "codigo_pedido": f"DASH-{sufixo}-import-{n}", "cliente_id": cliente_a,
+                "produto_id": produto_p, "status": aberto,
+            }) for n in range(2))
+            client.post("/relatorios/importar", files={"arquivo": ("lote.ndjson", linhas.encode(), "application/x-ndjson")})
+            conferir("importar 2 em lote", **{aberto: 2, "A": 2, "P": 2, "B": 1, "mes": 3})
+
+            client.delete(f"/clientes/{cliente_b}")
+            conferir("excluir cliente com relatório", **{"rascunho": 0, "B": 0, "Q": 0, "A": 2, "mes": 2})
+
+            antes = client.get("/dashboard/").json()
+            with SessionLocal() as db:
+                ResumoService.reconstruir(db)
+            verificar("reconstruir do zero não muda o resumo", client.get("/dashboard/").json() == antes)
+        finally:
+            for cliente_id in (cliente_a, cliente_b):
+                client.delete(f"/clientes/{cliente_id}")
+            client.delete(f"/produtos/{produto_p}")
+            client.delete(f"/produtos/{produto_q}")
+
+    print("\n" + "=" * 60)
+    print("🎉 RESUMO DO DASHBOARD OK" if ok else "❌ FALHAS NO RESUMO DO DASHBOARD")
+    print("=" * 60)
+    assert ok, "falhas no resumo do dashboard"
+
+
+if __name__ == "__main__":
+    try:
+        testar_dashboard()
+    except AssertionError:
+        sys.exit(1)
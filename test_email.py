@@ -0,0 +1,162 @@
+"""
+Envio de emails em segundo plano contra um servidor SMTP local (aiosmtpd).
+
+Verifica que:
+- send_email só enfileira: retorna na hora, mesmo com o servidor lento;
+- as mensagens saem por poucas conexões reaproveitadas (EMAIL_CONEXOES),
+  não uma conexão por email;
+- resposta 4xx é repetida com espera e a mensagem chega;
+- resposta 5xx não é repetida;
+- o shutdown (parar) envia o que ainda estava na fila.
+
+Não precisa de banco nem de internet. Requer aiosmtpd (pip install aiosmtpd).
+Execute: python test_email.py
+"""
+
+import socket
+import sys
+import time
+from collections import Counter
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    if __name__ != "__main__":
+        import pytest
+        pytest.skip("aiosmtpd não instalado", allow_module_level=True)
+    print("❌ aiosmtpd não instalado: pip install aiosmtpd")
+    sys.exit(1)
+
+from app.config import settings
+from app.core.emails import EnviadorEmails
+from app.services import email_service
+from app.services.email_service import send_email
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+PORTA = porta_livre()
+CONEXOES = 2
+EMAILS = 30
+
+
+def configurar() -> EnviadorEmails:
+    """
+    Aponta o envio para o servidor local, sem TLS nem login. As
+    configurações já foram carregadas (outros testes podem ter importado a
+    aplicação antes), então são alteradas na instância; send_email passa a
+    usar um enviador com espera curta entre tentativas.
+    """
+    settings.MAIL_SERVER = "127.0.0.1"
+    settings.MAIL_PORT = PORTA
+    settings.MAIL_STARTTLS = False
+    settings.MAIL_USERNAME = ""
+    enviador = EnviadorEmails(CONEXOES, lote=20, max_tentativas=5, backoff=0.2, ocioso=60)
+    email_service.enviador_emails = enviador
+    return enviador
+
+
+class ServidorLocal:
+    """Guarda as mensagens recebidas; recusa alguns destinatários de propósito"""
+
+    def __init__(self):
+        self.recebidos = []
+        self.tentativas = Counter()
+        self.conexoes = set()
+        self.atraso = 0.0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.tentativas[address] += 1
+        if address.startswith("temporario") and self.tentativas[address] == 1:
+            return "451 4.3.0 tente mais tarde"
+        if address.startswith("inexistente"):
+            return "550 5.1.1 caixa inexistente"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.atraso:
+            time.sleep(self.atraso)  # servidor lento (bloqueia só a thread do aiosmtpd)
+        self.conexoes.add(session.peer)
+        self.recebidos.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+def testar_email():
+    print("=" * 60)
+    print("📧 ENVIO DE EMAILS EM SEGUNDO PLANO")
+    print("=" * 60)
+
+    servidor = ServidorLocal()
+    controller = Controller(servidor, hostname="127.0.0.1", port=PORTA)
+    controller.start()
+    configuracao_original = (settings.MAIL_SERVER, settings.MAIL_PORT, settings.MAIL_STARTTLS,
+                             settings.MAIL_USERNAME, email_service.enviador_emails)
+    enviador_emails = configurar()
+    enviador_emails.iniciar()
+    ok = True
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    try:
+        # 1. Enfileirar não espera o SMTP
+        servidor.atraso = 0.05
+        inicio = time.perf_counter()
+        for n in range(EMAILS):
+            send_email(f"usuario{n}@teste.com", "Teste", "<p>ok</p>")
+        enfileirar_ms = (time.perf_counter() - inicio) * 1000
+        print(f"\n1. {EMAILS} emails, servidor com 50 ms por mensagem")
+        verificar(f"enfileirados em {enfileirar_ms:.1f} ms", enfileirar_ms < EMAILS * 50 / 4)
+        verificar("fila esvaziada", enviador_emails.aguardar(timeout=30))
+        verificar(f"{len(servidor.recebidos)}/{EMAILS} recebidos", len(servidor.recebidos) == EMAILS)
+        verificar(f"{len(servidor.conexoes)} conexões SMTP (máximo {CONEXOES})",
+                  len(servidor.conexoes) <= CONEXOES)
+        servidor.atraso = 0.0
+
+        # 2. Falha temporária: nova tentativa depois do backoff
+        print("\n2. Resposta 451 na primeira tentativa")
+        send_email("temporario@teste.com", "Teste", "<p>ok</p>")
+        verificar("fila esvaziada", enviador_emails.aguardar(timeout=10))
+        verificar(f"{servidor.tentativas['temporario@teste.com']} tentativas, entregue",
+                  "temporario@teste.com" in servidor.recebidos
+                  and servidor.tentativas["temporario@teste.com"] == 2)
+
+        # 3. Falha permanente: sem novas tentativas
+        print("\n3. Resposta 550")
+        send_email("inexistente@teste.com", "Teste", "<p>ok</p>")
+        verificar("fila esvaziada", enviador_emails.aguardar(timeout=10))
+        verificar(f"{servidor.tentativas['inexistente@teste.com']} tentativa, não repetida",
+                  servidor.tentativas["inexistente@teste.com"] == 1)
+
+        # 4. Shutdown envia o que está na fila
+        print("\n4. Shutdown com emails na fila")
+        antes = len(servidor.recebidos)
+        for n in range(5):
+            send_email(f"shutdown{n}@teste.com", "Teste", "<p>ok</p>")
+        enviador_emails.parar()
+        verificar(f"{len(servidor.recebidos) - antes}/5 enviados antes de encerrar",
+                  len(servidor.recebidos) - antes == 5)
+    finally:
+        enviador_emails.parar()
+        controller.stop()
+        (settings.MAIL_SERVER, settings.MAIL_PORT, settings.MAIL_STARTTLS,
+         settings.MAIL_USERNAME, email_service.enviador_emails) = configuracao_original
+
+    print("\n" + "=" * 60)
+    print("🎉 ENVIO DE EMAILS OK" if ok else "❌ FALHAS NO ENVIO DE EMAILS")
+    print("=" * 60)
+    assert ok, "falhas no envio de emails"
+
+
+if __name__ == "__main__":
+    try:
+        testar_email()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,116 @@
+"""
+Revalidação HTTP (ETag / If-None-Match) nas leituras.
+
+Para clientes, produtos e relatórios (listagem, detalhe e fields=),
+verifica que:
+- o ETag da primeira leitura (calculado das linhas carregadas) é o mesmo
+  da revalidação (calculado pela consulta leve de versões): 304;
+- leitura sem If-None-Match não roda a consulta de versões;
+- depois de uma alteração o ETag antigo não casa mais: 200;
+- "*" casa só em rotas de um único recurso, nunca em listagens;
+- "*" em recurso inexistente responde 404.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_etag.py
+"""
+
+import sys
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.database import engine
+from app.main import app
+
+
+def testar_etag():
+    print("=" * 60)
+    print("🏷️  TESTE DE ETAG / IF-NONE-MATCH")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    comandos = []
+
+    def registrar(conn, cursor, statement, *args):
+        comandos.append(statement)
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    with TestClient(app) as client:
+        cliente_id = client.post(
+            "/clientes/", json={"nome": "Etag", "email": f"etag-{sufixo}@example.com"}
+        ).json()["id"]
+        produto_id = client.post("/produtos/", json={"nome": "Etag", "codigo": f"ETAG-{sufixo}"}).json()["id"]
+        relatorio_id = client.post("/relatorios/", json={
+            "codigo_pedido": f"ETAG-{sufixo}", "cliente_id": cliente_id, "produto_id": produto_id,
+        }).json()["id"]
+
+        rotas = {
+            "clientes": (f"/clientes/{cliente_id}", "/clientes/?skip=0&limit=1000"),
+            "produtos": (f"/produtos/{produto_id}", "/produtos/?limit=1000"),
+            "relatorios": (f"/relatorios/{relatorio_id}", f"/relatorios/?cliente_id={cliente_id}"),
+        }
+        alteracoes = {
+            "clientes": lambda: client.put(f"/clientes/{cliente_id}", json={"nome": "Etag 2"}),
+            "produtos": lambda: client.put(f"/produtos/{produto_id}", json={"nome": "Etag 2"}),
+            "relatorios": lambda: client.put(f"/relatorios/{relatorio_id}", json={"titulo": "Etag 2"}),
+        }
+        campos = {"clientes": "nome", "produtos": "nome", "relatorios": "titulo,cliente"}
+
+        event.listen(engine, "before_cursor_execute", registrar)
+        try:
+            for recurso, (detalhe, listagem) in rotas.items():
+                print(f"\n{recurso}")
+                urls = [detalhe, listagem, f"{detalhe}?fields={campos[recurso]}", f"{listagem}&fields={campos[recurso]}"]
+                etags = {}
+                for url in urls:
+                    resposta = client.get(url)
+                    etags[url] = resposta.headers.get("etag")
+                    revalidada = client.get(url, headers={"If-None-Match": etags[url]})
+                    verificar(f"{url}: 200 e depois 304 ({resposta.status_code}, {revalidada.status_code})",
+                              resposta.status_code == 200 and revalidada.status_code == 304
+                              and revalidada.headers.get("etag") == etags[url])
+
+                # Sem If-None-Match: só a consulta da resposta, sem a de versões
+                # (produtos vêm do catálogo em memória, sem consulta por requisição)
+                if recurso != "produtos":
+                    comandos.clear()
+                    client.get(listagem)
+                    client.get(detalhe)
+                    verificar("sem If-None-Match não consulta as versões",
+                              not any(f"coalesce({recurso}.updated_at" in comando for comando in comandos))
+
+                verificar("'*' no recurso existente: 304",
+                          client.get(detalhe, headers={"If-None-Match": "*"}).status_code == 304)
+                verificar("'*' na listagem: 200",
+                          client.get(listagem, headers={"If-None-Match": "*"}).status_code == 200)
+
+                alteracoes[recurso]()
+                for url in urls:
+                    resposta = client.get(url, headers={"If-None-Match": etags[url]})
+                    verificar(f"{url} após alteração: 200", resposta.status_code == 200)
+
+            resposta = client.get("/clientes/999999999", headers={"If-None-Match": "*"})
+            verificar(f"'*' em cliente inexistente: 404 ({resposta.status_code})", resposta.status_code == 404)
+            resposta = client.get("/relatorios/999999999", headers={"If-None-Match": "*"})
+            verificar(f"'*' em relatório inexistente: 404 ({resposta.status_code})", resposta.status_code == 404)
+        finally:
+            event.remove(engine, "before_cursor_execute", registrar)
+            client.delete(f"/relatorios/{relatorio_id}")
+            client.delete(f"/produtos/{produto_id}")
+            client.delete(f"/clientes/{cliente_id}")
+
+    print("\n" + "=" * 60)
+    print("🎉 ETAG OK" if ok else "❌ FALHAS NO ETAG")
+    print("=" * 60)
+    assert ok, "falhas no ETag"
+
+
+if __name__ == "__main__":
+    try:
+        testar_etag()
+    except AssertionError:
+        sys.exit(1)
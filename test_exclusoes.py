@@ -0,0 +1,132 @@
+"""
+Remoção adiada dos arquivos de upload (app/services/exclusao_service.py).
+
+Usa uma pasta de upload temporária e verifica:
+- reconciliar agenda só fotos órfãs antigas: não as referenciadas por
+  Foto, nem as recentes, nem outros arquivos da pasta (PDFs de
+  gerar_pdf, arquivos com outros nomes);
+- reconciliar não agenda duas vezes o que já está na fila;
+- processar_lote remove os arquivos agendados, trata arquivo já ausente
+  como removido e não apaga nada fora da pasta de upload;
+- agendar (exclusão de fotos) seguido do coletor remove o arquivo.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_exclusoes.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+from app.config import settings
+from app.core.exclusoes import coletor_arquivos
+from app.database import SessionLocal
+from app.main import app
+from app.models import ExclusaoPendente, Foto
+from app.services.exclusao_service import ExclusaoService
+
+IDADE_MINIMA = 60
+
+
+def criar_arquivo(pasta: str, nome: str, antigo: bool = True) -> str:
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, "wb") as f:
+        f.write(b"conteudo")
+    if antigo:
+        passado = time.time() - IDADE_MINIMA * 10
+        os.utime(caminho, (passado, passado))
+    return caminho
+
+
+def testar_exclusoes():
+    print("=" * 60)
+    print("🗑️  TESTE DA REMOÇÃO DE ARQUIVOS DE UPLOAD")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    pasta = tempfile.mkdtemp(prefix="uploads-")
+    fora = tempfile.NamedTemporaryFile(delete=False, suffix=".jpg").name
+    upload_dir_original = settings.UPLOAD_DIR
+    settings.UPLOAD_DIR = pasta
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    with TestClient(app) as client:
+        cliente_id = client.post(
+            "/clientes/", json={"nome": "Exclusões", "email": f"exclusoes-{sufixo}@example.com"}
+        ).json()["id"]
+        produto_id = client.post("/produtos/", json={"nome": "Exclusões", "codigo": f"EXCL-{sufixo}"}).json()["id"]
+        relatorio_id = client.post("/relatorios/", json={
+            "codigo_pedido": f"EXCL-{sufixo}", "cliente_id": cliente_id, "produto_id": produto_id,
+        }).json()["id"]
+
+        orfa = criar_arquivo(pasta, f"{uuid.uuid4()}.jpg")
+        referenciada = criar_arquivo(pasta, f"{uuid.uuid4()}.png")
+        recente = criar_arquivo(pasta, f"{uuid.uuid4()}.jpg", antigo=False)
+        pdf = criar_arquivo(pasta, f"relatorio_EXCL-{sufixo}.pdf")
+        outro = criar_arquivo(pasta, "notas.txt")
+        db = SessionLocal()
+        try:
+            db.add(Foto(
+                relatorio_id=relatorio_id, nome_original="foto.png", nome_arquivo=os.path.basename(referenciada),
+                caminho=referenciada, tamanho=8, mime_type="image/png",
+            ))
+            db.commit()
+
+            print("\n1. Reconciliação")
+            orfaos = ExclusaoService.reconciliar(db, IDADE_MINIMA)
+            verificar(f"só a foto órfã antiga agendada ({len(orfaos)})", orfaos == [orfa])
+            verificar("segunda passada não agenda de novo", ExclusaoService.reconciliar(db, IDADE_MINIMA) == [])
+
+            print("\n2. Coletor")
+            ausente = os.path.join(pasta, f"{uuid.uuid4()}.jpg")
+            db.add_all([ExclusaoPendente(caminho=ausente), ExclusaoPendente(caminho=fora)])
+            db.commit()
+            coletor_arquivos.coletar()
+            pendentes = set(db.scalars(select(ExclusaoPendente.caminho).where(
+                ExclusaoPendente.caminho.in_([orfa, ausente, fora])
+            )))
+            verificar("foto órfã removida do disco", not os.path.exists(orfa))
+            verificar("fila esvaziada (inclui o arquivo já ausente)", not pendentes)
+            verificar("arquivo fora da pasta de upload preservado", os.path.exists(fora))
+            verificar("PDF, outros arquivos, foto recente e referenciada preservados",
+                      all(os.path.exists(c) for c in (pdf, outro, recente, referenciada)))
+
+            print("\n3. Exclusão de fotos")
+            coletor_arquivos.agendar(db, Foto.relatorio_id == relatorio_id)
+            db.execute(delete(Foto).where(Foto.relatorio_id == relatorio_id))
+            db.commit()
+            coletor_arquivos.coletar()
+            verificar("arquivo da foto apagada removido", not os.path.exists(referenciada))
+        finally:
+            db.execute(delete(ExclusaoPendente).where(ExclusaoPendente.caminho.startswith(pasta)))
+            db.execute(delete(ExclusaoPendente).where(ExclusaoPendente.caminho == fora))
+            db.execute(delete(Foto).where(Foto.relatorio_id == relatorio_id))
+            db.commit()
+            db.close()
+            client.delete(f"/relatorios/{relatorio_id}")
+            client.delete(f"/produtos/{produto_id}")
+            client.delete(f"/clientes/{cliente_id}")
+            settings.UPLOAD_DIR = upload_dir_original
+            shutil.rmtree(pasta, ignore_errors=True)
+            os.remove(fora)
+
+    print("\n" + "=" * 60)
+    print("🎉 REMOÇÃO DE ARQUIVOS OK" if ok else "❌ FALHAS NA REMOÇÃO DE ARQUIVOS")
+    print("=" * 60)
+    assert ok, "falhas na remoção de arquivos"
+
+
+if __name__ == "__main__":
+    try:
+        testar_exclusoes()
+    except AssertionError:
+        sys.exit(1)
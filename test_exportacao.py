@@ -0,0 +1,119 @@
+"""
+Exportação em streaming (GET /relatorios/exportar e /clientes/exportar).
+
+Com blocos de 3 linhas (ExportService.TAMANHO_BLOCO reduzido no teste),
+verifica:
+- os geradores enviam um pedaço por bloco lido do banco, sem juntar a
+  tabela inteira antes de responder;
+- NDJSON: uma linha JSON por registro, com colunas JSON como objetos;
+- CSV: cabeçalho, texto com vírgulas e aspas escapado, colunas JSON
+  gravadas como texto JSON;
+- filtros da listagem valem na exportação; formato desconhecido é 400;
+- listagem com stream=true devolve o mesmo corpo que sem stream.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_exportacao.py
+"""
+
+import csv
+import io
+import json
+import sys
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.main import app
+from app.models import Relatorio
+from app.services.export_service import ExportService
+
+BLOCO = 3
+RELATORIOS = 7
+
+
+def testar_exportacao():
+    print("=" * 60)
+    print("📤 TESTE DA EXPORTAÇÃO EM STREAMING")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    tamanho_original = ExportService.TAMANHO_BLOCO
+    ExportService.TAMANHO_BLOCO = BLOCO
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    with TestClient(app) as client:
+        cliente_id = client.post(
+            "/clientes/", json={"nome": "Export", "email": f"export-{sufixo}@example.com"}
+        ).json()["id"]
+        produto_id = client.post("/produtos/", json={"nome": "Export", "codigo": f"EXPORT-{sufixo}"}).json()["id"]
+        ids = []
+        try:
+            tabela = {"estrutura": {"colunas": ["Medida"]}, "dados": [["10mm"]]}
+            titulo = 'Bobina "A", lote 3'
+            for n in range(RELATORIOS):
+                ids.append(client.post("/relatorios/", json={
+                    "codigo_pedido": f"EXPORT-{sufixo}-{n}", "cliente_id": cliente_id, "produto_id": produto_id,
+                    "titulo": titulo, "dados_tabela": tabela,
+                }).json()["id"])
+            codigos = {f"EXPORT-{sufixo}-{n}" for n in range(RELATORIOS)}
+
+            print("\n1. Geradores em blocos")
+            stmt = select(Relatorio.__table__).where(Relatorio.cliente_id == cliente_id).order_by(Relatorio.id)
+            with SessionLocal() as db:
+                pedacos_ndjson = list(ExportService.gerar_ndjson(db, stmt))
+                pedacos_csv = list(ExportService.gerar_csv(db, stmt))
+            blocos = -(-RELATORIOS // BLOCO)
+            verificar(f"NDJSON em {len(pedacos_ndjson)} pedaços ({blocos} blocos)", len(pedacos_ndjson) == blocos)
+            verificar(f"CSV em {len(pedacos_csv)} pedaços (cabeçalho vai com o 1º bloco)", len(pedacos_csv) == blocos)
+
+            print("\n2. NDJSON")
+            resposta = client.get("/relatorios/exportar", params={"formato": "ndjson", "cliente_id": cliente_id})
+            linhas = [json.loads(linha) for linha in resposta.text.splitlines()]
+            verificar(f"{resposta.headers.get('content-type')}", resposta.headers.get("content-type") == "application/x-ndjson")
+            verificar("anexo relatorios.ndjson", 'filename="relatorios.ndjson"' in resposta.headers.get("content-disposition", ""))
+            verificar(f"{len(linhas)} linhas, só as do filtro", {linha["codigo_pedido"] for linha in linhas} == codigos)
+            verificar("dados_tabela como objeto JSON", all(linha["dados_tabela"] == tabela for linha in linhas))
+
+            print("\n3. CSV")
+            resposta = client.get("/relatorios/exportar", params={"formato": "csv", "cliente_id": cliente_id})
+            linhas = list(csv.DictReader(io.StringIO(resposta.text)))
+            verificar(f"{resposta.headers.get('content-type')}", resposta.headers.get("content-type", "").startswith("text/csv"))
+            verificar(f"{len(linhas)} linhas, só as do filtro", {linha["codigo_pedido"] for linha in linhas} == codigos)
+            verificar("texto com vírgula e aspas preservado", all(linha["titulo"] == titulo for linha in linhas))
+            verificar("dados_tabela como texto JSON", all(json.loads(linha["dados_tabela"]) == tabela for linha in linhas))
+
+            resposta = client.get("/clientes/exportar", params={"formato": "csv"})
+            cabecalho = resposta.text.splitlines()[0].split(",")
+            verificar(f"clientes: cabeçalho {cabecalho[:3]}...", cabecalho[:3] == ["id", "nome", "email"])
+            resposta = client.get("/clientes/exportar", params={"formato": "xml"})
+            verificar(f"formato desconhecido: 400 ({resposta.status_code})", resposta.status_code == 400)
+
+            print("\n4. Listagem com stream=true")
+            for url in (f"/relatorios/?cliente_id={cliente_id}", f"/relatorios/?cliente_id={cliente_id}&fields=id,cliente",
+                        "/clientes/?limit=20"):
+                normal = client.get(url)
+                stream = client.get(url + "&stream=true")
+                verificar(f"{url}: mesmo corpo", stream.status_code == 200 and stream.json() == normal.json())
+        finally:
+            ExportService.TAMANHO_BLOCO = tamanho_original
+            for relatorio_id in ids:
+                client.delete(f"/relatorios/{relatorio_id}")
+            client.delete(f"/produtos/{produto_id}")
+            client.delete(f"/clientes/{cliente_id}")
+
+    print("\n" + "=" * 60)
+    print("🎉 EXPORTAÇÃO OK" if ok else "❌ FALHAS NA EXPORTAÇÃO")
+    print("=" * 60)
+    assert ok, "falhas na exportação"
+
+
+if __name__ == "__main__":
+    try:
+        testar_exportacao()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,125 @@
+"""
+Importação em lote (POST /clientes/importar e /relatorios/importar).
+
+Com lotes de 3 linhas (ImportService.TAMANHO_LOTE reduzido no teste),
+verifica o resultado de cada linha:
+- linhas válidas criadas, com o id na resposta;
+- erros por linha (JSON inválido, linha que não é objeto, validação,
+  JSON inválido em coluna do CSV, cliente inexistente) sem derrubar as
+  demais linhas do lote;
+- chave repetida no mesmo lote, em lotes diferentes do arquivo e já
+  existente no banco: erro de duplicado, só a primeira ocorrência criada.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_importacao.py
+"""
+
+import json
+import sys
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.import_service import ImportService
+
+LOTE = 3
+
+
+def testar_importacao():
+    print("=" * 60)
+    print("📥 TESTE DA IMPORTAÇÃO EM LOTE")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    tamanho_original = ImportService.TAMANHO_LOTE
+    ImportService.TAMANHO_LOTE = LOTE
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    def importar(rota: str, nome: str, conteudo: str) -> dict:
+        resposta = client.post(rota, files={"arquivo": (nome, conteudo.encode(), "application/octet-stream")})
+        return resposta.json() if resposta.status_code == 200 else {"linhas": [], "status": resposta.status_code}
+
+    def email(n) -> str:
+        return f"import-{sufixo}-{n}@example.com"
+
+    with TestClient(app) as client:
+        cliente_ids, relatorio_ids = [], []
+        produto_id = client.post("/produtos/", json={"nome": "Import", "codigo": f"IMPORT-{sufixo}"}).json()["id"]
+        try:
+            existente = client.post("/clientes/", json={"nome": "Existente", "email": email("existente")}).json()["id"]
+            cliente_ids.append(existente)
+
+            # 1. Clientes em NDJSON: 3 lotes de 3 linhas
+            linhas = [
+                json.dumps({"nome": "A", "email": email(1)}),           # 1 criado
+                "{nao e json",                                           # 2 JSON inválido
+                json.dumps({"nome": "B", "email": email(1)}),           # 3 duplicado no lote
+                json.dumps(["lista"]),                                   # 4 não é objeto
+                json.dumps({"nome": "", "email": email(2)}),            # 5 validação (nome vazio)
+                json.dumps({"nome": "C", "email": email(2)}),           # 6 criado
+                json.dumps({"nome": "D", "email": email(1)}),           # 7 duplicado de outro lote
+                json.dumps({"nome": "E", "email": email("existente")}),  # 8 já no banco
+                json.dumps({"nome": "F"}),                               # 9 criado (sem email)
+            ]
+            resultado = importar("/clientes/importar", "clientes.ndjson", "\n".join(linhas))
+            por_linha = {r["linha"]: r for r in resultado["linhas"]}
+            cliente_ids += [r["id"] for r in resultado["linhas"] if r["status"] == "criado"]
+            print("\n1. Clientes (NDJSON)")
+            verificar(f"total {resultado.get('total')}, criados {resultado.get('criados')}, erros {resultado.get('erros')}",
+                      (resultado.get("total"), resultado.get("criados"), resultado.get("erros")) == (9, 3, 6))
+            verificar("linhas 1, 6 e 9 criadas com id",
+                      all(por_linha[n]["status"] == "criado" and por_linha[n]["id"] for n in (1, 6, 9)))
+            verificar("JSON inválido e linha que não é objeto",
+                      "JSON inválido" in por_linha[2]["erro"] and por_linha[4]["erro"] == "Cada linha deve ser um objeto JSON")
+            verificar("erro de validação aponta o campo", por_linha[5]["erro"].startswith("nome:"))
+            verificar("duplicado no mesmo lote, em outro lote e já no banco",
+                      all(por_linha[n]["erro"] == "Email já cadastrado" for n in (3, 7, 8)))
+
+            # 2. Relatórios em CSV: coluna JSON e referências por lote
+            cliente_id = por_linha[1]["id"]
+            codigo = f"IMP-{sufixo}"
+            csv = "\n".join([
+                "codigo_pedido,cliente_id,produto_id,titulo,dados_tabela",
+                f"{codigo}-1,{cliente_id},{produto_id},Um,\"{{\"\"dados\"\": [[1]]}}\"",  # 2 criado
+                f"{codigo}-2,{cliente_id},{produto_id},Dois,{{quebrado",                  # 3 JSON da coluna
+                f"{codigo}-3,999999999,{produto_id},Três,",                               # 4 cliente inexistente
+                f"{codigo}-4,{cliente_id},{produto_id},Quatro,",                          # 5 criado
+                f"{codigo}-1,{cliente_id},{produto_id},Repetido,",                        # 6 duplicado de outro lote
+            ])
+            resultado = importar("/relatorios/importar", "relatorios.csv", csv)
+            por_linha = {r["linha"]: r for r in resultado["linhas"]}
+            relatorio_ids += [r["id"] for r in resultado["linhas"] if r["status"] == "criado"]
+            print("\n2. Relatórios (CSV)")
+            verificar(f"criados {resultado.get('criados')}, erros {resultado.get('erros')}",
+                      (resultado.get("criados"), resultado.get("erros")) == (2, 3))
+            verificar("JSON inválido na coluna dados_tabela", "dados_tabela" in (por_linha[3]["erro"] or ""))
+            verificar("cliente inexistente", por_linha[4]["erro"] == "Cliente não encontrado")
+            verificar("código repetido em outro lote", por_linha[6]["erro"] == "Código de pedido já existe")
+            gravado = client.get(f"/relatorios/{por_linha[2]['id']}").json()
+            verificar("dados_tabela do CSV gravado como JSON", gravado.get("dados_tabela") == {"dados": [[1]]})
+
+            resposta = client.post("/clientes/importar", files={"arquivo": ("clientes.xlsx", b"", "application/octet-stream")})
+            verificar(f"formato não suportado: 400 ({resposta.status_code})", resposta.status_code == 400)
+        finally:
+            ImportService.TAMANHO_LOTE = tamanho_original
+            for relatorio_id in relatorio_ids:
+                client.delete(f"/relatorios/{relatorio_id}")
+            for cliente_id in cliente_ids:
+                client.delete(f"/clientes/{cliente_id}")
+            client.delete(f"/produtos/{produto_id}")
+
+    print("\n" + "=" * 60)
+    print("🎉 IMPORTAÇÃO OK" if ok else "❌ FALHAS NA IMPORTAÇÃO")
+    print("=" * 60)
+    assert ok, "falhas na importação"
+
+
+if __name__ == "__main__":
+    try:
+        testar_importacao()
+    except AssertionError:
+        sys.exit(1)
@@ -0,0 +1,134 @@
+"""
+Script para verificar, via EXPLAIN, que cada filtro suportado por
+listar_relatorios usa um índice (e não varre a tabela inteira).
+Execute: python test_indices.py
+"""
+
+import sys
+from datetime import datetime
+from sqlalchemy import event, select
+from app.database import engine, Base, SessionLocal
+from app.models import Relatorio, Foto
+from app.routes.relatorios import filtrar_relatorios
+from app.services.tabela_service import TabelaService
+
+# (descrição, consulta, índices aceitos)
+CASOS = [
+    (
+        "sem filtro (ordenação por data)",
+        filtrar_relatorios(select(Relatorio)).limit(100),
+        ["ix_relatorios_created_at"],
+    ),
+    (
+        "status",
+        filtrar_relatorios(select(Relatorio), status_filtro="concluido").limit(100),
+        ["ix_relatorios_status_created_at"],
+    ),
+    (
+        "cliente_id",
+        filtrar_relatorios(select(Relatorio), cliente_id=1).limit(100),
+        ["ix_relatorios_cliente_id_created_at"],
+    ),
+    (
+        "produto_id",
+        filtrar_relatorios(select(Relatorio), produto_id=1).limit(100),
+        ["ix_relatorios_produto_id_created_at"],
+    ),
+    (
+        "intervalo de datas",
+        filtrar_relatorios(
+            select(Relatorio),
+            criado_de=datetime(2024, 1, 1),
+            criado_ate=datetime(2024, 12, 31)
+        ).limit(100),
+        ["ix_relatorios_created_at"],
+    ),
+    (
+        "cliente_id + intervalo de datas",
+        filtrar_relatorios(
+            select(Relatorio),
+            cliente_id=1,
+            criado_de=datetime(2024, 1, 1)
+        ).limit(100),
+        ["ix_relatorios_cliente_id_created_at"],
+    ),
+    (
+        "status + produto_id",
+        filtrar_relatorios(select(Relatorio), status_filtro="rascunho", produto_id=1).limit(100),
+        ["ix_relatorios_status_created_at", "ix_relatorios_produto_id_created_at"],
+    ),
+    (
+        "fotos de um relatório em ordem",
+        select(Foto).where(Foto.relatorio_id == 1).order_by(Foto.ordem),
+        ["ix_fotos_relatorio_id_ordem"],
+    ),
+]
+
+
+def explicar(connection, stmt) -> str:
+    """Executa EXPLAIN da consulta e retorna o plano como texto"""
+    sqlite = connection.dialect.name == "sqlite"
+    if not sqlite:
+        # Com tabelas pequenas o PostgreSQL prefere seq scan; desligar mostra
+        # se existe um índice capaz de atender a consulta
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+    # A consulta é executada normalmente (mesma conversão dos parâmetros,
+    # ex: dict -> JSONB); só o texto enviado ao banco ganha o EXPLAIN
+    def com_explain(conn, cursor, statement, parameters, context, executemany):
+        return f"{'EXPLAIN QUERY PLAN' if sqlite else 'EXPLAIN'} {statement}", parameters
+
+    event.listen(connection, "before_cursor_execute", com_explain, retval=True)
+    try:
+        linhas = connection.execute(stmt).tuples().all()
+    finally:
+        event.remove(connection, "before_cursor_execute", com_explain)
+    return "\n".join(str(linha[-1] if sqlite else linha[0]) for linha in linhas)
+
+
+def testar_indices():
+    print("=" * 60)
+    print("🧪 TESTE DOS ÍNDICES (EXPLAIN)")
+    print("=" * 60)
+
+    Base.metadata.create_all(bind=engine)
+
+    casos = list(CASOS)
+    if engine.dialect.name == "postgresql":
+        # Consulta por célula da tabela dinâmica: JSONB + GIN só no PostgreSQL
+        with SessionLocal() as db:
+            filtro = TabelaService.filtro_celula(db, "Valor", "gt", 75.0)
+        casos.append((
+            "célula de dados_tabela",
+            select(Relatorio).where(filtro).limit(100),
+            ["ix_relatorios_dados_tabela"],
+        ))
+
+    falhas = 0
+    with engine.connect() as connection:
+        for descricao, stmt, indices in casos:
+            with connection.begin():
+                plano = explicar(connection, stmt)
+
+            if any(indice in plano for indice in indices):
+                print(f"   ✓ {descricao}")
+            else:
+                falhas += 1
+                print(f"   ✗ {descricao}: nenhum de {indices} no plano")
+                print("      " + plano.replace("\n", "\n      "))
+
+    print("\n" + "=" * 60)
+    if falhas:
+        print(f"❌ {falhas} FILTRO(S) SEM ÍNDICE!")
+    else:
+        print("✅ TODOS OS FILTROS USAM ÍNDICE!")
+    print("=" * 60)
+
+    assert not falhas, f"{falhas} filtro(s) sem índice"
+
+
+if __name__ == "__main__":
+    try:
+        testar_indices()
+    except AssertionError:
+        sys.exit(1)
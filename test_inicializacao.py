@@ -0,0 +1,116 @@
+"""
+Orçamento de inicialização a frio (cold start) dos workers.
+
+Em processos Python novos (sem cache de módulos) mede:
+- o tempo de 'import app.main';
+- o tempo dos eventos de startup;
+e verifica que:
+- módulos pesados (reportlab, Pillow, python-jose, passlib) não são
+  importados no boot, só no primeiro uso;
+- o startup não executa SQL (nada de create_all no boot).
+
+Falha (exit 1) se algum orçamento for ultrapassado. Os limites podem ser
+ajustados por ambiente: ORCAMENTO_IMPORTACAO_MS e ORCAMENTO_STARTUP_MS.
+Execute: python test_inicializacao.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ORCAMENTO_IMPORTACAO_MS = float(os.environ.get("ORCAMENTO_IMPORTACAO_MS", 1500))
+ORCAMENTO_STARTUP_MS = float(os.environ.get("ORCAMENTO_STARTUP_MS", 300))
+MODULOS_PESADOS = ["reportlab", "PIL", "jose", "passlib"]
+REPETICOES = 3
+
+# Executado em um interpretador novo a cada repetição
+_MEDICAO = """
+import json, sys, time
+inicio = time.perf_counter()
+import app.main
+importacao = time.perf_counter() - inicio
+
+from sqlalchemy import event
+from app.database import engine
+comandos = []
+event.listen(engine, "before_cursor_execute", lambda *args: comandos.append(args[2]))
+
+from fastapi.testclient import TestClient
+client = TestClient(app.main.app)
+inicio = time.perf_counter()
+client.__enter__()
+startup = time.perf_counter() - inicio
+client.__exit__(None, None, None)
+
+print(json.dumps({
+    "importacao_ms": importacao * 1000,
+    "startup_ms": startup * 1000,
+    "modulos": sorted(m for m in %r if m in sys.modules),
+    "sql": comandos,
+}))
+""" % (MODULOS_PESADOS,)
+
+
+def medir() -> dict:
+    pasta = tempfile.mkdtemp(prefix="inicializacao_")
+    ambiente = {
+        **os.environ,
+        # Banco que ainda não existe: o boot não pode depender dele
+        "DATABASE_URL": f"sqlite:///{pasta}/vazio.db",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "inicializacao"),
+        "DEBUG": "false",
+        "UPLOAD_DIR": os.path.join(pasta, "uploads"),
+    }
+    resultado = subprocess.run(
+        [sys.executable, "-c", _MEDICAO],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=ambiente,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+def testar_inicializacao():
+    print("=" * 60)
+    print("⏱️  TESTE DE INICIALIZAÇÃO A FRIO")
+    print("=" * 60)
+
+    medidas = [medir() for _ in range(REPETICOES)]
+    # Melhor de N: ruído da máquina só aumenta o tempo
+    importacao = min(m["importacao_ms"] for m in medidas)
+    startup = min(m["startup_ms"] for m in medidas)
+    modulos = sorted({modulo for m in medidas for modulo in m["modulos"]})
+    sql = medidas[0]["sql"]
+
+    ok = True
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    print()
+    verificar(f"import app.main: {importacao:.0f} ms (orçamento {ORCAMENTO_IMPORTACAO_MS:.0f} ms)",
+              importacao <= ORCAMENTO_IMPORTACAO_MS)
+    verificar(f"startup: {startup:.0f} ms (orçamento {ORCAMENTO_STARTUP_MS:.0f} ms)",
+              startup <= ORCAMENTO_STARTUP_MS)
+    verificar(f"módulos pesados fora do boot: {', '.join(modulos) or 'nenhum carregado'}", not modulos)
+    verificar(f"nenhum SQL no startup ({len(sql)} comandos)", not sql)
+    for comando in sql[:5]:
+        print(f"      {comando.strip().splitlines()[0]}")
+
+    print("\n" + "=" * 60)
+    print("🎉 INICIALIZAÇÃO DENTRO DO ORÇAMENTO" if ok else "❌ INICIALIZAÇÃO FORA DO ORÇAMENTO")
+    print("=" * 60)
+    assert ok, "inicialização fora do orçamento"
+
+
+if __name__ == "__main__":
+    try:
+        testar_inicializacao()
+    except AssertionError:
+        sys.exit(1)
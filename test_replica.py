@@ -0,0 +1,96 @@
+"""
+Script para verificar o roteamento de leituras para a réplica.
+
+Precisa de dois bancos com o schema aplicado (alembic upgrade head em
+cada um), sem replicação entre eles: assim dá para ver de qual banco
+cada leitura veio.
+
+    DATABASE_URL=postgresql://.../primario \
+    DATABASE_REPLICA_URL=postgresql://.../replica \
+    python test_replica.py
+"""
+
+import sys
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select
+from app.config import settings
+from app.database import COOKIE_LEITURA_PRIMARIO, SessionLocal, ReplicaSessionLocal
+from app.main import app
+from app.models import Cliente
+
+
+def copiar_para_replica(cliente_id: int):
+    """Simula a replicação de uma linha do primário para a réplica"""
+    with SessionLocal() as primario, ReplicaSessionLocal() as replica:
+        linha = primario.execute(select(Cliente.__table__).where(Cliente.id == cliente_id)).mappings().one()
+        # A sessão da réplica recusa flush do ORM; insert direto simula o WAL
+        replica.execute(insert(Cliente.__table__).values(**linha))
+        replica.commit()
+
+
+def limpar(cliente_id: int):
+    with SessionLocal() as primario, ReplicaSessionLocal() as replica:
+        for db in (primario, replica):
+            db.execute(delete(Cliente.__table__).where(Cliente.id == cliente_id))
+            db.commit()
+
+
+def testar_replica():
+    print("=" * 60)
+    print("🔀 TESTE DE ROTEAMENTO PARA A RÉPLICA")
+    print("=" * 60)
+
+    if ReplicaSessionLocal is None:
+        pytest.skip("DATABASE_REPLICA_URL não configurada")
+
+    ok = True
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    with TestClient(app) as client:
+        resposta = client.post("/clientes/", json={"nome": "Réplica", "email": "replica@example.com"})
+        verificar("escrita vai ao primário (201)", resposta.status_code == 201)
+        cliente_id = resposta.json()["id"]
+        verificar("escrita define o cookie de leitura no primário", COOKIE_LEITURA_PRIMARIO in client.cookies)
+
+        try:
+            # Logo após escrever, o mesmo cliente lê do primário
+            resposta = client.get(f"/clientes/{cliente_id}")
+            verificar("leitura após escrita vê o registro (primário)", resposta.status_code == 200)
+
+            # Sem o cookie, a leitura vai à réplica, que ainda não tem a linha
+            client.cookies.clear()
+            resposta = client.get(f"/clientes/{cliente_id}")
+            verificar("leitura sem cookie vai à réplica (404)", resposta.status_code == 404)
+
+            resposta = client.get(f"/clientes/{cliente_id}", headers={"X-Leitura-Primario": "1"})
+            verificar("header X-Leitura-Primario força o primário", resposta.status_code == 200)
+
+            copiar_para_replica(cliente_id)
+            resposta = client.get(f"/clientes/{cliente_id}")
+            verificar("depois de replicada, a réplica responde (200)", resposta.status_code == 200)
+
+            replica = client.get("/health/pool").json().get("replica", {})
+            verificar("pool da réplica aparece em /health/pool", replica.get("checkouts", 0) > 0)
+        finally:
+            limpar(cliente_id)
+
+    print("\n" + "=" * 60)
+    print(f"{'🎉 TODOS OS TESTES PASSARAM!' if ok else '❌ FALHAS NO ROTEAMENTO'}")
+    print(f"   (réplica: {settings.DATABASE_REPLICA_URL})")
+    print("=" * 60)
+    assert ok, "falhas no roteamento para a réplica"
+
+
+if __name__ == "__main__":
+    if ReplicaSessionLocal is None:
+        print("❌ DATABASE_REPLICA_URL não configurada")
+        sys.exit(1)
+    try:
+        testar_replica()
+    except AssertionError:
+        sys.exit(1)
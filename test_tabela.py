@@ -0,0 +1,86 @@
+"""
+Consulta por célula da tabela dinâmica (GET /relatorios/tabela).
+
+Cria relatórios com células numéricas em formatos diferentes (número
+JSON, texto, texto com unidade como "75kg", vírgula decimal) e verifica
+quais cada filtro encontra. Roda no banco configurado: SQLite e
+PostgreSQL avaliam o filtro com SQL diferente e devem concordar.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_tabela.py
+"""
+
+import sys
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+
+# Valor da coluna "Peso" em cada relatório criado
+PESOS = {"json": 80, "texto": "60", "unidade": "75kg", "virgula": "90,5 kg", "sem_numero": "leve"}
+
+# (operador, valor, relatórios esperados)
+CASOS = [
+    ("gt", 70, {"json", "unidade", "virgula"}),
+    ("gt", 75, {"json", "virgula"}),
+    ("gte", 75, {"json", "unidade", "virgula"}),
+    ("lt", 76, {"texto", "unidade"}),
+    ("lte", 90.5, {"json", "texto", "unidade", "virgula"}),
+    ("eq", "75kg", {"unidade"}),
+    ("contem", "kg", {"unidade", "virgula"}),
+]
+
+
+def testar_tabela():
+    print("=" * 60)
+    print("📊 TESTE DA CONSULTA POR CÉLULA DA TABELA")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+
+    with TestClient(app) as client:
+        cliente_id = client.post(
+            "/clientes/", json={"nome": "Tabela", "email": f"tabela-{sufixo}@example.com"}
+        ).json()["id"]
+        produto_id = client.post("/produtos/", json={"nome": "Tabela", "codigo": f"TABELA-{sufixo}"}).json()["id"]
+        nomes = {}
+        try:
+            for nome, peso in PESOS.items():
+                resposta = client.post("/relatorios/", json={
+                    "codigo_pedido": f"TABELA-{sufixo}-{nome}",
+                    "cliente_id": cliente_id,
+                    "produto_id": produto_id,
+                    "dados_tabela": {
+                        "estrutura": {"colunas": ["Medida", "Peso"]},
+                        "dados": [["100mm", peso]],
+                    },
+                })
+                nomes[resposta.json()["id"]] = nome
+
+            print()
+            for operador, valor, esperados in CASOS:
+                resposta = client.get("/relatorios/tabela", params={
+                    "coluna": "Peso", "operador": operador, "valor": valor, "produto_id": produto_id,
+                })
+                encontrados = {nomes[r["id"]] for r in resposta.json()}
+                sucesso = resposta.status_code == 200 and encontrados == esperados
+                ok = ok and sucesso
+                print(f"   {'✅' if sucesso else '❌'} Peso {operador} {valor}: {sorted(encontrados)}"
+                      + ("" if sucesso else f" (esperado {sorted(esperados)})"))
+        finally:
+            for relatorio_id in nomes:
+                client.delete(f"/relatorios/{relatorio_id}")
+            client.delete(f"/produtos/{produto_id}")
+            client.delete(f"/clientes/{cliente_id}")
+
+    print("\n" + "=" * 60)
+    print("🎉 CONSULTA POR CÉLULA OK" if ok else "❌ FALHAS NA CONSULTA POR CÉLULA")
+    print("=" * 60)
+    assert ok, "falhas na consulta por célula"
+
+
+if __name__ == "__main__":
+    try:
+        testar_tabela()
+    except AssertionError:
+        sys.exit(1)
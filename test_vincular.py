@@ -0,0 +1,146 @@
+"""
+Cópia de fotos por hard link (UploadService.vincular_imagem e clonagem).
+
+Usa uma pasta de upload temporária e verifica:
+- o novo nome aponta para o mesmo arquivo (mesmo inode), sem copiar;
+- apagar o original não afeta o novo nome;
+- sem suporte a hard link (os.link falha com OSError), copia o conteúdo;
+- origem inexistente levanta FileNotFoundError, sem criar arquivo;
+- POST /relatorios/{id}/clonar vincula as fotos e pula as sem arquivo.
+
+Precisa de um banco com o schema aplicado (alembic upgrade head).
+Execute: python test_vincular.py
+"""
+
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from app.config import settings
+from app.database import SessionLocal
+from app.main import app
+from app.models import Foto
+from app.services.upload_service import UploadService
+
+CONTEUDO = b"\x89PNG conteudo da foto"
+
+
+def criar_foto(pasta: str) -> str:
+    caminho = os.path.join(pasta, f"{uuid.uuid4()}.png")
+    with open(caminho, "wb") as f:
+        f.write(CONTEUDO)
+    return caminho
+
+
+def ler(caminho: str) -> bytes:
+    with open(caminho, "rb") as f:
+        return f.read()
+
+
+def testar_vincular():
+    print("=" * 60)
+    print("🔗 TESTE DE HARD LINK DAS FOTOS")
+    print("=" * 60)
+
+    ok = True
+    sufixo = uuid.uuid4().hex[:8]
+    pasta = tempfile.mkdtemp(prefix="uploads-")
+    upload_dir_original = settings.UPLOAD_DIR
+    link_original = os.link
+    settings.UPLOAD_DIR = pasta
+
+    def verificar(descricao: str, condicao: bool):
+        nonlocal ok
+        ok = ok and condicao
+        print(f"   {'✅' if condicao else '❌'} {descricao}")
+
+    def sem_hard_link(origem, destino):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    try:
+        print("\n1. Hard link")
+        origem = criar_foto(pasta)
+        nome, caminho = UploadService.vincular_imagem(origem)
+        verificar(f"novo nome na pasta de upload ({nome})",
+                  os.path.dirname(caminho) == pasta and UploadService.e_nome_gerado(nome))
+        verificar("mesmo inode, 2 referências",
+                  os.stat(caminho).st_ino == os.stat(origem).st_ino and os.stat(caminho).st_nlink == 2)
+        os.remove(origem)
+        verificar("apagar o original mantém o novo", ler(caminho) == CONTEUDO and os.stat(caminho).st_nlink == 1)
+
+        print("\n2. Sem suporte a hard link")
+        origem = criar_foto(pasta)
+        os.link = sem_hard_link
+        try:
+            _, copia = UploadService.vincular_imagem(origem)
+        finally:
+            os.link = link_original
+        verificar("conteúdo copiado em outro arquivo",
+                  ler(copia) == CONTEUDO and os.stat(copia).st_ino != os.stat(origem).st_ino)
+
+        print("\n3. Origem inexistente")
+        antes = set(os.listdir(pasta))
+        try:
+            UploadService.vincular_imagem(os.path.join(pasta, f"{uuid.uuid4()}.png"))
+            verificar("FileNotFoundError", False)
+        except FileNotFoundError:
+            verificar("FileNotFoundError", True)
+        verificar("nenhum arquivo criado", set(os.listdir(pasta)) == antes)
+
+        print("\n4. Clonagem de relatório")
+        with TestClient(app) as client:
+            cliente_id = client.post(
+                "/clientes/", json={"nome": "Vincular", "email": f"vincular-{sufixo}@example.com"}
+            ).json()["id"]
+            produto_id = client.post("/produtos/", json={"nome": "Vincular", "codigo": f"VINC-{sufixo}"}).json()["id"]
+            relatorio_id = client.post("/relatorios/", json={
+                "codigo_pedido": f"VINC-{sufixo}", "cliente_id": cliente_id, "produto_id": produto_id,
+            }).json()["id"]
+            clone_id = None
+            try:
+                presente = criar_foto(pasta)
+                ausente = os.path.join(pasta, f"{uuid.uuid4()}.png")
+                with SessionLocal() as db:
+                    db.add_all([
+                        Foto(relatorio_id=relatorio_id, nome_original=f"foto{n}.png", nome_arquivo=os.path.basename(c),
+                             caminho=c, tamanho=len(CONTEUDO), mime_type="image/png", ordem=n)
+                        for n, c in enumerate((presente, ausente))
+                    ])
+                    db.commit()
+
+                resposta = client.post(f"/relatorios/{relatorio_id}/clonar", json={"codigo_pedido": f"VINC-{sufixo}-2"})
+                clone_id = resposta.json().get("id")
+                fotos = resposta.json().get("fotos", [])
+                verificar(f"clone criado ({resposta.status_code}) só com a foto que tem arquivo",
+                          resposta.status_code == 201 and [f["nome_original"] for f in fotos] == ["foto0.png"])
+                verificar("foto do clone é hard link da original",
+                          bool(fotos) and os.stat(fotos[0]["caminho"]).st_ino == os.stat(presente).st_ino)
+            finally:
+                for id_ in (clone_id, relatorio_id):
+                    if id_:
+                        client.delete(f"/relatorios/{id_}")
+                with SessionLocal() as db:
+                    db.execute(delete(Foto).where(Foto.relatorio_id.in_([relatorio_id, clone_id or 0])))
+                    db.commit()
+                client.delete(f"/produtos/{produto_id}")
+                client.delete(f"/clientes/{cliente_id}")
+    finally:
+        os.link = link_original
+        settings.UPLOAD_DIR = upload_dir_original
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("🎉 HARD LINK DAS FOTOS OK" if ok else "❌ FALHAS NO HARD LINK DAS FOTOS")
+    print("=" * 60)
+    assert ok, "falhas no hard link das fotos"
+
+
+if __name__ == "__main__":
+    try:
+        testar_vincular()
+    except AssertionError:
+        sys.exit(1)